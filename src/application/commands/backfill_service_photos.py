@@ -0,0 +1,77 @@
+import asyncio
+import os
+import uuid
+from collections import defaultdict
+
+from loguru import logger
+from sqlalchemy import select, func
+
+from application.models import ServiceModel, ServicePhotoModel
+from application.models.engine import engine, SessionFactory
+from application.utils.s3_service import S3Service, close_s3_client
+
+
+def list_photo_keys(s3: S3Service) -> dict[str, list[str]]:
+    # services/photos/<service_id>/<name>.webp, small variants live under their own prefix and are not listed
+    keys = defaultdict(list)
+    paginator = s3.client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=s3.bucket_name, Prefix=os.path.join("services", "photos", "")):
+        for obj in page.get("Contents", []):
+            parts = obj["Key"].split("/")
+            if len(parts) == 4 and is_uuid(parts[2]):
+                keys[parts[2]].append(obj["Key"])
+    return keys
+
+
+def is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except ValueError:
+        return False
+
+
+async def backfill():
+    photo_keys = await asyncio.to_thread(list_photo_keys, S3Service())
+
+    async with SessionFactory() as session:
+        try:
+            service_ids = set(
+                await session.scalars(
+                    select(ServiceModel.service_id).filter(ServiceModel.service_id.in_(list(photo_keys)))
+                )
+            )
+            registered = set(
+                await session.scalars(select(ServicePhotoModel.key).filter(ServicePhotoModel.service_id.in_(service_ids)))
+            )
+
+            total = 0
+            for service_id in service_ids:
+                position = await session.scalar(
+                    select(func.coalesce(func.max(ServicePhotoModel.position) + 1, 0)).filter(
+                        ServicePhotoModel.service_id == service_id
+                    )
+                )
+                # dimensions and hash stay unknown until the photo is uploaded again
+                for key in sorted(set(photo_keys[service_id]) - registered):
+                    session.add(ServicePhotoModel(service_id=service_id, key=key, position=position))
+                    position += 1
+                    total += 1
+
+            await session.commit()
+            logger.info(f"Registered {total} service photos")
+        except Exception:
+            await session.rollback()
+            logger.exception("Failed to backfill service photos", exc_info=True)
+            raise
+
+    close_s3_client()
+    await engine.dispose()
+
+
+def main():
+    asyncio.run(backfill())
+
+
+if __name__ == "__main__":
+    main()
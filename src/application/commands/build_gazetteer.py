@@ -0,0 +1,70 @@
+import glob
+import io
+import os
+import zipfile
+
+import requests
+from dotenv import load_dotenv
+from loguru import logger
+
+from application.utils.gazetteer import (
+    COUNTRY_CODES,
+    GazetteerBuilder,
+    read_geonames_postcodes,
+    read_openaddresses,
+)
+
+load_dotenv()
+
+GEONAMES_POSTCODES_URL = "https://download.geonames.org/export/zip/{country_code}.zip"
+
+
+def download_postcodes(source_dir: str):
+    # only missing extracts are fetched, a filled source directory builds without network
+    os.makedirs(os.path.join(source_dir, "postcodes"), exist_ok=True)
+    for country_code in COUNTRY_CODES.values():
+        path = os.path.join(source_dir, "postcodes", f"{country_code}.txt")
+        if os.path.exists(path):
+            continue
+
+        try:
+            response = requests.get(GEONAMES_POSTCODES_URL.format(country_code=country_code), timeout=60)
+            response.raise_for_status()
+        except requests.RequestException:
+            logger.warning(f"Failed to download postal codes of {country_code}", exc_info=True)
+            continue
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive, open(path, "wb") as file:
+            file.write(archive.read(f"{country_code}.txt"))
+        logger.info(f"Downloaded postal codes of {country_code}")
+
+
+def build(source_dir: str, path: str):
+    # <source_dir>/postcodes/<CC>.txt GeoNames dumps, <source_dir>/addresses/<cc>/*.csv OpenAddresses extracts
+    # built next to the old file and swapped in at the end, running workers keep reading the old one
+    builder = GazetteerBuilder(f"{path}.tmp")
+
+    for postcodes_path in sorted(glob.glob(os.path.join(source_dir, "postcodes", "*.txt"))):
+        builder.add_postcodes(read_geonames_postcodes(postcodes_path))
+
+    for country_code in COUNTRY_CODES.values():
+        for addresses_path in sorted(glob.glob(os.path.join(source_dir, "addresses", country_code.lower(), "*.csv"))):
+            logger.info(f"Loading {addresses_path}")
+            builder.add_addresses(read_openaddresses(addresses_path, country_code))
+
+    builder.finish()
+    os.replace(f"{path}.tmp", path)
+
+
+def main():
+    source_dir = os.getenv("GAZETTEER_SOURCE_DIR", "data/gazetteer")
+    path = os.getenv("GAZETTEER_PATH", "data/gazetteer.sqlite")
+
+    if os.getenv("GAZETTEER_DOWNLOAD", "true").lower() == "true":
+        download_postcodes(source_dir)
+    build(source_dir, path)
+    logger.info(f"Gazetteer written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import asyncio
+
+from loguru import logger
+
+from application.handlers.service_handler.service_search_handler import ServiceSearchHandler
+from application.models import ServiceSearchModel
+from application.models.engine import engine, SessionFactory
+from application.utils.count_cache import CountCache
+from application.utils.redis_helper import close_async_redis
+
+
+async def rebuild():
+    async with SessionFactory() as session:
+        try:
+            await ServiceSearchHandler.rebuild(session)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Failed to rebuild service search", exc_info=True)
+            raise
+
+    await CountCache.invalidate(ServiceSearchModel.__tablename__)
+    await close_async_redis()
+    await engine.dispose()
+
+
+def main():
+    asyncio.run(rebuild())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import asyncio
+
+from loguru import logger
+
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
+from application.models.engine import engine, SessionFactory
+from application.utils.search_backend import close_search_backend
+
+
+async def reindex():
+    async with SessionFactory() as session:
+        try:
+            await ServiceIndexHandler.reindex(session)
+        except Exception:
+            logger.exception("Failed to reindex services", exc_info=True)
+            raise
+
+    await close_search_backend()
+    await engine.dispose()
+
+
+def main():
+    asyncio.run(reindex())
+
+
+if __name__ == "__main__":
+    main()
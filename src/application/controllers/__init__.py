@@ -3,3 +3,4 @@ LOGIN_CONTROLLER_PREFIX = "auth"
 SERVICE_CONTROLLER_PREFIX = "service"
 ORGANIZATION_CONTROLLER_PREFIX = "organization"
 OFFER_CONTROLLER_PREFIX = "offer"
+UPLOAD_CONTROLLER_PREFIX = "upload"
@@ -32,8 +32,8 @@ class CMSCarController:
     async def create_brand(
         _: Annotated[JwtDC, Depends(get_current_user)],
         session: Annotated[AsyncSession, Depends(get_session)],
-        brand_image: UploadFile,
         brand_name: str = Form(...),
+        brand_image: UploadFile | None = None,
     ):
         return await CMSCarController.handler.add_car_brand(
             car_brand_logo=brand_image,
@@ -52,7 +52,7 @@ class LoginController:
     async def logout(
         current_user: Annotated[JwtDC, Depends(get_current_user)],
     ):
-        return await LoginHandler.logout(current_user.token)
+        return await LoginHandler.logout(current_user.token, current_user.user_id)
 
     @staticmethod
     @router.post(
@@ -63,7 +63,7 @@ class LoginController:
         current_user: Annotated[JwtDC, Depends(get_current_user)],
         refresh_token: str = Body(..., embed=True),
     ):
-        return await LoginHandler.refresh_token(refresh_token, current_user.email)
+        return await LoginHandler.refresh_token(refresh_token, current_user.user_id)
 
     @staticmethod
     @router.post(
@@ -24,9 +24,9 @@ class OrganizationController:
     @staticmethod
     @router.post("/create-organization", response_model=OrganizationResponseSchema)
     async def add_organization(
-        logo_image: UploadFile,
         current_user: Annotated[JwtDC, Depends(get_current_user)],
         request_schema: str = Form(...),
+        logo_image: UploadFile | None = None,
         session: AsyncSession = Depends(get_session),
     ):
         request_schema = AddOrganizationRequestSchema(**json.loads(request_schema))
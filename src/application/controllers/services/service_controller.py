@@ -12,9 +12,11 @@ from application.deps.db_deps import get_session
 from application.schemas.service_schemas.request_schemas.service_schema import (
     FilterServiceRequestSchema,
     AddServiceRequestSchema,
+    ServicesByIdsRequestSchema,
 )
 from application.schemas.service_schemas.response_schemas.service_schema import (
-    ServiceItemsResponseSchema, ServiceResponseSchema, ServiceItemSchema,
+    ServiceItemsResponseSchema, ServiceResponseSchema, ServiceItemSchema, ServiceSearchResponseSchema,
+    ServicesByIdsResponseSchema, UploadPhotosResponseSchema,
 )
 
 
@@ -31,7 +33,7 @@ class ServiceController:
         return await ServiceHandler.add_service(request_schema, current_user, session)
 
     @staticmethod
-    @router.post("/upload-logo", response_model=ServiceResponseSchema)
+    @router.post("/upload-logo", response_model=ServiceResponseSchema, deprecated=True)
     async def upload_logo(
         service_id: str,
         logo_file: UploadFile,
@@ -41,7 +43,7 @@ class ServiceController:
         return await ServiceHandler.upload_logo(service_id, logo_file, session, current_user.user_id)
 
     @staticmethod
-    @router.post("/upload-photos", response_model=ServiceResponseSchema)
+    @router.post("/upload-photos", response_model=UploadPhotosResponseSchema, deprecated=True)
     async def upload_service_photos(
         service_id: str,
         photos: list[UploadFile],
@@ -58,6 +60,13 @@ class ServiceController:
     ):
         return await ServiceHandler.get_services(service_filter, session)
 
+    @staticmethod
+    @router.get("/search", response_model=ServiceSearchResponseSchema)
+    async def search_services(
+        service_filter: FilterServiceRequestSchema = Depends(),
+    ):
+        return await ServiceHandler.search_services(service_filter)
+
     @staticmethod
     @router.get("/get-services-by-id", response_model=ServiceItemSchema)
     async def get_services_by_id(
@@ -66,6 +75,14 @@ class ServiceController:
     ):
         return await ServiceHandler.get_service_by_id(service_id, session)
 
+    @staticmethod
+    @router.post("/get-services-by-ids", response_model=ServicesByIdsResponseSchema)
+    async def get_services_by_ids(
+        request_schema: ServicesByIdsRequestSchema = Body(...),
+        session: AsyncSession = Depends(get_session),
+    ):
+        return await ServiceHandler.get_services_by_ids(request_schema.service_ids, session)
+
     @staticmethod
     @router.put("/archive-service")
     async def archive_service(
@@ -0,0 +1,34 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Body
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.controllers import UPLOAD_CONTROLLER_PREFIX
+from application.dto.jwt_dc import JwtDC
+from application.deps.auth_deps import get_current_user
+from application.deps.db_deps import get_session
+from application.handlers.upload_handler import UploadHandler
+from application.schemas.upload_request_schema import UploadIntentRequestSchema, ConfirmUploadRequestSchema
+from application.schemas.upload_response_schema import UploadIntentResponseSchema, ConfirmUploadResponseSchema
+
+
+class UploadController:
+    router = APIRouter(prefix=f"/{UPLOAD_CONTROLLER_PREFIX}", tags=[UPLOAD_CONTROLLER_PREFIX])
+
+    @staticmethod
+    @router.post("/intent", response_model=UploadIntentResponseSchema)
+    async def create_upload_intent(
+        current_user: Annotated[JwtDC, Depends(get_current_user)],
+        session: Annotated[AsyncSession, Depends(get_session)],
+        request_schema: UploadIntentRequestSchema = Body(...),
+    ):
+        return await UploadHandler.create_intent(request_schema, current_user, session)
+
+    @staticmethod
+    @router.post("/confirm", response_model=ConfirmUploadResponseSchema)
+    async def confirm_upload(
+        current_user: Annotated[JwtDC, Depends(get_current_user)],
+        session: Annotated[AsyncSession, Depends(get_session)],
+        request_schema: ConfirmUploadRequestSchema = Body(...),
+    ):
+        return await UploadHandler.confirm_upload(request_schema, current_user, session)
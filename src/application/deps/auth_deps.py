@@ -5,23 +5,32 @@ from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer
 from jose import jwt
 from dotenv import load_dotenv
-import requests
 from loguru import logger
 
 from application.dto.jwt_dc import JwtDC
 from application.enums.groups import Groups
+from application.utils.jwks_manager import get_jwks_manager
+from application.utils.token_cache import TokenCache
+from application.utils.token_revocation import TokenRevocation
 
 load_dotenv()
 
 security = HTTPBearer()
-jwks = requests.get(os.getenv("AWS_COGNITO_SIGNING_KEY_URL")).json()
 
 
-def verify_token(token: str):
-    headers = jwt.get_unverified_header(token)
+async def verify_token(token: str):
+    cached = TokenCache.get(token)
+    if cached is not None:
+        return cached
+
+    try:
+        headers = jwt.get_unverified_header(token)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
     kid = headers.get("kid")
     app_client_id= os.getenv("AWS_COGNITO_APP_CLIENT_ID")
-    key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
+    key = await get_jwks_manager().get_key(kid)
 
     if not key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -45,21 +54,30 @@ def verify_token(token: str):
             if payload.get("aud") != app_client_id:
                 raise HTTPException(status_code=401, detail="Invalid audience")
 
-        return JwtDC(
+        jwt_dc = JwtDC(
             email=payload.get("email", None),
             user_id=payload["sub"],
             token=token,
             token_type=token_use,
-            groups=payload.get("cognito:groups", [Groups.USER.value])
+            groups=payload.get("cognito:groups", [Groups.USER.value]),
+            jti=payload.get("jti") or TokenCache.cache_key(token),
+            issued_at=payload.get("iat", 0),
+            expires_at=payload["exp"],
         )
+        TokenCache.set(token, jwt_dc, jwt_dc.expires_at)
+        return jwt_dc
     except Exception:
         logger.exception("Token verification failed", exc_info=True)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
-def get_current_user(credential: Annotated[HTTPBearer, Depends(security)]):
+async def get_current_user(credential: Annotated[HTTPBearer, Depends(security)]):
     payload = credential.credentials
-    return verify_token(payload)
+    jwt_dc = await verify_token(payload)
+
+    if await TokenRevocation.is_revoked(jwt_dc):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return jwt_dc
 
 
 def require_groups(allowed_groups: tuple):
@@ -13,3 +13,6 @@ class JwtDC(DataClassJsonMixin):
     token: str
     email: str | None = None
     groups: list[Groups] = field(default_factory=list)
+    jti: str | None = None
+    issued_at: int = 0
+    expires_at: int = 0
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+
+from dataclasses_json import dataclass_json, Undefined, DataClassJsonMixin
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class NearbyCandidateDC(DataClassJsonMixin):
+    service_id: str
+    name: str
+    latitude: float
+    longitude: float
+    logo_key: str = ""
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class NearbyCandidatesDC(DataClassJsonMixin):
+    created_at: int
+    # candidates cover every matching service closer than reach_meters to the cell center,
+    # complete means the candidate query was not truncated and covers all matching services
+    reach_meters: float
+    complete: bool
+    items: list[NearbyCandidateDC] = field(default_factory=list)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+
+from dataclasses_json import dataclass_json, Undefined, DataClassJsonMixin
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class OfferDocumentDC(DataClassJsonMixin):
+    offer_id: str
+    offer_type: str | None
+    currency: str
+    base_price: float
+    sale: int | None
+    current_price: float
+    car_brands: list[str] = field(default_factory=list)
+    car_types: list[str] = field(default_factory=list)
+    # "<brand>:<type>" of every compatibility row, brand and type have to match on the same row
+    car_pairs: list[str] = field(default_factory=list)
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class ServiceDocumentDC(DataClassJsonMixin):
+    service_id: str
+    organization_id: str | None
+    name: str
+    country: str
+    city: str
+    street: str
+    postal_code: str
+    address: str
+    latitude: float
+    longitude: float
+    logo_key: str
+    languages: list[str] = field(default_factory=list)
+    descriptions: list[str] = field(default_factory=list)
+    offers: list[OfferDocumentDC] = field(default_factory=list)
+    updated_at: int = 0
+
+
+@dataclass
+class ServiceSearchQueryDC:
+    limit: int
+    offset: int = 0
+    q: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    radius_km: float | None = None
+    # exact matches on document fields: organization_id, name, country, city, street
+    filters: dict = field(default_factory=dict)
+    offer_type: str | None = None
+    currency: str | None = None
+    max_price: float | None = None
+    car_brand: str | None = None
+    car_type: str | None = None
+    search_after: list | None = None
+
+    @property
+    def has_location(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+    @property
+    def has_offer_filter(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.offer_type, self.currency, self.max_price, self.car_brand, self.car_type)
+        )
+
+
+@dataclass
+class ServiceSearchHitDC:
+    document: ServiceDocumentDC
+    sort: list
+    distance_meters: float | None = None
+    best_offer: OfferDocumentDC | None = None
+
+
+@dataclass
+class ServiceSearchResultDC:
+    hits: list[ServiceSearchHitDC]
+    total: int
+    # {"<facet>": {"<bucket>": <service count>}}
+    facets: dict[str, dict[str, int]] = field(default_factory=dict)
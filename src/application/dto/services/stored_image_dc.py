@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from dataclasses_json import dataclass_json, DataClassJsonMixin, Undefined
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class StoredImageDC(DataClassJsonMixin):
+    # dimensions of the large variant, hash of the uploaded original
+    width: int
+    height: int
+    content_hash: str
@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class CountStrategy(StrEnum):
+    EXACT = "EXACT"
+    ESTIMATED = "ESTIMATED"
+    CACHED = "CACHED"
+    NONE = "NONE"
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class ImageVariant(StrEnum):
+    SMALL = "sm"
+    LARGE = "lg"
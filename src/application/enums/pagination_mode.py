@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class PaginationMode(StrEnum):
+    OFFSET = "OFFSET"
+    CURSOR = "CURSOR"
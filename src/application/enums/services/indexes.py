@@ -3,3 +3,4 @@ from enum import Enum
 
 class OpensearchIndexes(Enum):
     RAG_INDEX = "rag_index"
+    SERVICE_INDEX = "service_index"
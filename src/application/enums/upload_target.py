@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class UploadTarget(StrEnum):
+    SERVICE_LOGO = "SERVICE_LOGO"
+    SERVICE_PHOTO = "SERVICE_PHOTO"
+    ORGANIZATION_LOGO = "ORGANIZATION_LOGO"
+    CAR_BRAND_LOGO = "CAR_BRAND_LOGO"
@@ -1,3 +1,5 @@
+import os
+
 from loguru import logger
 
 from fastapi import UploadFile
@@ -5,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from application.enums.image_variant import ImageVariant
 from application.enums.services.engine_type import EngineType
 from application.models import CarBrandModel, CarTypeModel, EngineTypeModel
 from application.models.cars.engine_type import ICEEngineModel, EVEngineModel
@@ -35,25 +38,31 @@ class CMSCarHandler:
     def __init__(self):
         self.prefix = ["car", "brand", "logo"]
 
+    @staticmethod
+    def brand_file_name(car_brand_name: str) -> str:
+        return car_brand_name.upper().replace(" ", "_")
+
     async def add_car_brand(
         self,
-        car_brand_logo: UploadFile,
+        car_brand_logo: UploadFile | None,
         car_brand_name: str,
         session: AsyncSession,
     ):
         try:
+            # without a file the logo is uploaded through the upload intent flow, which sets the extension
             model = CarBrandModel(
                 car_brand_name=car_brand_name,
-                logo_extension=car_brand_logo.filename.split(".")[-1],
+                logo_extension=car_brand_logo.filename.split(".")[-1] if car_brand_logo else "",
             )
 
-            s3_service = S3Service(allowed_extensions=("svg", "png"))
+            if car_brand_logo is not None:
+                s3_service = S3Service(allowed_extensions=("svg", "png"))
 
-            await s3_service.upload_file_to_s3(
-                file=car_brand_logo,
-                prefix=self.prefix,
-                file_name=model.car_brand_name.upper().replace(" ", "_"),
-            )
+                await s3_service.upload_file_to_s3(
+                    file=car_brand_logo,
+                    prefix=self.prefix,
+                    file_name=self.brand_file_name(model.car_brand_name),
+                )
 
             session.add(model)
             await session.commit()
@@ -67,7 +76,14 @@ class CMSCarHandler:
             result = await session.execute(stmt)
             records = result.scalars().all()
 
-            s3_service = S3Service()
+            # keys as written by add_car_brand, the upload stores every logo with the .webp extension
+            image_urls = await S3Service().generate_key_urls(
+                [
+                    os.path.join(*self.prefix, f"{self.brand_file_name(record.car_brand_name)}{S3Service.extension}")
+                    for record in records
+                ],
+                variant=ImageVariant.SMALL,
+            )
 
             return ListCarResponseSchema(
                 total=len(records),
@@ -75,12 +91,9 @@ class CMSCarHandler:
                     BrandItemSchema(
                         brand_id=record.car_brand_id,
                         brand_name=record.car_brand_name,
-                        image_url=await s3_service.generate_persist_url(
-                            prefix=self.prefix,
-                            file_name=f"{record.car_brand_name.upper()}.{record.logo_extension}"
-                        ),
+                        image_url=image_url,
                     )
-                    for record in records
+                    for record, image_url in zip(records, image_urls)
                 ]
             )
         except Exception:
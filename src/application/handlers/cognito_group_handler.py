@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+from contextlib import suppress
+
+from dotenv import load_dotenv
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.enums.groups import Groups
+from application.models import CognitoGroupChangeModel
+from application.models.engine import SessionFactory
+from application.utils.cognito_service import CognitoService
+
+load_dotenv()
+
+
+class CognitoGroupHandler:
+    batch_size: int = int(os.getenv("COGNITO_GROUP_BATCH_SIZE", 50))
+    concurrency: int = int(os.getenv("COGNITO_GROUP_CONCURRENCY", 5))
+    poll_interval: float = float(os.getenv("COGNITO_GROUP_POLL_INTERVAL", 10))
+    max_attempts: int = int(os.getenv("COGNITO_GROUP_MAX_ATTEMPTS", 10))
+    # claimed changes are skipped by other workers until the lease ends, longer than a batch of calls takes
+    lease_seconds: int = int(os.getenv("COGNITO_GROUP_LEASE_SECONDS", 300))
+    retry_base_delay: int = 5
+    retry_max_delay: int = 3600
+
+    wakeup: asyncio.Event = asyncio.Event()
+    worker: asyncio.Task | None = None
+
+    @staticmethod
+    def enqueue(user_id: str, group_name: Groups, session: AsyncSession):
+        # committed together with the change that grants the group, the worker applies it afterwards
+        session.add(CognitoGroupChangeModel(user_id=user_id, group_name=group_name))
+
+    @classmethod
+    def notify(cls):
+        cls.wakeup.set()
+
+    @classmethod
+    def retry_delay(cls, attempts: int) -> int:
+        return min(cls.retry_max_delay, cls.retry_base_delay * 2 ** (attempts - 1))
+
+    @classmethod
+    async def process_batch(cls, session: AsyncSession) -> int:
+        now = int(time.time())
+        # skip locked lets every worker of every instance claim rows at the same time without sharing them
+        query_result = await session.execute(
+            select(CognitoGroupChangeModel)
+            .filter(
+                CognitoGroupChangeModel.processed_at.is_(None),
+                CognitoGroupChangeModel.next_attempt_at <= now,
+                CognitoGroupChangeModel.attempts < cls.max_attempts,
+            )
+            .order_by(CognitoGroupChangeModel.change_id)
+            .limit(cls.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        changes = query_result.scalars().all()
+        if not changes:
+            return 0
+
+        # the claim is committed right away, no row lock or transaction is held during the Cognito calls.
+        # a worker that dies before recording the results leaves the changes to be retried after the lease
+        for change in changes:
+            change.next_attempt_at = now + cls.lease_seconds
+        await session.commit()
+
+        # adding a user to a group is idempotent, duplicates in the batch share one call
+        assignments: dict[tuple[str, Groups], list[CognitoGroupChangeModel]] = {}
+        for change in changes:
+            assignments.setdefault((change.user_id, change.group_name), []).append(change)
+
+        cognito = CognitoService()
+        slots = asyncio.Semaphore(cls.concurrency)
+
+        async def assign(user_id: str, group_name: Groups):
+            async with slots:
+                await cognito.add_user_to_group(username=user_id, group_name=group_name)
+
+        results = await asyncio.gather(
+            *(assign(user_id, group_name) for user_id, group_name in assignments), return_exceptions=True
+        )
+
+        processed_at = int(time.time())
+        for (user_id, group_name), result in zip(assignments, results):
+            for change in assignments[(user_id, group_name)]:
+                if not isinstance(result, BaseException):
+                    change.processed_at = processed_at
+                    continue
+
+                change.attempts += 1
+                change.next_attempt_at = processed_at + cls.retry_delay(change.attempts)
+                change.last_error = str(result)[:1000]
+                if change.attempts >= cls.max_attempts:
+                    logger.error(f"Giving up adding {user_id} to group {group_name.value}: {result}")
+
+        # results are recorded in a second short transaction
+        await session.commit()
+        return len(changes)
+
+    @classmethod
+    def start_worker(cls):
+        if cls.worker is None or cls.worker.done():
+            cls.worker = asyncio.create_task(cls.run_worker())
+
+    @classmethod
+    async def stop_worker(cls):
+        if cls.worker is not None:
+            cls.worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await cls.worker
+            cls.worker = None
+
+    @classmethod
+    async def run_worker(cls):
+        while True:
+            # cleared before the batch, a notify during it starts the next batch right away
+            cls.wakeup.clear()
+            try:
+                async with SessionFactory() as session:
+                    processed = await cls.process_batch(session)
+            except Exception:
+                logger.exception("Failed to process Cognito group changes", exc_info=True)
+                processed = 0
+
+            if processed >= cls.batch_size:
+                continue
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(cls.wakeup.wait(), cls.poll_interval)
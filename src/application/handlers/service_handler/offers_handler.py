@@ -1,7 +1,7 @@
 import logging
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, update
+from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from loguru import logger
@@ -10,8 +10,19 @@ from application.dataclasses.services.offer_cars_relation_dc import (
     OfferDC,
     OfferCarCompatibilityModelDC,
 )
-from application.models import ServiceModel, OfferModel
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
+from application.handlers.service_handler.service_search_handler import ServiceSearchHandler
+from application.models import (
+    ServiceModel,
+    OfferModel,
+    OfferCarCompatibilityModel,
+    OfferDescriptionModel,
+    ServiceSearchModel,
+)
 from application.schemas.service_schemas.request_schemas.offer_schema import AddOffersRequestSchema, UpdateOfferSchema
+from application.schemas.service_schemas.response_schemas.offer_schema import ManipulateOfferResponseSchema
+from application.schemas.util_schemas import DescriptionSchema
+from application.utils.count_cache import CountCache
 from application.utils.exceptions import DBException
 
 
@@ -31,10 +42,12 @@ class OffersHandler:
         try:
             offers_dc: [OfferDC] = []
             offers_car_compatibility_dc: [OfferCarCompatibilityModelDC] = []
+            descriptions: list[OfferDescriptionModel] = []
 
             for offer in offer_schema.offers:
-                offer_dc = OfferDC(**offer.model_dump(), service_id=str(service_id))
+                offer_dc = OfferDC(**offer.model_dump(exclude={"description"}), service_id=str(service_id))
                 offers_dc.append(offer_dc)
+                descriptions.extend(cls.description_models(offer_dc.offer_id, offer.description))
 
                 offers_car_compatibility_dc.extend(
                     [
@@ -43,10 +56,40 @@ class OffersHandler:
                     ]
                 )
 
-            session.add_all([OfferModel(**dc.to_dict()) for dc in offers_dc])
+            session.add_all(
+                [
+                    OfferModel(
+                        offer_id=dc.offer_id,
+                        offer_type=dc.offer_type,
+                        currency=dc.currency,
+                        base_price=dc.base_price,
+                        sale=dc.sale,
+                        service_id=dc.service_id,
+                        estimated_duration_minutes=dc.estimated_duration_minutes,
+                    )
+                    for dc in offers_dc
+                ]
+            )
+            await session.flush()
+
+            session.add_all(
+                [
+                    OfferCarCompatibilityModel(
+                        offer_id=dc.offer_id,
+                        car_brand=dc.car_brand,
+                        car_type=dc.car_type,
+                    )
+                    for dc in offers_car_compatibility_dc
+                ]
+            )
+            session.add_all(descriptions)
+            await ServiceSearchHandler.refresh_services([str(service_id)], session)
 
             await session.commit()
-            await session.refresh(service_model, ["offers"])
+            await CountCache.invalidate(ServiceSearchModel.__tablename__)
+            ServiceIndexHandler.enqueue([str(service_id)])
+
+            return ManipulateOfferResponseSchema(status=True, msg="Offer added")
 
         except Exception:
             logger.error("Add offer error", exc_info=True)
@@ -58,11 +101,24 @@ class OffersHandler:
             update_query = (
                 update(OfferModel)
                 .filter(OfferModel.offer_id == update_offer_schema.offer_id)
-                .values(**update_offer_schema.model_dump(exclude_unset=True, exclude={"offer_id"}))
+                .values(**update_offer_schema.model_dump(exclude_unset=True, exclude={"offer_id", "description"}))
                 .returning(OfferModel.service_id)
             )
 
-            await session.execute(update_query)
+            update_query_res = await session.execute(update_query)
+            updated_service_ids = list(update_query_res.scalars().all())
+
+            if "description" in update_offer_schema.model_fields_set and updated_service_ids:
+                # the sent translations replace the stored ones
+                await session.execute(
+                    delete(OfferDescriptionModel).filter(
+                        OfferDescriptionModel.offer_id == str(update_offer_schema.offer_id)
+                    )
+                )
+                session.add_all(
+                    cls.description_models(str(update_offer_schema.offer_id), update_offer_schema.description)
+                )
+            await ServiceSearchHandler.refresh_services(updated_service_ids, session)
             # updated_offer_service_id: str = update_query_res.scalar_one()
             #
             # service_model = await session.get(
@@ -94,7 +150,22 @@ class OffersHandler:
             # )
 
             await session.commit()
+            await CountCache.invalidate(ServiceSearchModel.__tablename__)
+            ServiceIndexHandler.enqueue(updated_service_ids)
+
+            return ManipulateOfferResponseSchema(status=True, msg="Offer updated")
 
         except Exception:
             logger.error("Update offer error", exc_info=True)
             raise DBException()
+
+    @staticmethod
+    def description_models(offer_id: str, descriptions: list[DescriptionSchema]) -> list[OfferDescriptionModel]:
+        return [
+            OfferDescriptionModel(
+                offer_id=offer_id,
+                language_code=description.language_code,
+                content=description.content,
+            )
+            for description in descriptions
+        ]
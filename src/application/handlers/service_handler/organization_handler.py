@@ -2,13 +2,16 @@ from fastapi import UploadFile
 from geoalchemy2.shape import from_shape, to_shape
 from shapely.geometry import Point
 from geopy import Location
-from sqlalchemy import select
+from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from application.dto.jwt_dc import JwtDC
 from application.enums.groups import Groups
 from application.enums.services.record_status import RecordStatus
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
+from application.handlers.service_handler.service_search_handler import ServiceSearchHandler
+from application.models import ServiceSearchModel, OrganizationDescriptionModel
 from application.models.services.organization import OrganizationModel
 from application.schemas.service_schemas.request_schemas.organization_schema import AddOrganizationRequestSchema
 from application.schemas.util_schemas import FilterEntityRequestSchema
@@ -16,17 +19,26 @@ from application.schemas.service_schemas.response_schemas.organization_schema im
     OrganizationResponseSchema,
     OrganizationItem,
 )
+from application.utils.count_cache import CountCache
 from application.utils.exceptions import ServerException, BadRequestException, NotFoundException
 from application.utils.get_location import get_location
-from application.utils.handler_helpers import get_entity_result
+from application.utils.handler_helpers import (
+    count_entities,
+    get_entity_result,
+    get_entity_page_by_cursor,
+    encode_cursor,
+    decode_cursor,
+)
+from application.utils.nearby_cache import NearbySearchCache
 from application.utils.s3_service import S3Service
+from application.utils.text_search import text_match, text_rank, document_rank, search_query
 
 
 class OrganizationHandler:
 
     @classmethod
     async def create_organization(cls, request_schema: AddOrganizationRequestSchema, user_id: str,
-                                  logo_file: UploadFile, session: AsyncSession):
+                                  logo_file: UploadFile | None, session: AsyncSession):
         try:
             location: Location = await get_location(
                 country=request_schema.country,
@@ -39,11 +51,6 @@ class OrganizationHandler:
             if not location:
                 raise BadRequestException(detail="Location not found")
 
-            s3_service = S3Service(allowed_extensions=("svg", "png"))
-            logo_file_name = await s3_service.upload_file_to_s3(
-                file=logo_file,
-            )
-
             model = OrganizationModel(
                 **request_schema.model_dump(
                     exclude={"latitude", "longitude"}
@@ -54,7 +61,18 @@ class OrganizationHandler:
             )
 
             session.add(model)
+            await session.flush()
+
+            # the logo can also be uploaded straight to S3 through the upload intent flow
+            if logo_file is not None:
+                await S3Service(allowed_extensions=("svg", "png")).upload_file_to_s3(
+                    file=logo_file,
+                    prefix=["organizations", "logo"],
+                    file_name=str(model.organization_id),
+                )
+
             await session.commit()
+            await CountCache.invalidate(OrganizationModel.__tablename__)
 
             await session.refresh(model)
 
@@ -64,6 +82,16 @@ class OrganizationHandler:
             logger.exception("Failed to add organization", exc_info=True)
             raise ServerException
 
+    @staticmethod
+    async def invalidate_caches(service_ids: list[str]):
+        await CountCache.invalidate(OrganizationModel.__tablename__)
+        if not service_ids:
+            return
+
+        await CountCache.invalidate(ServiceSearchModel.__tablename__)
+        await NearbySearchCache.invalidate()
+        ServiceIndexHandler.enqueue(service_ids)
+
     @classmethod
     async def change_organization_status(cls, organization_id: str, new_status: RecordStatus, session: AsyncSession):
         try:
@@ -75,7 +103,9 @@ class OrganizationHandler:
             record.status = new_status
 
             session.add(record)
+            service_ids = await ServiceSearchHandler.refresh_organization(organization_id, session)
             await session.commit()
+            await cls.invalidate_caches(service_ids)
             await session.refresh(record)
 
             return cls.dump_model_to_schema(record)
@@ -95,7 +125,9 @@ class OrganizationHandler:
             if organization and organization.owner == current_user.user_id or current_user.permission == Groups.ADMIN:
                 organization.status = RecordStatus.ARCHIVED
 
+            service_ids = await ServiceSearchHandler.refresh_organization(organization_id, session)
             await session.commit()
+            await cls.invalidate_caches(service_ids)
             await session.refresh(organization)
 
             return cls.dump_model_to_schema(organization)
@@ -105,30 +137,106 @@ class OrganizationHandler:
 
     @classmethod
     async def get_list_organizations(cls, filter_model: FilterEntityRequestSchema, session: AsyncSession):
+        filter_model_dict = filter_model.model_dump(
+            exclude_none=True,
+            exclude={"per_page", "page_num", "pagination", "cursor", "count_strategy", "q"},
+        )
+        limit = filter_model.per_page
+        offset = filter_model.page_num * limit - limit
+
+        criteria = []
+        sort_keys = [OrganizationModel.organization_id]
+        cursor_mode = "id"
+
+        if filter_model.q:
+            criteria.append(cls.search_criterion(filter_model.q))
+            sort_keys = [-cls.search_rank(filter_model.q), OrganizationModel.organization_id]
+            cursor_mode = "rank"
+
+        cursor_values = decode_cursor(filter_model.cursor, cursor_mode) if filter_model.cursor else None
+        has_extra_fields = cursor_mode != "id"
+
         try:
-            filter_model_dict = filter_model.model_dump(exclude_none=True)
-            limit = filter_model_dict.pop("per_page", 10)
-            offset = filter_model_dict.pop("page_num", 1)
-
-            offset = offset * limit - limit
-            base_query = select(OrganizationModel)
-
-            if filter_model_dict:
-                base_query = select(OrganizationModel).filter_by(**filter_model_dict)
-
-            total_count, organizations = await get_entity_result(
-                base_query=base_query,
-                filter_dict=filter_model_dict,
-                model=OrganizationModel,
-                limit=limit,
-                offset=offset,
-                session=session,
-            )
-            return {"data": [OrganizationItem.model_validate(org) for org in organizations], "total": total_count}
+            base_query = select(OrganizationModel).filter_by(**filter_model_dict).filter(*criteria)
+            if has_extra_fields:
+                base_query = base_query.add_columns(sort_keys[0].label("sort_key"))
+
+            if filter_model.is_cursor_mode:
+                organizations, has_more = await get_entity_page_by_cursor(
+                    base_query=base_query,
+                    sort_keys=sort_keys,
+                    cursor_values=cursor_values,
+                    limit=limit,
+                    session=session,
+                    has_extra_fields=has_extra_fields,
+                )
+                total_count = await count_entities(
+                    model=OrganizationModel,
+                    filter_dict=filter_model_dict,
+                    session=session,
+                    criteria=tuple(criteria),
+                    strategy=filter_model.total_count_strategy,
+                )
+            else:
+                total_count, organizations, has_more = await get_entity_result(
+                    base_query=base_query.order_by(*sort_keys),
+                    filter_dict=filter_model_dict,
+                    model=OrganizationModel,
+                    limit=limit,
+                    offset=offset,
+                    session=session,
+                    has_extra_fields=has_extra_fields,
+                    count_strategy=filter_model.total_count_strategy,
+                    criteria=tuple(criteria),
+                )
+
+            next_cursor = None
+            if has_more and filter_model.is_cursor_mode:
+                if has_extra_fields:
+                    last_row = organizations[-1]
+                    next_cursor = encode_cursor(
+                        cursor_mode, [last_row["sort_key"], str(last_row["OrganizationModel"].organization_id)]
+                    )
+                else:
+                    next_cursor = encode_cursor(cursor_mode, [str(organizations[-1].organization_id)])
+
+            if has_extra_fields:
+                organizations = [row["OrganizationModel"] for row in organizations]
+
+            return {
+                "data": [OrganizationItem.model_validate(org) for org in organizations],
+                "total": total_count,
+                "has_more": has_more,
+                "next_cursor": next_cursor,
+            }
         except Exception:
             logger.error("Failed to get organizations", exc_info=True)
             raise ServerException
 
+    @staticmethod
+    def search_criterion(q: str):
+        # organization descriptions live in their own table, a match there is enough to list the organization
+        description_match = (
+            select(OrganizationDescriptionModel.description_id)
+            .filter(
+                OrganizationDescriptionModel.organization_id == OrganizationModel.organization_id,
+                OrganizationDescriptionModel.search_document.op("@@")(search_query(q)),
+            )
+            .exists()
+        )
+        return or_(text_match(OrganizationModel.search_document, OrganizationModel.name, q), description_match)
+
+    @staticmethod
+    def search_rank(q: str):
+        description_rank = (
+            select(func.max(document_rank(OrganizationDescriptionModel.search_document, q)))
+            .filter(OrganizationDescriptionModel.organization_id == OrganizationModel.organization_id)
+            .scalar_subquery()
+        )
+        return text_rank(OrganizationModel.search_document, OrganizationModel.name, q) + func.coalesce(
+            description_rank, 0.0
+        )
+
     @classmethod
     async def get_organization_by_id(cls, organization_id: str, session: AsyncSession) -> OrganizationResponseSchema:
         try:
@@ -15,6 +15,7 @@ from application.dataclasses.services.offer_cars_relation_dc import (
 from application.enums.services.country import Country
 from application.enums.services.rabbit_routers import PublishRabbitRouter
 from application.events.event import get_rabbit_processor
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
 from application.models import ServiceModel
 from application.utils.exceptions import DBException
 
@@ -80,10 +81,13 @@ class PublishServicesHandler:
                     message=data.to_dict(),
                 )
 
+                service_ids = []
                 for service in services:
                     service.is_published = True
+                    service_ids.append(str(service.service_id))
 
                 await session.commit()
+                ServiceIndexHandler.enqueue(service_ids)
                 await asyncio.sleep(0.01)
 
                 offset += limit
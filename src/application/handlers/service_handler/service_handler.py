@@ -1,37 +1,84 @@
+import asyncio
+import os
+import time
+
 from fastapi import UploadFile, Response
 from geoalchemy2 import Geography
-from geoalchemy2.functions import ST_Distance
+from geoalchemy2.functions import ST_Distance, ST_DWithin
 from loguru import logger
 from geopy import Location
-from requests import session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, type_coerce
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, cast, literal, Float, Text, Select, null, true
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.orm import selectinload, noload
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Subquery
 from shapely.geometry import Point
-from geoalchemy2.shape import from_shape, to_shape
+from geoalchemy2.shape import from_shape
 
 from application.dto.jwt_dc import JwtDC
+from application.dto.services.nearby_candidates_dc import NearbyCandidatesDC, NearbyCandidateDC
+from application.dto.services.stored_image_dc import StoredImageDC
+from application.dto.services.user_point import UserPoint
+from application.enums.count_strategy import CountStrategy
 from application.enums.groups import Groups
+from application.enums.image_variant import ImageVariant
 from application.enums.record_state import RecordState
-from application.models import ServiceModel, OrganizationModel, ServiceDescriptionModel
+from application.enums.services.car_brands import CarBrands
+from application.enums.services.car_types import CarType
+from application.handlers.cognito_group_handler import CognitoGroupHandler
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
+from application.handlers.service_handler.service_search_handler import ServiceSearchHandler
+from application.models import (
+    ServiceModel,
+    OrganizationModel,
+    ServiceDescriptionModel,
+    OfferModel,
+    OfferCarCompatibilityModel,
+    OfferDescriptionModel,
+    ServiceSearchModel,
+    ServicePhotoModel,
+)
 from application.schemas.service_schemas.request_schemas.service_schema import (
     FilterServiceRequestSchema,
     AddServiceRequestSchema,
 )
 from application.schemas.service_schemas.response_schemas.service_schema import (
     ServiceItemSchema,
-    ServiceItemsResponseSchema, ServiceResponseSchema, ServiceListItemSchema,
+    ServiceItemsResponseSchema,
+    ServiceResponseSchema,
+    ServiceListItemSchema,
+    ServiceSearchResponseSchema,
+    ServicesByIdsResponseSchema,
+    PhotoUploadResultSchema,
+    UploadPhotosResponseSchema,
 )
-from application.schemas.service_schemas.response_schemas.offer_schema import OffersSchema
-from application.utils.cognito_service import CognitoService
-from application.utils.exceptions import DBException, BadRequestException, ServerException, ForbiddenException
+from application.schemas.service_schemas.response_schemas.offer_schema import OffersSchema, BestOfferSchema
+from application.utils.count_cache import CountCache
+from application.utils.exceptions import (
+    DBException,
+    BadRequestException,
+    ServerException,
+    ForbiddenException,
+    NotFoundException,
+)
+from application.utils import geohash
 from application.utils.get_location import get_location
-from application.utils.handler_helpers import get_entity_result
+from application.utils.handler_helpers import (
+    apply_keyset,
+    count_entities,
+    encode_cursor,
+    decode_cursor,
+)
+from application.utils.nearby_cache import NearbySearchCache
 from application.utils.s3_service import S3Service
+from application.utils.text_search import text_match, text_rank, distance_weighted_rank
 
 
 class ServiceHandler:
-    cognito = CognitoService()
+    max_photos: int = 5
+    # photos of one request sent at the same time, S3Service.upload_slots caps the whole worker
+    photo_upload_concurrency: int = int(os.getenv("PHOTO_UPLOAD_CONCURRENCY", 3))
 
     @classmethod
     async def add_service(cls, service_schema: AddServiceRequestSchema, current_user: JwtDC, session: AsyncSession):
@@ -74,6 +121,7 @@ class ServiceHandler:
                 twitter=service_schema.twitter.encoded_string() or None,
                 website=service_schema.website.encoded_string() or None,
                 identification_number=service_schema.identification_number,
+                use_organization_logo=service_schema.use_organization_logo,
             )
             session.add(service_model)
             await session.flush()
@@ -87,9 +135,12 @@ class ServiceHandler:
             ]
 
             session.add_all(descriptions)
+            await ServiceSearchHandler.refresh_services([service_model.service_id], session)
+            CognitoGroupHandler.enqueue(current_user.user_id, Groups.PENDING_SERVICE_ADMIN, session)
             await session.commit()
-
-            cls.cognito.add_user_to_group(username=current_user.user_id, group_name=Groups.PENDING_SERVICE_ADMIN)
+            CognitoGroupHandler.notify()
+            # a new service is pending and has no service_search row, cached lists and the index only change
+            # once it is approved
 
             return ServiceResponseSchema.model_validate(service_model)
         except Exception:
@@ -118,10 +169,22 @@ class ServiceHandler:
             raise
 
     @classmethod
-    async def upload_photos(cls, service_id: str, photos: list[UploadFile], session: AsyncSession, user_id: str):
+    async def upload_photos(
+        cls, service_id: str, photos: list[UploadFile], session: AsyncSession, user_id: str
+    ) -> UploadPhotosResponseSchema:
+        s3 = S3Service(allowed_extensions=("jpg", "jpeg", "png", "webp"))
+        prefix = ["services", "photos", service_id]
+
         try:
-            if len(photos) > 5:
-                raise BadRequestException("You can upload up to 5 photos")
+            if len(photos) > cls.max_photos:
+                raise BadRequestException(f"You can upload up to {cls.max_photos} photos")
+
+            # every photo is checked before the first one is sent
+            file_names = [photo.filename.split(".")[0] for photo in photos]
+            if len(set(file_names)) != len(file_names):
+                raise BadRequestException("Photo file names must be unique")
+            for photo in photos:
+                s3.validate_upload(photo)
 
             service = await session.get(ServiceModel, service_id)
             if not service:
@@ -129,94 +192,260 @@ class ServiceHandler:
             if service.user_id != user_id:
                 raise ForbiddenException("You are not allowed to upload photos")
 
-            s3 = S3Service(allowed_extensions=("jpg", "jpeg", "png", "webp"))
-            for photo in photos:
-                await s3.upload_file_to_s3(
-                    file_name=photo.filename.split(".")[0],
-                    file=photo,
-                    prefix=["services", "photos", service_id],
-                )
+            await cls.check_photo_limit(service_id, len(photos), session)
 
-            return Response(status_code=200, content="ok")
+            keys = [os.path.join(*prefix, f"{file_name}{S3Service.extension}") for file_name in file_names]
+            existing_result = await session.execute(
+                select(ServicePhotoModel.key).filter(ServicePhotoModel.key.in_(keys))
+            )
+            existing_keys = set(existing_result.scalars().all())
+
+            slots = asyncio.Semaphore(cls.photo_upload_concurrency)
+            failed = asyncio.Event()
+            results = await asyncio.gather(
+                *(
+                    cls.upload_photo(s3, photo, prefix, file_name, slots, failed)
+                    for photo, file_name in zip(photos, file_names)
+                ),
+                return_exceptions=True,
+            )
+
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                # photos that did finish are removed again unless they replaced an already registered photo
+                uploaded_keys = [
+                    key
+                    for key, result in zip(keys, results)
+                    if isinstance(result, StoredImageDC) and key not in existing_keys
+                ]
+                await s3.delete_images(uploaded_keys)
+                raise errors[0]
+
+            for key, image in zip(keys, results):
+                await cls.register_photo(service_id, key, image, session)
+            await session.commit()
+
+            urls = await s3.generate_key_urls(keys)
+            return UploadPhotosResponseSchema(
+                data=[
+                    PhotoUploadResultSchema(
+                        file_name=photo.filename, key=key, url=url, width=image.width, height=image.height
+                    )
+                    for photo, key, url, image in zip(photos, keys, urls, results)
+                ]
+            )
         except Exception:
+            await session.rollback()
             logger.exception("Add photos error", exc_info=True)
             raise
 
+    @staticmethod
+    async def upload_photo(
+        s3: S3Service,
+        photo: UploadFile,
+        prefix: list[str],
+        file_name: str,
+        slots: asyncio.Semaphore,
+        failed: asyncio.Event,
+    ) -> StoredImageDC | None:
+        async with slots:
+            # once a photo failed the request is lost, queued photos are not sent anymore
+            if failed.is_set():
+                return None
+            try:
+                return await s3.upload_file_to_s3(file=photo, prefix=prefix, file_name=file_name)
+            except Exception:
+                failed.set()
+                raise
+
+    @classmethod
+    async def check_photo_limit(cls, service_id: str, new_photos: int, session: AsyncSession):
+        photo_count = await session.scalar(
+            select(func.count()).select_from(ServicePhotoModel).filter(ServicePhotoModel.service_id == service_id)
+        )
+        if photo_count + new_photos > cls.max_photos:
+            raise BadRequestException(f"You can upload up to {cls.max_photos} photos")
+
+    @staticmethod
+    async def register_photo(
+        service_id: str, key: str, image: StoredImageDC, session: AsyncSession
+    ) -> ServicePhotoModel:
+        # a photo uploaded again under the same key replaces the old one and keeps its position
+        query_result = await session.execute(select(ServicePhotoModel).filter(ServicePhotoModel.key == key))
+        photo = query_result.scalar_one_or_none()
+        if photo is None:
+            position = await session.scalar(
+                select(func.coalesce(func.max(ServicePhotoModel.position) + 1, 0)).filter(
+                    ServicePhotoModel.service_id == service_id
+                )
+            )
+            photo = ServicePhotoModel(service_id=service_id, key=key, position=position)
+            session.add(photo)
+
+        photo.width, photo.height, photo.content_hash = image.width, image.height, image.content_hash
+        return photo
+
+    @staticmethod
+    def photo_keys() -> ColumnElement:
+        # ordered photo keys of the service, read in the same statement as the service row
+        return (
+            select(
+                func.array_agg(
+                    aggregate_order_by(ServicePhotoModel.key, ServicePhotoModel.position, ServicePhotoModel.photo_id)
+                )
+            )
+            .filter(ServicePhotoModel.service_id == ServiceModel.service_id)
+            .scalar_subquery()
+        )
+
     @classmethod
     async def get_services(cls, service_filter: FilterServiceRequestSchema, session: AsyncSession):
-        try:
-            service_filter_dict = service_filter.model_dump(exclude_none=True)
-            limit = service_filter_dict.pop("per_page", 10)
-            offset = service_filter_dict.pop("page_num", 1)
+        service_filter_dict = service_filter.model_dump(
+            exclude_none=True,
+            exclude={
+                "per_page",
+                "page_num",
+                "pagination",
+                "cursor",
+                "count_strategy",
+                "q",
+                "current_location",
+                "radius_km",
+                "max_distance",
+                "offer_type",
+                "max_price",
+                "currency",
+                "car_brand",
+                "car_type",
+            },
+        )
+        limit = service_filter.per_page
+        offset = service_filter.page_num * limit - limit
 
-            offset = offset * limit - limit
-            base_query = select(ServiceModel)
+        criteria = []
+        offer_criteria = None
+        distance = None
+        sort_key = ServiceSearchModel.service_id
+        cursor_mode = "id"
 
-            if service_filter_dict:
-                service_filter_dict.pop("current_location")
-                base_query = base_query.filter_by(**service_filter_dict)
+        if service_filter.current_location:
+            user_point = cls.parse_current_location(service_filter.current_location)
 
-            if service_filter.current_location:
-                latitude = service_filter.current_location.split(",")[0].strip()
-                longitude = service_filter.current_location.split(",")[1].strip()
+            point_geo = cls.geography_point(user_point.latitude, user_point.longitude)
+            service_geo = cast(ServiceSearchModel.location, Geography(geometry_type=None))
 
-                latitude = float(latitude)
-                longitude = float(longitude)
+            if service_filter.radius_km:
+                criteria.append(ST_DWithin(service_geo, point_geo, service_filter.radius_km * 1000))
 
-                user_location = func.ST_SetSRID(func.ST_MakePoint(
-                    longitude, latitude), 4326
-                )
+            # `<->` on the geography expression is answered by idx_service_search_location_geography in KNN order,
+            # the exact spheroid distance is only computed for the rows of the final page
+            sort_key = service_geo.op("<->", return_type=Float)(point_geo)
+            distance = ST_Distance(service_geo, point_geo)
+            cursor_mode = "distance"
 
-                geom_geo = type_coerce(ServiceModel.location, Geography)
-                point_geo = type_coerce(user_location, Geography)
+        if service_filter.q:
+            document, trigram_text = ServiceSearchModel.search_document, ServiceSearchModel.search_text
+            criteria.append(text_match(document, trigram_text, service_filter.q))
 
-                base_query = (
-                    base_query
-                    .add_columns(
-                        ST_Distance(geom_geo, point_geo).label("distance_meters")
-                    )
-                    .order_by(ST_Distance(geom_geo, point_geo))
+            rank = text_rank(document, trigram_text, service_filter.q)
+            if distance is not None:
+                rank = distance_weighted_rank(rank, sort_key)
+
+            # best match first, the negated score keeps the ascending keyset comparison
+            sort_key = -rank
+            cursor_mode = "rank"
+
+        if service_filter.has_offer_filter:
+            offer_criteria = cls.offer_criteria(service_filter)
+            criteria.extend(cls.search_offer_criteria(service_filter, offer_criteria))
+
+        sort_keys = [sort_key, ServiceSearchModel.service_id] if cursor_mode != "id" else [sort_key]
+        cursor_values = decode_cursor(service_filter.cursor, cursor_mode) if service_filter.cursor else None
+
+        try:
+            if cursor_mode == "distance" and offer_criteria is None and not service_filter.is_cursor_mode:
+                cached_res = await cls.get_cached_nearby_services(
+                    service_filter=service_filter,
+                    service_filter_dict=service_filter_dict,
+                    user_point=user_point,
+                    criteria=criteria,
+                    limit=limit,
+                    offset=offset,
+                    session=session,
                 )
+                if cached_res is not None:
+                    return cached_res
 
-            base_query = base_query.options(
-                selectinload(ServiceModel.organization),
-                selectinload(ServiceModel.offers),
+            page_query = (
+                select(ServiceSearchModel.service_id.label("page_service_id"), sort_key.label("sort_key"))
+                .filter_by(**service_filter_dict)
+                .filter(*criteria)
             )
 
-            total_count, services = await get_entity_result(
-                base_query=base_query,
+            if service_filter.is_cursor_mode:
+                page_query = apply_keyset(page_query, sort_keys, cursor_values, limit)
+            else:
+                page_query = page_query.order_by(*sort_keys).limit(limit + 1).offset(offset)
+
+            total_count = await count_entities(
+                model=ServiceSearchModel,
                 filter_dict=service_filter_dict,
-                model=ServiceModel,
-                limit=limit,
-                offset=offset,
                 session=session,
-                has_extra_fields=service_filter.current_location is not None,
+                criteria=tuple(criteria),
+                strategy=service_filter.total_count_strategy,
             )
 
-            s3 = S3Service()
+            page = page_query.subquery("page")
+            query = cls.list_item_query(page, distance, offer_criteria)
 
-            data = []
+            # plain column tuples, no ORM entities are built for list items
+            query_result = await session.execute(query)
+            services = query_result.tuples().all()
 
-            for service in services:
-                service_model: ServiceModel = service["ServiceModel"] if service_filter.current_location is not None else service
+            has_more = len(services) > limit
+            services = services[:limit]
 
-                prefix = ["services", "logo"] if service_model.use_organization_logo else ["organizations", "logo"]
-                file_name = str(service_model.service_id) if service_model.use_organization_logo else str(service_model.organization.organization_id)
+            logos = await S3Service().generate_key_urls(
+                [service.logo_key for service in services], variant=ImageVariant.SMALL
+            )
 
-                logo = await s3.generate_persist_url(file_name=file_name, prefix=prefix)
+            data = []
 
+            for service, logo in zip(services, logos):
                 data.append(
                     ServiceListItemSchema(
-                        service_id=service_model.service_id,
+                        service_id=service.service_id,
                         logo=logo,
-                        name=service_model.name,
-                        distance_meters=service.get("distance_meters") if service_filter.current_location is not None else None,
+                        name=service.name,
+                        distance_meters=service.distance_meters,
+                        best_offer=BestOfferSchema(
+                            offer_id=service.best_offer_id,
+                            offer_type=service.best_offer_type,
+                            currency=service.best_offer_currency,
+                            base_price=service.best_offer_base_price,
+                            sale=service.best_offer_sale,
+                            current_price=service.best_offer_current_price,
+                        )
+                        if offer_criteria is not None and service.best_offer_id
+                        else None,
                     )
                 )
 
+            next_cursor = None
+            if has_more and service_filter.is_cursor_mode:
+                last_service = services[-1]
+                next_cursor = encode_cursor(
+                    cursor_mode,
+                    [last_service.sort_key, last_service.service_id]
+                    if cursor_mode != "id"
+                    else [last_service.service_id],
+                )
+
             res = ServiceItemsResponseSchema(
                 data=data,
                 total=total_count,
+                has_more=has_more,
+                next_cursor=next_cursor,
             )
             return res
         except Exception:
@@ -224,30 +453,285 @@ class ServiceHandler:
             raise ServerException()
 
     @classmethod
-    async def get_service_by_id(cls, service_id: str, session: AsyncSession):
+    async def get_service_by_id(cls, service_id: str, session: AsyncSession) -> ServiceItemSchema:
+        services = await cls.load_service_items([service_id], session)
+        if not services:
+            raise NotFoundException("Service not found")
+        return services[0]
+
+    @classmethod
+    async def get_services_by_ids(cls, service_ids: list[str], session: AsyncSession) -> ServicesByIdsResponseSchema:
+        service_ids = list(dict.fromkeys(str(service_id) for service_id in service_ids))
+        services = await cls.load_service_items(service_ids, session)
+
+        found_ids = {service.service_id for service in services}
+        return ServicesByIdsResponseSchema(
+            data=services,
+            missing=[service_id for service_id in service_ids if service_id not in found_ids],
+        )
+
+    @classmethod
+    async def load_service_items(cls, service_ids: list[str], session: AsyncSession) -> list[ServiceItemSchema]:
+        # one query for the services and their photo keys and one per relation, whatever the number of ids
+        query = (
+            select(
+                ServiceModel,
+                ServiceSearchHandler.logo_key().label("logo_key"),
+                cls.photo_keys().label("photo_keys"),
+            )
+            .filter(ServiceModel.service_id.in_(service_ids))
+            .options(
+                noload(ServiceModel.organization),
+                selectinload(ServiceModel.description).noload(ServiceDescriptionModel.services),
+                selectinload(ServiceModel.offers).options(
+                    selectinload(OfferModel.description).noload(OfferDescriptionModel.offers),
+                    noload(OfferModel.services),
+                    noload(OfferModel.offer_car_compatibility),
+                    noload(OfferModel.relation_translated_offers),
+                ),
+            )
+        )
+
         try:
-            service_query = (
-                select(ServiceModel)
-                .filter(ServiceModel.service_id == service_id)
-                .options(
-                    selectinload(ServiceModel.description),
-                    selectinload(ServiceModel.offers),
+            query_result = await session.execute(query)
+            rows = {str(row.ServiceModel.service_id): row for row in query_result.all()}
+            ordered = [rows[service_id] for service_id in service_ids if service_id in rows]
+
+            # logo and photo urls of every service are resolved in one batch
+            urls = iter(
+                await S3Service().generate_key_urls(
+                    [key for row in ordered for key in [row.logo_key, *(row.photo_keys or [])]]
                 )
             )
 
-            service_query_res = await session.execute(service_query)
-            service = service_query_res.scalar_one_or_none()
+            items = []
+            for row in ordered:
+                item = ServiceItemSchema.model_validate(row.ServiceModel)
+                item.logo = next(urls)
+                item.photos = [next(urls) for _ in row.photo_keys or []]
+                items.append(item)
 
-            s3 = S3Service()
+            return items
+        except Exception:
+            logger.exception("Failed to get services by ids", exc_info=True)
+            raise ServerException()
 
-            res = ServiceItemSchema.model_validate(service)
-            res.logo = await s3.generate_persist_url(file_name=service.service_id, prefix=["services", "logo"])
-            res.photos = await s3.generate_persist_list_urls(prefix=["services", "photos", service.service_id])
+    @classmethod
+    async def search_services(cls, service_filter: FilterServiceRequestSchema) -> ServiceSearchResponseSchema:
+        user_point = None
+        if service_filter.current_location:
+            user_point = cls.parse_current_location(service_filter.current_location)
 
-            return res
-        except Exception:
-            logger.exception("Failed to get service by id", exc_info=True)
-            raise
+        return await ServiceIndexHandler.search(service_filter, user_point)
+
+    @classmethod
+    async def get_cached_nearby_services(
+        cls,
+        service_filter: FilterServiceRequestSchema,
+        service_filter_dict: dict,
+        user_point: UserPoint,
+        criteria: list,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+    ) -> ServiceItemsResponseSchema | None:
+        cell = NearbySearchCache.cell(user_point.latitude, user_point.longitude)
+        filter_key = NearbySearchCache.filter_key({**service_filter_dict, "radius_km": service_filter.radius_km})
+
+        cache_key, candidates = await NearbySearchCache.get(cell, filter_key)
+        if candidates is None:
+            candidates = await cls.load_nearby_candidates(cell, service_filter_dict, service_filter.radius_km, session)
+            if cache_key:
+                await NearbySearchCache.set(cache_key, filter_key, candidates)
+
+        ranked, safe_count = NearbySearchCache.rank(
+            candidates=candidates,
+            cell=cell,
+            latitude=user_point.latitude,
+            longitude=user_point.longitude,
+            radius_km=service_filter.radius_km,
+        )
+
+        # the page and its look-ahead row must lie inside the prefix the candidates are known to be exact for
+        if not candidates.complete and offset + limit + 1 > safe_count:
+            return None
+
+        total_count = None
+        if service_filter.total_count_strategy != CountStrategy.NONE:
+            total_count = len(ranked) if candidates.complete else await count_entities(
+                model=ServiceSearchModel,
+                filter_dict=service_filter_dict,
+                session=session,
+                criteria=tuple(criteria),
+                strategy=service_filter.total_count_strategy,
+            )
+
+        page = ranked[offset:offset + limit]
+        logos = await S3Service().generate_key_urls(
+            [candidate.logo_key for _, candidate in page], variant=ImageVariant.SMALL
+        )
+
+        return ServiceItemsResponseSchema(
+            data=[
+                ServiceListItemSchema(
+                    service_id=candidate.service_id,
+                    logo=logo,
+                    name=candidate.name,
+                    distance_meters=NearbySearchCache.distance_meters(
+                        user_point.latitude, user_point.longitude, candidate
+                    ),
+                )
+                for (_, candidate), logo in zip(page, logos)
+            ],
+            total=total_count,
+            has_more=len(ranked) > offset + limit,
+        )
+
+    @classmethod
+    async def load_nearby_candidates(
+        cls, cell: str, service_filter_dict: dict, radius_km: float | None, session: AsyncSession
+    ) -> NearbyCandidatesDC:
+        center_latitude, center_longitude = geohash.decode(cell)
+        center_geo = cls.geography_point(center_latitude, center_longitude)
+        service_geo = cast(ServiceSearchModel.location, Geography(geometry_type=None))
+
+        query = (
+            select(
+                ServiceSearchModel.service_id,
+                ServiceSearchModel.name,
+                ServiceSearchModel.logo_key,
+                func.ST_Y(ServiceSearchModel.location).label("latitude"),
+                func.ST_X(ServiceSearchModel.location).label("longitude"),
+                # sphere distance, the metric of the `<->` order below
+                ST_Distance(service_geo, center_geo, False).label("center_distance"),
+            )
+            .filter_by(**service_filter_dict)
+            .order_by(service_geo.op("<->", return_type=Float)(center_geo))
+            .limit(NearbySearchCache.max_candidates)
+        )
+
+        if radius_km:
+            query = query.filter(
+                ST_DWithin(service_geo, center_geo, radius_km * 1000 + NearbySearchCache.cell_radius_meters(cell))
+            )
+
+        query_result = await session.execute(query)
+        rows = query_result.mappings().all()
+
+        return NearbyCandidatesDC(
+            created_at=int(time.time()),
+            reach_meters=max((row["center_distance"] for row in rows), default=0.0),
+            complete=len(rows) < NearbySearchCache.max_candidates,
+            items=[
+                NearbyCandidateDC(
+                    service_id=str(row["service_id"]),
+                    name=row["name"],
+                    latitude=row["latitude"],
+                    longitude=row["longitude"],
+                    logo_key=row["logo_key"],
+                )
+                for row in rows
+            ],
+        )
+
+    @classmethod
+    def list_item_query(
+        cls, page: Subquery, distance: ColumnElement | None = None, offer_criteria: list[ColumnElement] | None = None
+    ) -> Select:
+        query = (
+            select(
+                ServiceSearchModel.service_id,
+                ServiceSearchModel.name,
+                ServiceSearchModel.logo_key,
+                page.c.sort_key,
+                distance.label("distance_meters") if distance is not None else null().label("distance_meters"),
+            )
+            .join(page, ServiceSearchModel.service_id == page.c.page_service_id)
+            .order_by(page.c.sort_key, ServiceSearchModel.service_id)
+        )
+
+        if offer_criteria is not None:
+            # cheapest matching offer, evaluated only for the rows of the page
+            current_price = ServiceSearchHandler.offer_current_price()
+            best_offer = (
+                select(
+                    OfferModel.offer_id.label("best_offer_id"),
+                    OfferModel.offer_type.label("best_offer_type"),
+                    OfferModel.currency.label("best_offer_currency"),
+                    OfferModel.base_price.label("best_offer_base_price"),
+                    OfferModel.sale.label("best_offer_sale"),
+                    current_price.label("best_offer_current_price"),
+                )
+                .filter(*offer_criteria)
+                .order_by(current_price, OfferModel.offer_id)
+                .limit(1)
+                .lateral("best_offer")
+            )
+            query = query.outerjoin(best_offer, true()).add_columns(*best_offer.c)
+
+        return query
+
+    @classmethod
+    def offer_criteria(cls, service_filter: FilterServiceRequestSchema) -> list[ColumnElement]:
+        criteria = [OfferModel.service_id == ServiceSearchModel.service_id]
+
+        if service_filter.offer_type:
+            criteria.append(OfferModel.offer_type == service_filter.offer_type)
+        if service_filter.currency:
+            criteria.append(OfferModel.currency == service_filter.currency)
+        if service_filter.max_price is not None:
+            criteria.append(ServiceSearchHandler.offer_current_price() <= service_filter.max_price)
+
+        if service_filter.car_brand or service_filter.car_type:
+            compatibility = select(OfferCarCompatibilityModel.offer_car_compatibility_id).filter(
+                OfferCarCompatibilityModel.offer_id == OfferModel.offer_id
+            )
+            if service_filter.car_brand:
+                compatibility = compatibility.filter(
+                    OfferCarCompatibilityModel.car_brand.in_([service_filter.car_brand, CarBrands.ALL])
+                )
+            if service_filter.car_type:
+                compatibility = compatibility.filter(
+                    OfferCarCompatibilityModel.car_type.in_([service_filter.car_type, CarType.ALL])
+                )
+            criteria.append(compatibility.exists())
+
+        return criteria
+
+    @staticmethod
+    def search_offer_criteria(
+        service_filter: FilterServiceRequestSchema, offer_criteria: list[ColumnElement]
+    ) -> list[ColumnElement]:
+        # car compatibility is not part of the read model and needs the offer rows themselves
+        if service_filter.car_brand or service_filter.car_type:
+            return [select(OfferModel.offer_id).filter(*offer_criteria).exists()]
+
+        price_key = (
+            service_filter.offer_type.value if service_filter.offer_type else ServiceSearchHandler.any_offer_type
+        )
+        key_prices = ServiceSearchModel.min_prices.op("->", return_type=JSONB)(literal(price_key, Text))
+        criteria = [ServiceSearchModel.min_prices.has_key(literal(price_key, Text))]
+
+        if service_filter.currency:
+            criteria.append(key_prices.has_key(literal(service_filter.currency.value, Text)))
+        if service_filter.max_price is not None:
+            currency_price = key_prices.op("->>", return_type=Text)(literal(service_filter.currency.value, Text))
+            criteria.append(cast(currency_price, Float) <= service_filter.max_price)
+
+        return criteria
+
+    @staticmethod
+    def geography_point(latitude: float, longitude: float):
+        return cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography(geometry_type=None))
+
+    @staticmethod
+    def parse_current_location(current_location: str) -> UserPoint:
+        try:
+            latitude, longitude = (float(value.strip()) for value in current_location.split(","))
+        except ValueError:
+            raise BadRequestException("current_location must be in format 'latitude,longitude'")
+
+        return UserPoint(longitude=longitude, latitude=latitude)
 
     @classmethod
     async def archive_service(cls, service_id: str, session: AsyncSession, user_id: str):
@@ -260,7 +744,11 @@ class ServiceHandler:
                 raise BadRequestException("You don't have permission to archive this service")
 
             service.state = RecordState.ARCHIVED
+            await ServiceSearchHandler.refresh_services([service.service_id], session)
             await session.commit()
+            await CountCache.invalidate(ServiceSearchModel.__tablename__)
+            await NearbySearchCache.invalidate()
+            ServiceIndexHandler.enqueue([service.service_id])
             return Response(status_code=200, content="ok")
         except Exception:
             logger.exception("Failed to archive service", exc_info=True)
@@ -283,8 +771,13 @@ class ServiceHandler:
             else:
                 raise BadRequestException("You don't have permission to approve this service")
 
-            session.add(ServiceModel(service_id=service_id, state=RecordState.ACTIVE))
+            service.state = RecordState.ACTIVE
+            service.approved_by = current_user.user_id
+            await ServiceSearchHandler.refresh_services([service.service_id], session)
             await session.commit()
+            await CountCache.invalidate(ServiceSearchModel.__tablename__)
+            await NearbySearchCache.invalidate()
+            ServiceIndexHandler.enqueue([service.service_id])
 
             return Response(status_code=200, content="ok")
         except Exception:
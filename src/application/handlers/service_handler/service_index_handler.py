@@ -0,0 +1,323 @@
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.dto.services.service_document_dc import (
+    OfferDocumentDC,
+    ServiceDocumentDC,
+    ServiceSearchQueryDC,
+    ServiceSearchResultDC,
+)
+from application.dto.services.user_point import UserPoint
+from application.enums.count_strategy import CountStrategy
+from application.enums.image_variant import ImageVariant
+from application.handlers.service_handler.service_search_handler import ServiceSearchHandler
+from application.models import (
+    ServiceModel,
+    ServiceSearchModel,
+    ServiceDescriptionModel,
+    OfferModel,
+    OfferCarCompatibilityModel,
+)
+from application.models.engine import SessionFactory
+from application.schemas.service_schemas.request_schemas.service_schema import FilterServiceRequestSchema
+from application.schemas.service_schemas.response_schemas.offer_schema import BestOfferSchema
+from application.schemas.service_schemas.response_schemas.service_schema import (
+    ServiceListItemSchema,
+    ServiceSearchResponseSchema,
+)
+from application.utils.exceptions import ServerException
+from application.utils.handler_helpers import encode_cursor, decode_cursor
+from application.utils.s3_service import S3Service
+from application.utils.search_backend import get_search_backend
+
+
+class ServiceIndexHandler:
+    batch_size: int = 500
+    retry_base_delay: int = 1
+    retry_max_delay: int = 300
+
+    pending: set[str] = set()
+    wakeup: asyncio.Event = asyncio.Event()
+    worker: asyncio.Task | None = None
+
+    @classmethod
+    def enqueue(cls, service_ids: list[str]):
+        # called after commit, the worker indexes the committed rows so writes never wait on OpenSearch
+        cls.pending.update(str(service_id) for service_id in service_ids)
+        cls.wakeup.set()
+
+    @classmethod
+    def start_worker(cls):
+        if cls.worker is None or cls.worker.done():
+            cls.worker = asyncio.create_task(cls.run_worker())
+
+    @classmethod
+    async def stop_worker(cls):
+        if cls.worker is not None:
+            cls.worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await cls.worker
+            cls.worker = None
+
+    @classmethod
+    def retry_delay(cls, failures: int) -> int:
+        return min(cls.retry_max_delay, cls.retry_base_delay * 2 ** (failures - 1))
+
+    @classmethod
+    async def run_worker(cls):
+        failures = 0
+        while True:
+            await cls.wakeup.wait()
+            cls.wakeup.clear()
+
+            # ids queued while a batch is indexed are picked up by the next one
+            while cls.pending:
+                service_ids = list(cls.pending)[:cls.batch_size]
+                cls.pending.difference_update(service_ids)
+                try:
+                    async with SessionFactory() as session:
+                        await cls.index_services(service_ids, session)
+                    failures = 0
+                except Exception:
+                    # the batch goes back to the queue, the index catches up once OpenSearch answers again
+                    failures += 1
+                    cls.pending.update(service_ids)
+                    delay = cls.retry_delay(failures)
+                    logger.warning(f"Failed to index {len(service_ids)} services, retrying in {delay}s", exc_info=True)
+                    await asyncio.sleep(delay)
+
+    @classmethod
+    async def index_services(cls, service_ids: list[str], session: AsyncSession):
+        # the index is refreshed from the committed service_search rows, failures are retried by the worker
+        if not service_ids:
+            return
+
+        service_ids = [str(service_id) for service_id in service_ids]
+        documents = await cls.load_documents(service_ids, session)
+        backend = get_search_backend()
+
+        await backend.index_documents(documents)
+
+        # archived or unapproved services have no service_search row and leave the index
+        indexed_ids = {document.service_id for document in documents}
+        removed_ids = [service_id for service_id in service_ids if service_id not in indexed_ids]
+        if removed_ids:
+            await backend.delete_documents(removed_ids)
+
+    @classmethod
+    async def reindex(cls, session: AsyncSession) -> int:
+        backend = get_search_backend()
+        await backend.ensure_index()
+
+        total, last_service_id = 0, None
+        indexed_ids = set()
+        while True:
+            query = (
+                select(ServiceSearchModel.service_id).order_by(ServiceSearchModel.service_id).limit(cls.batch_size)
+            )
+            if last_service_id is not None:
+                query = query.filter(ServiceSearchModel.service_id > last_service_id)
+
+            query_result = await session.execute(query)
+            service_ids = [str(service_id) for service_id in query_result.scalars().all()]
+            if not service_ids:
+                break
+
+            total += await backend.index_documents(await cls.load_documents(service_ids, session))
+            indexed_ids.update(service_ids)
+            last_service_id = service_ids[-1]
+
+        # documents of services that lost their service_search row while the index was not updated
+        stale_ids = [service_id for service_id in await backend.document_ids() if service_id not in indexed_ids]
+        if stale_ids:
+            # services published during the pass are indexed but were not seen by it, they are kept
+            query_result = await session.execute(
+                select(ServiceSearchModel.service_id).filter(ServiceSearchModel.service_id.in_(stale_ids))
+            )
+            current_ids = {str(service_id) for service_id in query_result.scalars().all()}
+            removed = await backend.delete_documents(
+                [service_id for service_id in stale_ids if service_id not in current_ids]
+            )
+            logger.info(f"Removed {removed} stale services from the index")
+
+        logger.info(f"Indexed {total} services")
+        return total
+
+    @classmethod
+    async def load_documents(cls, service_ids: list[str], session: AsyncSession) -> list[ServiceDocumentDC]:
+        services_result = await session.execute(
+            select(
+                ServiceSearchModel.service_id,
+                ServiceSearchModel.organization_id,
+                ServiceSearchModel.name,
+                ServiceSearchModel.country,
+                ServiceSearchModel.city,
+                ServiceSearchModel.street,
+                ServiceSearchModel.postal_code,
+                ServiceModel.original_full_address,
+                func.ST_Y(ServiceSearchModel.location).label("latitude"),
+                func.ST_X(ServiceSearchModel.location).label("longitude"),
+                ServiceSearchModel.logo_key,
+                ServiceSearchModel.languages,
+                ServiceSearchModel.updated_at,
+            )
+            .join(ServiceModel, ServiceModel.service_id == ServiceSearchModel.service_id)
+            .filter(ServiceSearchModel.service_id.in_(service_ids))
+        )
+        services = services_result.tuples().all()
+        if not services:
+            return []
+
+        descriptions_result = await session.execute(
+            select(ServiceDescriptionModel.service_id, ServiceDescriptionModel.content).filter(
+                ServiceDescriptionModel.service_id.in_(service_ids)
+            )
+        )
+        descriptions = defaultdict(list)
+        for service_id, content in descriptions_result.tuples().all():
+            descriptions[str(service_id)].append(content)
+
+        offers = await cls.load_offers(service_ids, session)
+
+        return [
+            ServiceDocumentDC(
+                service_id=str(service.service_id),
+                organization_id=str(service.organization_id) if service.organization_id else None,
+                name=service.name,
+                country=service.country.value,
+                city=service.city,
+                street=service.street,
+                postal_code=service.postal_code,
+                address=service.original_full_address,
+                latitude=service.latitude,
+                longitude=service.longitude,
+                logo_key=service.logo_key,
+                languages=list(service.languages),
+                descriptions=descriptions[str(service.service_id)],
+                offers=offers[str(service.service_id)],
+                updated_at=service.updated_at,
+            )
+            for service in services
+        ]
+
+    @staticmethod
+    async def load_offers(service_ids: list[str], session: AsyncSession) -> dict[str, list[OfferDocumentDC]]:
+        compatibility_result = await session.execute(
+            select(
+                OfferCarCompatibilityModel.offer_id,
+                OfferCarCompatibilityModel.car_brand,
+                OfferCarCompatibilityModel.car_type,
+            )
+            .join(OfferModel, OfferModel.offer_id == OfferCarCompatibilityModel.offer_id)
+            .filter(OfferModel.service_id.in_(service_ids))
+        )
+        compatibility = defaultdict(list)
+        for offer_id, car_brand, car_type in compatibility_result.tuples().all():
+            compatibility[str(offer_id)].append((car_brand.value, car_type.value))
+
+        offers_result = await session.execute(
+            select(
+                OfferModel.offer_id,
+                OfferModel.service_id,
+                OfferModel.offer_type,
+                OfferModel.currency,
+                OfferModel.base_price,
+                OfferModel.sale,
+                ServiceSearchHandler.offer_current_price().label("current_price"),
+            ).filter(OfferModel.service_id.in_(service_ids))
+        )
+
+        offers = defaultdict(list)
+        for offer in offers_result.tuples().all():
+            pairs = compatibility[str(offer.offer_id)]
+            offers[str(offer.service_id)].append(
+                OfferDocumentDC(
+                    offer_id=str(offer.offer_id),
+                    offer_type=offer.offer_type.value if offer.offer_type else None,
+                    currency=offer.currency.value,
+                    base_price=offer.base_price,
+                    sale=offer.sale,
+                    current_price=offer.current_price,
+                    car_brands=sorted({car_brand for car_brand, _ in pairs}),
+                    car_types=sorted({car_type for _, car_type in pairs}),
+                    car_pairs=sorted({f"{car_brand}:{car_type}" for car_brand, car_type in pairs}),
+                )
+            )
+        return offers
+
+    @classmethod
+    async def search(
+        cls, service_filter: FilterServiceRequestSchema, user_point: UserPoint | None
+    ) -> ServiceSearchResponseSchema:
+        limit = service_filter.per_page
+        query = cls.search_query(service_filter, user_point)
+
+        try:
+            result: ServiceSearchResultDC = await get_search_backend().search(query)
+        except Exception:
+            logger.exception("Service search backend failed", exc_info=True)
+            raise ServerException()
+
+        has_more = len(result.hits) > limit
+        hits = result.hits[:limit]
+
+        logos = await S3Service().generate_key_urls(
+            [hit.document.logo_key for hit in hits], variant=ImageVariant.SMALL
+        )
+        data = [
+            ServiceListItemSchema(
+                service_id=hit.document.service_id,
+                logo=logo,
+                name=hit.document.name,
+                distance_meters=hit.distance_meters,
+                best_offer=BestOfferSchema(
+                    offer_id=hit.best_offer.offer_id,
+                    offer_type=hit.best_offer.offer_type,
+                    currency=hit.best_offer.currency,
+                    base_price=hit.best_offer.base_price,
+                    sale=hit.best_offer.sale,
+                    current_price=hit.best_offer.current_price,
+                )
+                if hit.best_offer
+                else None,
+            )
+            for hit, logo in zip(hits, logos)
+        ]
+
+        next_cursor = None
+        if has_more and service_filter.is_cursor_mode:
+            next_cursor = encode_cursor("search", hits[-1].sort)
+
+        return ServiceSearchResponseSchema(
+            data=data,
+            total=result.total if service_filter.total_count_strategy != CountStrategy.NONE else None,
+            has_more=has_more,
+            next_cursor=next_cursor,
+            facets=result.facets,
+        )
+
+    @staticmethod
+    def search_query(service_filter: FilterServiceRequestSchema, user_point: UserPoint | None) -> ServiceSearchQueryDC:
+        # one look-ahead hit tells whether a next page exists, as in the Postgres list
+        return ServiceSearchQueryDC(
+            limit=service_filter.per_page + 1,
+            offset=service_filter.page_num * service_filter.per_page - service_filter.per_page,
+            q=service_filter.q,
+            latitude=user_point.latitude if user_point else None,
+            longitude=user_point.longitude if user_point else None,
+            radius_km=service_filter.radius_km,
+            filters=service_filter.model_dump(
+                mode="json", exclude_none=True, include={"organization_id", "name", "country", "city", "street"}
+            ),
+            offer_type=service_filter.offer_type.value if service_filter.offer_type else None,
+            currency=service_filter.currency.value if service_filter.currency else None,
+            max_price=service_filter.max_price,
+            car_brand=service_filter.car_brand.value if service_filter.car_brand else None,
+            car_type=service_filter.car_type.value if service_filter.car_type else None,
+            search_after=decode_cursor(service_filter.cursor, "search") if service_filter.cursor else None,
+        )
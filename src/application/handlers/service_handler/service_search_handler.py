@@ -0,0 +1,201 @@
+import time
+
+from loguru import logger
+from sqlalchemy import (
+    select,
+    delete,
+    insert,
+    func,
+    cast,
+    case,
+    literal,
+    literal_column,
+    union_all,
+    or_,
+    distinct,
+    String,
+    Select,
+)
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, TSVECTOR, REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from application.enums.record_state import RecordState
+from application.enums.services.record_status import RecordStatus
+from application.models import (
+    ServiceModel,
+    OrganizationModel,
+    OfferModel,
+    ServiceDescriptionModel,
+    ServiceSearchModel,
+)
+
+
+class ServiceSearchHandler:
+    any_offer_type: str = "ANY"
+
+    @classmethod
+    async def refresh_services(cls, service_ids: list[str], session: AsyncSession):
+        # runs inside the caller's transaction, so the read model commits together with the source rows
+        if not service_ids:
+            return
+
+        await session.flush()
+        await session.execute(delete(ServiceSearchModel).where(ServiceSearchModel.service_id.in_(service_ids)))
+        await session.execute(
+            insert(ServiceSearchModel).from_select(
+                cls.search_columns(),
+                cls.search_rows_query(service_ids),
+            )
+        )
+
+    @classmethod
+    async def refresh_organization(cls, organization_id: str, session: AsyncSession) -> list[str]:
+        # returns the ids of the refreshed services
+        query_result = await session.execute(
+            select(ServiceModel.service_id).filter(ServiceModel.organization_id == organization_id)
+        )
+        service_ids = [str(service_id) for service_id in query_result.scalars().all()]
+
+        await cls.refresh_services(service_ids, session)
+
+        return service_ids
+
+    @classmethod
+    async def rebuild(cls, session: AsyncSession) -> int:
+        await session.execute(delete(ServiceSearchModel))
+        await session.execute(insert(ServiceSearchModel).from_select(cls.search_columns(), cls.search_rows_query()))
+
+        count_result = await session.execute(select(func.count()).select_from(ServiceSearchModel))
+        total = count_result.scalar_one()
+
+        logger.info(f"Service search rebuilt with {total} services")
+        return total
+
+    @staticmethod
+    def search_columns() -> list[str]:
+        return [
+            "service_id",
+            "organization_id",
+            "name",
+            "country",
+            "city",
+            "street",
+            "postal_code",
+            "location",
+            "logo_key",
+            "min_prices",
+            "languages",
+            "search_document",
+            "search_text",
+            "updated_at",
+        ]
+
+    @classmethod
+    def search_rows_query(cls, service_ids: list[str] | None = None) -> Select:
+        service_criteria = [ServiceModel.service_id.in_(service_ids)] if service_ids is not None else []
+        description_criteria = (
+            [ServiceDescriptionModel.service_id.in_(service_ids)] if service_ids is not None else []
+        )
+
+        min_prices = cls.min_prices_query(service_ids).subquery("min_prices")
+        descriptions = (
+            select(
+                ServiceDescriptionModel.service_id,
+                func.array_agg(distinct(cast(ServiceDescriptionModel.language_code, String))).label("languages"),
+                # tsvector_agg is created by the full-text search migration
+                func.tsvector_agg(ServiceDescriptionModel.search_document).label("descriptions"),
+            )
+            .filter(*description_criteria)
+            .group_by(ServiceDescriptionModel.service_id)
+            .subquery("descriptions")
+        )
+
+        return (
+            select(
+                ServiceModel.service_id,
+                ServiceModel.organization_id,
+                ServiceModel.name,
+                ServiceModel.country,
+                ServiceModel.city,
+                ServiceModel.street,
+                ServiceModel.postal_code,
+                ServiceModel.location,
+                cls.logo_key(),
+                func.coalesce(min_prices.c.min_prices, cast(literal("{}"), JSONB)),
+                func.coalesce(descriptions.c.languages, cast(literal("{}"), ARRAY(String))),
+                cls.search_document(descriptions.c.descriptions),
+                func.concat_ws(" ", ServiceModel.name, ServiceModel.original_full_address),
+                literal(int(time.time())),
+            )
+            .outerjoin(OrganizationModel, OrganizationModel.organization_id == ServiceModel.organization_id)
+            .outerjoin(min_prices, min_prices.c.service_id == ServiceModel.service_id)
+            .outerjoin(descriptions, descriptions.c.service_id == ServiceModel.service_id)
+            .filter(
+                ServiceModel.state == RecordState.ACTIVE,
+                or_(OrganizationModel.organization_id.is_(None), OrganizationModel.status != RecordStatus.ARCHIVED),
+                *service_criteria,
+            )
+        )
+
+    @classmethod
+    def min_prices_query(cls, service_ids: list[str] | None = None) -> Select:
+        current_price = cls.offer_current_price()
+        offer_criteria = [OfferModel.service_id.in_(service_ids)] if service_ids is not None else []
+
+        prices = union_all(
+            select(
+                OfferModel.service_id,
+                cast(OfferModel.offer_type, String).label("price_key"),
+                cast(OfferModel.currency, String).label("currency"),
+                func.min(current_price).label("min_price"),
+            )
+            .filter(OfferModel.offer_type.is_not(None), *offer_criteria)
+            .group_by(OfferModel.service_id, OfferModel.offer_type, OfferModel.currency),
+            select(
+                OfferModel.service_id,
+                literal(cls.any_offer_type).label("price_key"),
+                cast(OfferModel.currency, String).label("currency"),
+                func.min(current_price).label("min_price"),
+            )
+            .filter(*offer_criteria)
+            .group_by(OfferModel.service_id, OfferModel.currency),
+        ).subquery("prices")
+
+        per_key = (
+            select(
+                prices.c.service_id,
+                prices.c.price_key,
+                func.jsonb_object_agg(prices.c.currency, prices.c.min_price).label("prices"),
+            )
+            .group_by(prices.c.service_id, prices.c.price_key)
+            .subquery("per_key")
+        )
+
+        return select(
+            per_key.c.service_id,
+            func.jsonb_object_agg(per_key.c.price_key, per_key.c.prices).label("min_prices"),
+        ).group_by(per_key.c.service_id)
+
+    @staticmethod
+    def search_document(descriptions: ColumnElement) -> ColumnElement:
+        simple = literal("simple", REGCONFIG)
+        name = func.setweight(func.to_tsvector(simple, ServiceModel.name), literal_column("'A'"))
+        address = func.setweight(func.to_tsvector(simple, ServiceModel.original_full_address), literal_column("'C'"))
+        # descriptions keep the lexemes of their own language configuration
+        content = func.setweight(func.coalesce(descriptions, cast(literal(""), TSVECTOR)), literal_column("'B'"))
+        return name.op("||")(address).op("||")(content)
+
+    @staticmethod
+    def logo_key() -> ColumnElement:
+        return case(
+            (
+                ServiceModel.use_organization_logo & ServiceModel.organization_id.is_not(None),
+                func.concat("organizations/logo/", cast(ServiceModel.organization_id, String), ".webp"),
+            ),
+            else_=func.concat("services/logo/", cast(ServiceModel.service_id, String), ".webp"),
+        )
+
+    @staticmethod
+    def offer_current_price() -> ColumnElement:
+        return OfferModel.base_price * (100 - func.coalesce(OfferModel.sale, 0)) / 100.0
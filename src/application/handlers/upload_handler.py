@@ -0,0 +1,148 @@
+import os
+import uuid
+
+from dotenv import load_dotenv
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.dto.jwt_dc import JwtDC
+from application.enums.groups import Groups
+from application.enums.upload_target import UploadTarget
+from application.handlers.cms_handler.cms_car_handler import CMSCarHandler
+from application.handlers.service_handler.service_handler import ServiceHandler
+from application.models import ServiceModel, OrganizationModel, CarBrandModel
+from application.schemas.upload_request_schema import UploadIntentRequestSchema, ConfirmUploadRequestSchema
+from application.schemas.upload_response_schema import UploadIntentResponseSchema, ConfirmUploadResponseSchema
+from application.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from application.utils.s3_service import S3Service
+
+load_dotenv()
+
+
+RASTER_CONTENT_TYPES = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
+LOGO_CONTENT_TYPES = {"image/png": "png", "image/svg+xml": "svg"}
+
+
+class UploadHandler:
+    # clients post straight to S3 under this prefix, a bucket lifecycle rule expires unconfirmed uploads
+    staging_prefix: str = "uploads"
+    intent_expiration: int = int(os.getenv("UPLOAD_INTENT_EXPIRATION", 600))
+
+    content_types: dict[UploadTarget, dict[str, str]] = {
+        UploadTarget.SERVICE_LOGO: RASTER_CONTENT_TYPES,
+        UploadTarget.SERVICE_PHOTO: RASTER_CONTENT_TYPES,
+        UploadTarget.ORGANIZATION_LOGO: LOGO_CONTENT_TYPES,
+        UploadTarget.CAR_BRAND_LOGO: LOGO_CONTENT_TYPES,
+    }
+
+    @classmethod
+    async def create_intent(
+        cls, request: UploadIntentRequestSchema, current_user: JwtDC, session: AsyncSession
+    ) -> UploadIntentResponseSchema:
+        allowed_types = cls.content_types[request.target]
+        if request.content_type not in allowed_types:
+            raise BadRequestException(
+                f"Content type {request.content_type} is not allowed. Allowed types: {', '.join(allowed_types)}"
+            )
+
+        await cls.authorize(request.target, request.target_id, current_user, session)
+
+        if request.target == UploadTarget.SERVICE_PHOTO:
+            await ServiceHandler.check_photo_limit(request.target_id, 1, session)
+
+        s3 = S3Service()
+        upload_key = (
+            f"{cls.staging_key_prefix(request.target, request.target_id)}"
+            f"{uuid.uuid4()}.{allowed_types[request.content_type]}"
+        )
+        post = await s3.create_upload_post(
+            upload_key, request.content_type, S3Service.file_max_size, cls.intent_expiration
+        )
+
+        return UploadIntentResponseSchema(
+            upload_key=upload_key,
+            url=post["url"],
+            fields=post["fields"],
+            max_size=S3Service.file_max_size,
+            expires_in=cls.intent_expiration,
+        )
+
+    @classmethod
+    async def confirm_upload(
+        cls, request: ConfirmUploadRequestSchema, current_user: JwtDC, session: AsyncSession
+    ) -> ConfirmUploadResponseSchema:
+        prefix = cls.staging_key_prefix(request.target, request.target_id)
+        upload_name = request.upload_key.removeprefix(prefix)
+        if upload_name == request.upload_key or "/" in upload_name:
+            raise BadRequestException("Upload does not belong to this target")
+
+        record = await cls.authorize(request.target, request.target_id, current_user, session)
+
+        s3 = S3Service()
+        head = await s3.head_object(request.upload_key)
+        if head is None:
+            raise NotFoundException("Upload not found")
+
+        # the POST policy already enforced both, a mismatch means the object did not come from our intent
+        content_type = head.get("ContentType")
+        if content_type not in cls.content_types[request.target] or head["ContentLength"] > S3Service.file_max_size:
+            raise BadRequestException("Uploaded file does not match the upload intent")
+
+        if request.target == UploadTarget.SERVICE_PHOTO:
+            await ServiceHandler.check_photo_limit(request.target_id, 1, session)
+
+        key = cls.target_key(request.target, record, upload_name)
+        image = await s3.store_uploaded_image(request.upload_key, key, content_type)
+
+        if request.target == UploadTarget.SERVICE_PHOTO:
+            await ServiceHandler.register_photo(request.target_id, key, image, session)
+        elif request.target == UploadTarget.CAR_BRAND_LOGO:
+            record.logo_extension = cls.content_types[request.target][content_type]
+        await session.commit()
+
+        logger.info(f"Stored upload {request.upload_key} as {key}")
+        return ConfirmUploadResponseSchema(key=key, url=await s3.generate_key_url(key))
+
+    @classmethod
+    def staging_key_prefix(cls, target: UploadTarget, target_id: str) -> str:
+        return f"{cls.staging_prefix}/{target.value}/{target_id}/"
+
+    @staticmethod
+    def target_key(target: UploadTarget, record, upload_name: str) -> str:
+        match target:
+            case UploadTarget.SERVICE_LOGO:
+                file_name = os.path.join("services", "logo", str(record.service_id))
+            case UploadTarget.SERVICE_PHOTO:
+                file_name = os.path.join("services", "photos", str(record.service_id), upload_name.split(".")[0])
+            case UploadTarget.ORGANIZATION_LOGO:
+                file_name = os.path.join("organizations", "logo", str(record.organization_id))
+            case UploadTarget.CAR_BRAND_LOGO:
+                file_name = os.path.join(*CMSCarHandler().prefix, CMSCarHandler.brand_file_name(record.car_brand_name))
+        return f"{file_name}{S3Service.extension}"
+
+    @staticmethod
+    async def authorize(target: UploadTarget, target_id: str, current_user: JwtDC, session: AsyncSession):
+        if target in (UploadTarget.SERVICE_LOGO, UploadTarget.SERVICE_PHOTO):
+            service = await session.get(ServiceModel, target_id)
+            if not service:
+                raise NotFoundException("Service not found")
+            if service.user_id != current_user.user_id:
+                raise ForbiddenException("You are not allowed to upload photos")
+            return service
+
+        if target == UploadTarget.ORGANIZATION_LOGO:
+            organization = await session.get(OrganizationModel, target_id)
+            if not organization:
+                raise NotFoundException("Organization not found")
+            if organization.owner != current_user.user_id:
+                raise ForbiddenException("You are not allowed to upload the organization logo")
+            return organization
+
+        if not any(group.value in current_user.groups for group in (Groups.ADMIN, Groups.MODERATOR)):
+            raise ForbiddenException("You are not allowed to upload car brand logos")
+        if not target_id.isdigit():
+            raise BadRequestException("Invalid car brand id")
+        car_brand = await session.get(CarBrandModel, int(target_id))
+        if not car_brand:
+            raise NotFoundException("Car brand not found")
+        return car_brand
@@ -14,9 +14,9 @@ def handler(event, context):
         client.admin_add_user_to_group(
             UserPoolId=event["userPoolId"],
             Username=event["userName"],
-            GroupName="user",
+            GroupName="USER",
         )
-        logger.info(f"User {event['userName']} added to 'user' group")
+        logger.info(f"User {event['userName']} added to 'USER' group")
     except Exception as e:
         logger.exception("Failed to add user to group", exc_info=True)
         raise e
@@ -12,18 +12,48 @@ from application.controllers.services.organization_controller import Organizatio
 from application.controllers.services.schedule_controller import ScheduleController
 from application.controllers.services.service_controller import ServiceController
 from application.controllers.services.user_controller import UserController
+from application.controllers.upload import UploadController
 from application.events.event import get_rabbit_processor, close_rabbit_processor
+from application.handlers.cognito_group_handler import CognitoGroupHandler
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
+from application.utils.cognito_service import close_cognito_client
+from application.utils.gazetteer import close_gazetteer
+from application.utils.image_processing import close_image_pool
+from application.utils.jwks_manager import get_jwks_manager
+from application.utils.redis_helper import close_async_redis
+from application.utils.s3_service import close_s3_client
+from application.utils.search_backend import get_search_backend, close_search_backend
+from application.utils.token_revocation import TokenRevocation
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    await get_jwks_manager().start()
+    TokenRevocation.start_listener()
+    CognitoGroupHandler.start_worker()
+    ServiceIndexHandler.start_worker()
+
     rabbitmq = await get_rabbit_processor()
     await rabbitmq.listen()
 
+    try:
+        await get_search_backend().ensure_index()
+    except Exception:
+        logger.warning("Service search index is unavailable", exc_info=True)
+
     try:
         yield
     finally:
         await close_rabbit_processor()
+        await TokenRevocation.stop_listener()
+        await CognitoGroupHandler.stop_worker()
+        await ServiceIndexHandler.stop_worker()
+        await close_async_redis()
+        await close_search_backend()
+        close_s3_client()
+        close_cognito_client()
+        close_gazetteer()
+        close_image_pool()
 
 
 logger.add("debug.log", rotation="100 MB")
@@ -45,6 +75,7 @@ app.include_router(OrganizationController.router)
 app.include_router(OfferController.router)
 app.include_router(ScheduleController.router)
 app.include_router(CMSController.router)
+app.include_router(UploadController.router)
 
 
 def main():
@@ -2,9 +2,14 @@ from sqlalchemy.orm import configure_mappers
 
 from application.models.users.user_setup import UserSetupModel
 from application.models.users.user_car_relation import UserCarRelationModel
+from application.models.users.cognito_group_change import CognitoGroupChangeModel
 from application.models.services.service import ServiceModel
 from application.models.services.organization import OrganizationModel
+from application.models.services.service_search import ServiceSearchModel
+from application.models.services.service_photo import ServicePhotoModel
+from application.models.services.geocode_cache import GeocodeCacheModel
 from application.models.services.offer import OfferModel
+from application.models.services.offer_car_compatibility import OfferCarCompatibilityModel
 from application.models.cars.car_brand import CarBrandModel
 from application.models.cars.car_type import CarTypeModel
 from application.models.cars.engine_type import EngineTypeModel
@@ -19,7 +24,9 @@ __all__ = [
     "Base",
     "ServiceModel",
     "OrganizationModel",
+    "ServiceSearchModel",
     "OfferModel",
+    "OfferCarCompatibilityModel",
     "CarTypeModel",
     "CarBrandModel",
     "EngineTypeModel",
@@ -27,6 +34,8 @@ __all__ = [
     "RelationTranslatedOfferModel",
     "UserSetupModel",
     "UserCarRelationModel",
+    "CognitoGroupChangeModel",
+    "GeocodeCacheModel",
     "OfferDescriptionModel",
     "ServiceDescriptionModel",
     "OrganizationDescriptionModel"
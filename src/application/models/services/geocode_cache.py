@@ -0,0 +1,19 @@
+import time
+
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from application.models.base import Base
+
+
+class GeocodeCacheModel(Base):
+    __tablename__ = "geocode_cache"
+
+    # normalized address, see get_location.address_key
+    address_key: Mapped[str] = mapped_column(String, primary_key=True)
+    # all three are null when the geocoder found nothing, such rows are retried after GEOCODE_NEGATIVE_TTL
+    address: Mapped[str] = mapped_column(String, nullable=True)
+    latitude: Mapped[float] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float] = mapped_column(Float, nullable=True)
+
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False, default=lambda: int(time.time()))
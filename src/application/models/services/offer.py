@@ -1,10 +1,11 @@
 import time
 import uuid
 
-from sqlalchemy import UUID, Enum, Float, ForeignKey, Integer, Text
+from sqlalchemy import UUID, Enum, Float, ForeignKey, Integer, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.enums.services.currency import Currency
+from application.enums.services.offer_types import OfferType
 from application.models.base import Base
 
 
@@ -13,6 +14,9 @@ class OfferModel(Base):
 
     offer_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
 
+    offer_type: Mapped[OfferType] = mapped_column(
+        Enum(OfferType, length=50, native_enum=False), nullable=True, index=True
+    )
     currency: Mapped[Currency] = mapped_column(Enum(Currency, length=20, native_enum=False), nullable=False, index=True)
     base_price: Mapped[float] = mapped_column(Float, nullable=False, index=True)
     sale: Mapped[int] = mapped_column(Integer, nullable=True, index=True)
@@ -28,8 +32,14 @@ class OfferModel(Base):
     services: Mapped["ServiceModel"] = relationship("ServiceModel", back_populates="offers", lazy="selectin")
     description: Mapped[list["OfferDescriptionModel"]] = relationship("OfferDescriptionModel", back_populates="offers", lazy="selectin")
 
+    offer_car_compatibility: Mapped[list["OfferCarCompatibilityModel"]] = relationship(
+        "OfferCarCompatibilityModel", back_populates="offers", lazy="selectin"
+    )
+
     relation_translated_offers: Mapped[list["RelationTranslatedOfferModel"]] = relationship(
         "RelationTranslatedOfferModel",
         back_populates="offer",
         lazy="selectin"
     )
+
+    __table_args__ = (Index("idx_offers_service_type_currency", "service_id", "offer_type", "currency"),)
@@ -2,7 +2,8 @@ import uuid
 import time
 
 from geoalchemy2 import WKBElement, Geometry
-from sqlalchemy import UUID, String, Text, Integer, Enum, UniqueConstraint, Float
+from sqlalchemy import UUID, String, Text, Integer, Enum, UniqueConstraint, Float, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.inspection import inspect
 from application.enums.services.country import Country
@@ -31,6 +32,15 @@ class OrganizationModel(Base):
     identification_number: Mapped[str] = mapped_column(String, nullable=False, index=True)
     status: Mapped[RecordStatus] = mapped_column(Enum(RecordStatus, native_enum=False, length=50), nullable=False, index=True, default=RecordStatus.INACTIVE)
     owner: Mapped[str] = mapped_column(UUID(as_uuid=False), nullable=False, index=True)
+    search_document: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(original_full_address, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     created_at = mapped_column(Integer, index=True, default=lambda: int(time.time()))
     updated_at = mapped_column(Integer, index=True, default=lambda: int(time.time()), onupdate=lambda: int(time.time()))
@@ -42,6 +52,8 @@ class OrganizationModel(Base):
         UniqueConstraint("name", "identification_number", name="uq_service_identification_number_name"),
         UniqueConstraint("name", "owner", name="uq_owner_organization_name"),
         UniqueConstraint("name", "postal_code", name="uq_postal_code_name"),
+        Index("idx_organization_search_document", "search_document", postgresql_using="gin"),
+        Index("idx_organization_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
     )
 
     def orm_to_dict(self):
@@ -0,0 +1,28 @@
+import time
+import uuid
+
+from sqlalchemy import UUID, ForeignKey, String, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from application.models.base import Base
+
+
+class ServicePhotoModel(Base):
+    __tablename__ = "service_photos"
+
+    photo_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    service_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("services.service_id", ondelete="CASCADE"), nullable=False
+    )
+    # canonical (large variant) key, the small variant is derived from it
+    key: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # unknown for photos registered from an S3 listing by the backfill command
+    width: Mapped[int] = mapped_column(Integer, nullable=True)
+    height: Mapped[int] = mapped_column(Integer, nullable=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=True)
+
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False, default=lambda: int(time.time()))
+
+    __table_args__ = (Index("idx_service_photos_service_id_position", "service_id", "position"),)
@@ -0,0 +1,47 @@
+import time
+
+from geoalchemy2 import Geometry, WKBElement
+from sqlalchemy import UUID, ForeignKey, String, Enum, Integer, Index
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from application.enums.services.country import Country
+from application.models.base import Base
+
+
+class ServiceSearchModel(Base):
+    __tablename__ = "service_search"
+
+    service_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("services.service_id", ondelete="CASCADE"), primary_key=True
+    )
+    organization_id: Mapped[str] = mapped_column(UUID(as_uuid=False), nullable=True, index=True)
+    name: Mapped[str] = mapped_column(String, nullable=False, index=True)
+
+    country: Mapped[Country] = mapped_column(Enum(Country, native_enum=False, length=50), nullable=False, index=True)
+    city: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    street: Mapped[str] = mapped_column(String, nullable=False)
+    postal_code: Mapped[str] = mapped_column(String, nullable=False)
+    location: Mapped[WKBElement] = mapped_column(Geometry(geometry_type="POINT", srid=4326), nullable=False)
+
+    logo_key: Mapped[str] = mapped_column(String, nullable=False)
+    # {"<offer type>" | "ANY": {"<currency>": <lowest current price>}}
+    min_prices: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    languages: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False, default=list)
+    # name (A), address (C) and every description in its own language configuration (B)
+    search_document: Mapped[str] = mapped_column(TSVECTOR, nullable=False)
+    search_text: Mapped[str] = mapped_column(String, nullable=False, default="")
+
+    updated_at: Mapped[int] = mapped_column(Integer, nullable=False, default=lambda: int(time.time()))
+
+    __table_args__ = (
+        Index("idx_service_search_min_prices", "min_prices", postgresql_using="gin"),
+        Index("idx_service_search_languages", "languages", postgresql_using="gin"),
+        Index("idx_service_search_search_document", "search_document", postgresql_using="gin"),
+        Index(
+            "idx_service_search_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
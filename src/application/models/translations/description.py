@@ -1,9 +1,11 @@
-from sqlalchemy import Integer, Enum, String, ForeignKey, UUID, UniqueConstraint
+from sqlalchemy import Integer, Enum, String, ForeignKey, UUID, UniqueConstraint, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from application.enums.services.language import LanguageCode
 from application.models import OrganizationModel
 from application.models.base import Base
+from application.utils.text_search import description_document_sql
 
 
 class OfferDescriptionModel(Base):
@@ -32,11 +34,15 @@ class ServiceDescriptionModel(Base):
         Enum(LanguageCode, native_enum=False, length=20), nullable=False
     )
     content: Mapped[str] = mapped_column(String(120), nullable=False)
+    search_document: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(description_document_sql(), persisted=True), deferred=True
+    )
 
     services: Mapped["ServiceModel"] = relationship("ServiceModel", back_populates="description", lazy="selectin")
 
     __table_args__ = (
         UniqueConstraint("service_id", "language_code", name="uq_service_description_language"),
+        Index("idx_service_description_search_document", "search_document", postgresql_using="gin"),
     )
 
 class OrganizationDescriptionModel (Base):
@@ -48,9 +54,13 @@ class OrganizationDescriptionModel (Base):
         Enum(LanguageCode, native_enum=False, length=20), nullable=False
     )
     content: Mapped[str] = mapped_column(String(120), nullable=False)
+    search_document: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(description_document_sql(), persisted=True), deferred=True
+    )
 
     organization: Mapped["OrganizationModel"] = relationship("OrganizationModel", back_populates="description", lazy="selectin")
 
     __table_args__ = (
         UniqueConstraint("organization_id", "language_code", name="uq_organization_description_language"),
+        Index("idx_organization_description_search_document", "search_document", postgresql_using="gin"),
     )
@@ -0,0 +1,31 @@
+import time
+
+from sqlalchemy import BigInteger, Enum, Index, Integer, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from application.enums.groups import Groups
+from application.models.base import Base
+
+
+class CognitoGroupChangeModel(Base):
+    # outbox of Cognito group assignments, written in the transaction of the change that grants the group
+    __tablename__ = "cognito_group_changes"
+
+    change_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(String, nullable=False)
+    group_name: Mapped[Groups] = mapped_column(Enum(Groups, native_enum=False, length=50), nullable=False)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[int] = mapped_column(Integer, nullable=False, default=lambda: int(time.time()))
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False, default=lambda: int(time.time()))
+    processed_at: Mapped[int] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "idx_cognito_group_changes_pending",
+            "next_attempt_at",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
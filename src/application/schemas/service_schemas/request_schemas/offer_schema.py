@@ -6,6 +6,7 @@ from application.enums.services.car_brands import CarBrands
 from application.enums.services.car_types import CarType
 from application.enums.services.currency import Currency
 from application.enums.services.offer_types import OfferType
+from application.schemas.util_schemas import DescriptionSchema
 
 
 class CarCompatibilitySchema(BaseModel):
@@ -15,7 +16,7 @@ class CarCompatibilitySchema(BaseModel):
 
 class OfferSchema(BaseModel):
     offer_type: OfferType
-    description: str = Field(..., min_length=10)
+    description: list[DescriptionSchema] = Field(..., min_length=1)
     currency: Currency
     base_price: Decimal = Field(..., gt=0)
     sale: int = Field(default=0, ge=0, le=100)
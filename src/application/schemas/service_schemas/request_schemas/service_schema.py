@@ -2,17 +2,56 @@ from uuid import UUID
 
 from pydantic import Field, BaseModel, EmailStr, HttpUrl, model_validator
 
+from application.enums.services.car_brands import CarBrands
+from application.enums.services.car_types import CarType
+from application.enums.services.currency import Currency
+from application.enums.services.offer_types import OfferType
 from application.schemas.constranits import PhoneNumber, IdentificationNumber
-from application.schemas.util_schemas import AddressSchema, DescriptionSchema
+from application.schemas.util_schemas import AddressSchema, DescriptionSchema, PaginationRequestSchema
 
 
-class FilterServiceRequestSchema(BaseModel):
+class FilterServiceRequestSchema(PaginationRequestSchema):
     organization_id: UUID | None = Field(default=None, description="Organization ID")
+    q: str | None = Field(
+        default=None, min_length=2, max_length=200, description="Full-text query over name, address and descriptions"
+    )
     name: str | None = Field(default=None, description="Service Name")
     city: str | None = Field(default=None, description="City")
     country: str | None = Field(default=None, description="Country")
     street: str | None = Field(default=None, description="Street Address")
     current_location: str | None = Field(default=None, description="Current location in format 'latitude,longitude'")
+    radius_km: float | None = Field(default=None, gt=0, le=500, description="Search radius around current_location in km")
+    max_distance: float | None = Field(default=None, gt=0, le=500, description="Alias of radius_km")
+    offer_type: OfferType | None = Field(default=None, description="Offer type the service must provide")
+    max_price: float | None = Field(default=None, gt=0, description="Maximum offer price after sale")
+    currency: Currency | None = Field(default=None, description="Offer currency")
+    car_brand: CarBrands | None = Field(default=None, description="Car brand the offer must be compatible with")
+    car_type: CarType | None = Field(default=None, description="Car type the offer must be compatible with")
+
+    @model_validator(mode="after")
+    def radius_validator(self) -> "FilterServiceRequestSchema":
+        if self.radius_km is None:
+            self.radius_km = self.max_distance
+        if self.radius_km is not None and self.current_location is None:
+            raise ValueError("current_location is required when radius_km is set")
+        return self
+
+    @model_validator(mode="after")
+    def price_validator(self) -> "FilterServiceRequestSchema":
+        if self.max_price is not None and self.currency is None:
+            raise ValueError("currency is required when max_price is set")
+        return self
+
+    @property
+    def has_offer_filter(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.offer_type, self.max_price, self.currency, self.car_brand, self.car_type)
+        )
+
+
+class ServicesByIdsRequestSchema(BaseModel):
+    service_ids: list[UUID] = Field(..., min_length=1, max_length=50, description="Service IDs in the order to return")
 
 
 class AddServiceRequestSchema(BaseModel):
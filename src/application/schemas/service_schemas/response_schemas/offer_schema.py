@@ -5,6 +5,7 @@ from pydantic import BaseModel, ConfigDict, Field, computed_field
 from application.enums.services.car_brands import CarBrands
 from application.enums.services.car_types import CarType
 from application.enums.services.offer_types import OfferType
+from application.schemas.util_schemas import DescriptionSchema
 
 
 class ManipulateOfferResponseSchema(BaseModel):
@@ -24,10 +25,10 @@ class CarCompatibilitySchema(BaseModel):
 
 class OffersSchema(BaseModel):
     offer_id: UUID
-    offer_type: OfferType
-    description: str
+    offer_type: OfferType | None = None
+    description: list[DescriptionSchema] = Field(default_factory=list)
     base_price: float
-    sale: int
+    sale: int | None = None
     currency: str
     estimated_duration_minutes: int
     # offer_car_compatibility: list[CarCompatibilitySchema] = Field(default=list)
@@ -43,3 +44,12 @@ class OffersSchema(BaseModel):
             discount = (self.sale / 100) * self.base_price
             return round(self.base_price - discount, 2)
         return self.base_price
+
+
+class BestOfferSchema(BaseModel):
+    offer_id: UUID
+    offer_type: OfferType | None = None
+    currency: str
+    base_price: float
+    sale: int | None = None
+    current_price: float
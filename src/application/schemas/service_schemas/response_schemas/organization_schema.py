@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from application.enums.services.record_status import RecordStatus
 from application.schemas.util_schemas import EntityItem
@@ -34,4 +34,6 @@ class OrganizationItem(EntityItem):
 
 class OrganizationItemsResponseSchema(BaseModel):
     data: list[OrganizationItem]
-    total: int
+    total: int | None = Field(default=None, description="Total number of matches, null when count_strategy is NONE")
+    has_more: bool = Field(default=False, description="Whether a next page exists")
+    next_cursor: str | None = Field(default=None, description="Cursor of the next page, null on the last page")
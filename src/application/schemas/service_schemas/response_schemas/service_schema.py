@@ -4,7 +4,7 @@ from geoalchemy2.shape import to_shape
 from pydantic import BaseModel, Field, HttpUrl, EmailStr, ConfigDict, model_validator
 
 from application.schemas.constranits import PhoneNumber, IdentificationNumber
-from application.schemas.service_schemas.response_schemas.offer_schema import OffersSchema
+from application.schemas.service_schemas.response_schemas.offer_schema import OffersSchema, BestOfferSchema
 from application.schemas.util_schemas import EntityItem, AddressSchema, DescriptionSchema
 
 
@@ -56,14 +56,41 @@ class ServiceItemSchema(ServiceResponseSchema):
     offers: list[OffersSchema] = Field(default=list)
 
 
+class ServicesByIdsResponseSchema(BaseModel):
+    data: list[ServiceItemSchema] = Field(..., description="Found services in request order")
+    missing: list[str] = Field(default_factory=list, description="Requested IDs without a service")
+
+
 class ServiceListItemSchema(BaseModel):
     service_id: str = Field(..., description="Service ID")
     logo: HttpUrl = Field(..., description="Service logo")
     name: str = Field(..., description="Service name")
     distance_meters: float | None = Field(default=None, description="Service distance in meters")
+    best_offer: BestOfferSchema | None = Field(default=None, description="Cheapest offer matching the offer filters")
 
     model_config = ConfigDict(from_attributes=True)
 
+
 class ServiceItemsResponseSchema(BaseModel):
     data: list[ServiceListItemSchema]
-    total: int
+    total: int | None = Field(default=None, description="Total number of matches, null when count_strategy is NONE")
+    has_more: bool = Field(default=False, description="Whether a next page exists")
+    next_cursor: str | None = Field(default=None, description="Cursor of the next page, null on the last page")
+
+
+class ServiceSearchResponseSchema(ServiceItemsResponseSchema):
+    facets: dict[str, dict[str, int]] = Field(
+        default_factory=dict, description="Matching service counts per city, country and offer_type"
+    )
+
+
+class PhotoUploadResultSchema(BaseModel):
+    file_name: str = Field(..., description="Name of the uploaded file")
+    key: str = Field(..., description="Storage key of the photo")
+    url: HttpUrl = Field(..., description="Photo url")
+    width: int = Field(..., description="Width of the stored photo in pixels")
+    height: int = Field(..., description="Height of the stored photo in pixels")
+
+
+class UploadPhotosResponseSchema(BaseModel):
+    data: list[PhotoUploadResultSchema] = Field(..., description="Uploaded photos in request order")
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+from application.enums.upload_target import UploadTarget
+
+
+class UploadIntentRequestSchema(BaseModel):
+    target: UploadTarget
+    target_id: str = Field(..., min_length=1, max_length=64, description="Service, organization or car brand id")
+    content_type: str = Field(..., description="MIME type of the file the client is going to upload")
+
+
+class ConfirmUploadRequestSchema(BaseModel):
+    target: UploadTarget
+    target_id: str = Field(..., min_length=1, max_length=64)
+    upload_key: str = Field(..., description="Key returned by the upload intent")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field, HttpUrl
+
+
+class UploadIntentResponseSchema(BaseModel):
+    upload_key: str
+    url: HttpUrl = Field(..., description="S3 endpoint the form is posted to")
+    fields: dict[str, str] = Field(..., description="Form fields to send before the file field")
+    max_size: int
+    expires_in: int
+
+
+class ConfirmUploadResponseSchema(BaseModel):
+    key: str
+    url: HttpUrl
@@ -2,22 +2,44 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 
+from application.enums.count_strategy import CountStrategy
+from application.enums.pagination_mode import PaginationMode
 from application.enums.services.language import LanguageCode
 from application.enums.services.country import Country
 from application.enums.services.record_status import RecordStatus
 from application.schemas.constranits import IdentificationNumber, PhoneNumber
 
 
-class FilterEntityRequestSchema(BaseModel):
+class PaginationRequestSchema(BaseModel):
+    per_page: int = Field(default=10, ge=1, le=100)
+    page_num: int = Field(default=1, ge=1)
+    pagination: PaginationMode = Field(default=PaginationMode.OFFSET, description="OFFSET pages or opaque CURSOR pages")
+    cursor: str | None = Field(default=None, description="Opaque cursor returned as next_cursor by the previous page")
+    count_strategy: CountStrategy | None = Field(
+        default=None,
+        description="How total is computed, defaults to EXACT for offset pages and NONE for cursor pages",
+    )
+
+    @property
+    def is_cursor_mode(self) -> bool:
+        return self.pagination == PaginationMode.CURSOR or self.cursor is not None
+
+    @property
+    def total_count_strategy(self) -> CountStrategy:
+        if self.count_strategy is not None:
+            return self.count_strategy
+        return CountStrategy.NONE if self.is_cursor_mode else CountStrategy.EXACT
+
+
+class FilterEntityRequestSchema(PaginationRequestSchema):
     organization_id: UUID | None = Field(default=None)
+    q: str | None = Field(default=None, min_length=2, max_length=200)
     name: str | None = Field(default=None, min_length=2, max_length=100)
     country: Country | None = Field(default=None)
     city: str | None = Field(default=None, min_length=2, max_length=100)
     postal_code: str | None = Field(default=None, min_length=4, max_length=20)
     identification_number: IdentificationNumber | None = Field(default=None)
     status: RecordStatus | None = Field(default=RecordStatus.ACTIVE)
-    per_page: int = Field(default=10)
-    page_num: int = Field(default=1)
 
 
 class EntityItem(BaseModel):
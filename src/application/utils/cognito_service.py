@@ -1,9 +1,14 @@
+from __future__ import annotations
+
+import asyncio
 import base64
 import hashlib
 import hmac
 import os
+import threading
+
 from boto3 import Session
-from debugpy.adapter import access_token
+from botocore.client import BaseClient, Config
 from loguru import logger
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
@@ -15,17 +20,56 @@ from application.utils.exceptions import BadRequestException
 load_dotenv()
 
 
+_cognito_client: BaseClient | None = None
+_cognito_client_lock = threading.Lock()
+
+
+def get_cognito_client() -> BaseClient:
+    # one client per worker, its connection pool is shared by every request instead of a new session per call
+    global _cognito_client
+
+    if _cognito_client is None:
+        with _cognito_client_lock:
+            if _cognito_client is None:
+                session = Session(profile_name=os.getenv("AWS_PROFILE", "default"))
+                _cognito_client = session.client(
+                    "cognito-idp",
+                    region_name=os.getenv("AWS_REGION", "us-east-1"),
+                    config=Config(
+                        max_pool_connections=int(os.getenv("COGNITO_MAX_POOL_CONNECTIONS", 20)),
+                        connect_timeout=float(os.getenv("COGNITO_CONNECT_TIMEOUT", 2)),
+                        read_timeout=float(os.getenv("COGNITO_READ_TIMEOUT", 5)),
+                        retries={"max_attempts": int(os.getenv("COGNITO_MAX_ATTEMPTS", 3)), "mode": "standard"},
+                        tcp_keepalive=True,
+                    ),
+                )
+    return _cognito_client
+
+
+def close_cognito_client():
+    global _cognito_client
+
+    if _cognito_client is not None:
+        _cognito_client.close()
+        _cognito_client = None
+
+
 class CognitoService:
     app_client_id: str = os.getenv("AWS_COGNITO_APP_CLIENT_ID")
     app_client_secret: str = os.getenv("AWS_COGNITO_APP_CLIENT_SECRET")
 
-    def __init__(self):
-        session = Session(profile_name=os.getenv("AWS_PROFILE", "default"))
-        self.client = session.client("cognito-idp", region_name=os.getenv("AWS_REGION", "us-east-1"))
+    @property
+    def client(self) -> BaseClient:
+        return get_cognito_client()
 
-    def sign_up_user(self, password: str, email: str):
+    async def call(self, operation: str, **params) -> dict:
+        # boto3 blocks, the request runs on a worker thread while the event loop serves others
+        return await asyncio.to_thread(getattr(self.client, operation), **params)
+
+    async def sign_up_user(self, password: str, email: str):
         try:
-            response = self.client.sign_up(
+            response = await self.call(
+                "sign_up",
                 ClientId=self.app_client_id,
                 Username=email,
                 Password=password,
@@ -37,12 +81,13 @@ class CognitoService:
             logger.exception("Error signing up user", exc_info=True)
             raise e
 
-    def add_user_to_group(self, username: str, group_name: Groups):
+    async def add_user_to_group(self, username: str, group_name: Groups):
         try:
             if not username:
                 raise BadRequestException("Username is required to add user to group")
 
-            response = self.client.admin_add_user_to_group(
+            response = await self.call(
+                "admin_add_user_to_group",
                 UserPoolId=os.getenv("AWS_USER_POOL_ID"),
                 Username=username,
                 GroupName=group_name.value,
@@ -52,9 +97,10 @@ class CognitoService:
             logger.exception("Error adding user to group", exc_info=True)
             raise e
 
-    def login_user(self, username: str, password: str):
+    async def login_user(self, username: str, password: str):
         try:
-            response = self.client.initiate_auth(
+            response = await self.call(
+                "initiate_auth",
                 ClientId=self.app_client_id,
                 AuthFlow="USER_PASSWORD_AUTH",
                 AuthParameters={
@@ -75,19 +121,18 @@ class CognitoService:
             logger.exception("Error logging in user", exc_info=True)
             raise e
 
-    def logout_user(self, access_token: str):
+    async def logout_user(self, access_token: str):
         try:
-            response = self.client.global_sign_out(
-                AccessToken=access_token
-            )
+            response = await self.call("global_sign_out", AccessToken=access_token)
             return response
         except ClientError as e:
             logger.exception("Error logging out user", exc_info=True)
             raise e
 
-    def confirm_user(self, username: str, confirmation_code: str):
+    async def confirm_user(self, username: str, confirmation_code: str):
         try:
-            response = self.client.confirm_sign_up(
+            response = await self.call(
+                "confirm_sign_up",
                 ClientId=self.app_client_id,
                 Username=username,
                 ConfirmationCode=confirmation_code,
@@ -98,20 +143,22 @@ class CognitoService:
             logger.exception("Error confirming user", exc_info=True)
             raise e
 
-    def refresh_token(self, refresh_token: str):
+    async def refresh_token(self, refresh_token: str, username: str):
+        # the secret hash of a refresh is computed over the cognito username, the sub of the token owner
         try:
-            response = self.client.initiate_auth(
+            response = await self.call(
+                "initiate_auth",
                 ClientId=self.app_client_id,
                 AuthFlow="REFRESH_TOKEN_AUTH",
                 AuthParameters={
                     "REFRESH_TOKEN": refresh_token,
-                    "SECRET_HASH": self.app_client_secret,
+                    "SECRET_HASH": self.get_secret_hash(username),
                 },
             )
             auth = response["AuthenticationResult"]
             return AuthResponseSchema(
                 access_token=auth["AccessToken"],
-                refresh_token=refresh_token,
+                refresh_token=auth.get("RefreshToken", refresh_token),
                 id_token=auth["IdToken"],
                 expires_in=auth["ExpiresIn"],
                 token_type=auth["TokenType"],
@@ -120,9 +167,10 @@ class CognitoService:
             logger.exception("Error refreshing token", exc_info=True)
             raise e
 
-    def forgot_password(self, username: str):
+    async def forgot_password(self, username: str):
         try:
-            response = self.client.forgot_password(
+            response = await self.call(
+                "forgot_password",
                 ClientId=self.app_client_id,
                 Username=username,
                 SecretHash=self.get_secret_hash(username),
@@ -132,9 +180,10 @@ class CognitoService:
             logger.exception("Error initiating forgot password flow", exc_info=True)
             raise e
 
-    def reset_password(self, username: str, confirmation_code: str, new_password: str):
+    async def reset_password(self, username: str, confirmation_code: str, new_password: str):
         try:
-            response = self.client.confirm_forgot_password(
+            response = await self.call(
+                "confirm_forgot_password",
                 ClientId=self.app_client_id,
                 Username=username,
                 ConfirmationCode=confirmation_code,
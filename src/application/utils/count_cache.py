@@ -0,0 +1,48 @@
+import hashlib
+import os
+
+from dotenv import load_dotenv
+from loguru import logger
+from redis.exceptions import RedisError
+
+from application.utils.redis_helper import get_async_redis
+
+load_dotenv()
+
+
+class CountCache:
+    key_prefix: str = "count"
+    ttl: int = int(os.getenv("COUNT_CACHE_TTL", 300))
+
+    @classmethod
+    def generation_key(cls, table_name: str) -> str:
+        return f"{cls.key_prefix}:{table_name}:generation"
+
+    @classmethod
+    async def get(cls, table_name: str, statement_key: str) -> tuple[str | None, int | None]:
+        try:
+            redis = get_async_redis()
+            generation = int(await redis.get(cls.generation_key(table_name)) or 0)
+            digest = hashlib.sha1(statement_key.encode()).hexdigest()
+            cache_key = f"{cls.key_prefix}:{table_name}:{generation}:{digest}"
+
+            cached = await redis.get(cache_key)
+            return cache_key, int(cached) if cached is not None else None
+        except RedisError:
+            logger.warning("Count cache unavailable", exc_info=True)
+            return None, None
+
+    @classmethod
+    async def set(cls, cache_key: str, total_count: int):
+        try:
+            await get_async_redis().set(cache_key, total_count, ex=cls.ttl)
+        except RedisError:
+            logger.warning("Failed to store cached count", exc_info=True)
+
+    @classmethod
+    async def invalidate(cls, table_name: str):
+        # bumping the generation orphans every cached count of the table, they expire by ttl
+        try:
+            await get_async_redis().incr(cls.generation_key(table_name))
+        except RedisError:
+            logger.warning(f"Failed to invalidate count cache of {table_name}", exc_info=True)
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections.abc import Iterable, Iterator
+from enum import StrEnum
+
+from dotenv import load_dotenv
+from geopy import Location
+from loguru import logger
+
+from application.enums.services.country import Country
+
+load_dotenv()
+
+
+COUNTRY_CODES: dict[Country, str] = {
+    Country.SLOVAKIA: "SK",
+    Country.CZECHIA: "CZ",
+    Country.AUSTRIA: "AT",
+    Country.POLAND: "PL",
+    Country.HUNGARY: "HU",
+}
+
+# country, postal code, place, latitude, longitude
+PostcodeRow = tuple[str, str, str, float, float]
+# country, postal code, city, street, house number, latitude, longitude
+AddressRow = tuple[str, str, str, str, str, float, float]
+
+SCHEMA = """
+CREATE TABLE postcode_points (country TEXT, postal_code TEXT, place TEXT, latitude REAL, longitude REAL);
+CREATE TABLE address_points (
+    country TEXT, postal_code TEXT, city TEXT, city_norm TEXT, street TEXT, street_norm TEXT, number TEXT,
+    latitude REAL, longitude REAL
+);
+CREATE TABLE postcodes (
+    country TEXT, postal_code TEXT, place TEXT, latitude REAL, longitude REAL, PRIMARY KEY (country, postal_code)
+) WITHOUT ROWID;
+CREATE TABLE streets (
+    street_id INTEGER PRIMARY KEY, country TEXT, postal_code TEXT, city TEXT, city_norm TEXT, street TEXT,
+    street_norm TEXT, latitude REAL, longitude REAL, trigram_count INTEGER
+);
+CREATE TABLE houses (
+    street_id INTEGER, number TEXT, latitude REAL, longitude REAL, PRIMARY KEY (street_id, number)
+) WITHOUT ROWID;
+CREATE TABLE street_trigrams (trigram TEXT, street_id INTEGER, PRIMARY KEY (trigram, street_id)) WITHOUT ROWID;
+"""
+
+
+class GazetteerPrecision(StrEnum):
+    HOUSE = "house"
+    STREET = "street"
+    POSTCODE = "postcode"
+
+
+def normalize(value: str) -> str:
+    # accents, case and punctuation differ between user input and the extracts, "Hlavná 1/A" == "hlavna 1 a"
+    value = "".join(char for char in unicodedata.normalize("NFKD", value) if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[\W_]+", " ", value.casefold()).split())
+
+
+def trigrams(value: str) -> set[str]:
+    # pg_trgm style, every word is padded with two spaces in front and one behind
+    result = set()
+    for word in normalize(value).split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def house_numbers(number: str) -> set[str]:
+    # "1234/5" is found by the full number and by each of its parts, people often write only one of them
+    normalized = normalize(number)
+    if not normalized:
+        return set()
+    return {normalized, *(normalize(part) for part in number.split("/") if normalize(part))}
+
+
+def read_geonames_postcodes(path: str) -> Iterator[PostcodeRow]:
+    # tab separated GeoNames postal code dump, https://download.geonames.org/export/zip/<CC>.zip
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.reader(file, delimiter="\t"):
+            if len(row) >= 11 and row[9] and row[10]:
+                yield row[0], row[1].replace(" ", ""), row[2], float(row[9]), float(row[10])
+
+
+def read_openaddresses(path: str, country_code: str) -> Iterator[AddressRow]:
+    # OpenAddresses csv extract with LON, LAT, NUMBER, STREET, CITY and POSTCODE columns
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            if row.get("STREET") and row.get("LAT") and row.get("LON"):
+                yield (
+                    country_code,
+                    (row.get("POSTCODE") or "").replace(" ", ""),
+                    row.get("CITY") or "",
+                    row["STREET"],
+                    row.get("NUMBER") or "",
+                    float(row["LAT"]),
+                    float(row["LON"]),
+                )
+
+
+class GazetteerBuilder:
+    def __init__(self, path: str):
+        if os.path.exists(path):
+            os.remove(path)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def add_postcodes(self, rows: Iterable[PostcodeRow]):
+        self.connection.executemany("INSERT INTO postcode_points VALUES (?, ?, ?, ?, ?)", rows)
+
+    def add_addresses(self, rows: Iterable[AddressRow]):
+        self.connection.executemany(
+            "INSERT INTO address_points VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (country, postal_code, city, normalize(city), street, normalize(street), number, latitude, longitude)
+                for country, postal_code, city, street, number, latitude, longitude in rows
+            ),
+        )
+
+    def finish(self):
+        connection = self.connection
+        # a postal code spanning several places gets the centroid of all of them
+        connection.execute(
+            "INSERT INTO postcodes SELECT country, postal_code, MIN(place), AVG(latitude), AVG(longitude) "
+            "FROM postcode_points GROUP BY country, postal_code"
+        )
+        connection.execute(
+            "INSERT INTO streets (country, postal_code, city, city_norm, street, street_norm, latitude, longitude) "
+            "SELECT country, postal_code, MIN(city), city_norm, MIN(street), street_norm, AVG(latitude), "
+            "AVG(longitude) FROM address_points GROUP BY country, postal_code, city_norm, street_norm"
+        )
+
+        street_ids = {
+            (country, postal_code, city_norm, street_norm): street_id
+            for street_id, country, postal_code, city_norm, street_norm in connection.execute(
+                "SELECT street_id, country, postal_code, city_norm, street_norm FROM streets"
+            )
+        }
+        houses = {}
+        for country, postal_code, city_norm, street_norm, number, latitude, longitude in connection.execute(
+            "SELECT country, postal_code, city_norm, street_norm, number, latitude, longitude FROM address_points"
+        ):
+            street_id = street_ids[(country, postal_code, city_norm, street_norm)]
+            for house_number in house_numbers(number):
+                houses.setdefault((street_id, house_number), (latitude, longitude))
+        connection.executemany(
+            "INSERT INTO houses VALUES (?, ?, ?, ?)",
+            ((street_id, number, latitude, longitude) for (street_id, number), (latitude, longitude) in houses.items()),
+        )
+
+        street_trigrams = []
+        for street_id, street_norm in connection.execute("SELECT street_id, street_norm FROM streets").fetchall():
+            grams = trigrams(street_norm)
+            connection.execute("UPDATE streets SET trigram_count = ? WHERE street_id = ?", (len(grams), street_id))
+            street_trigrams.extend((gram, street_id) for gram in grams)
+        connection.executemany("INSERT INTO street_trigrams VALUES (?, ?)", street_trigrams)
+
+        connection.executescript(
+            """
+            DROP TABLE postcode_points;
+            DROP TABLE address_points;
+            CREATE INDEX idx_streets_street ON streets (country, street_norm);
+            CREATE INDEX idx_streets_postal_code ON streets (country, postal_code);
+            CREATE INDEX idx_streets_city ON streets (country, city_norm);
+            """
+        )
+        connection.commit()
+        connection.execute("VACUUM")
+        connection.close()
+        logger.info(f"Gazetteer built with {len(street_ids)} streets and {len(houses)} house numbers")
+
+
+class Gazetteer:
+    # offline geocoder over a sqlite file made by GazetteerBuilder, read only and shared by the worker threads
+    similarity_threshold: float = float(os.getenv("GAZETTEER_SIMILARITY_THRESHOLD", 0.5))
+    candidate_limit: int = 20
+
+    def __init__(self, path: str, postcode_fallback: bool = False):
+        self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        # a postal code centroid can be kilometres off, it is only used when allowed explicitly
+        self.postcode_fallback = postcode_fallback
+
+    def lookup(
+        self, country: Country, city: str, street: str, house_number: str, postal_code: str
+    ) -> Location | None:
+        country_code = COUNTRY_CODES.get(country)
+        if country_code is None:
+            return None
+        postal_code = postal_code.replace(" ", "")
+        city_norm = normalize(city)
+
+        street_row = self.find_street(country_code, postal_code, city_norm, normalize(street))
+        if street_row is not None:
+            street_id, street_name, street_postal_code, street_city, latitude, longitude = street_row
+            precision = GazetteerPrecision.STREET
+            for number in sorted(house_numbers(house_number), key=len, reverse=True):
+                house = self.connection.execute(
+                    "SELECT latitude, longitude FROM houses WHERE street_id = ? AND number = ?", (street_id, number)
+                ).fetchone()
+                if house is not None:
+                    latitude, longitude = house
+                    precision = GazetteerPrecision.HOUSE
+                    break
+
+            address = f"{street_name} {house_number}, {street_postal_code or postal_code} {street_city or city}"
+            return self.location(address, country, latitude, longitude, precision)
+
+        if self.postcode_fallback:
+            postcode = self.connection.execute(
+                "SELECT place, latitude, longitude FROM postcodes WHERE country = ? AND postal_code = ?",
+                (country_code, postal_code),
+            ).fetchone()
+            if postcode is not None:
+                place, latitude, longitude = postcode
+                address = f"{postal_code} {place}"
+                return self.location(address, country, latitude, longitude, GazetteerPrecision.POSTCODE)
+        return None
+
+    def find_street(self, country_code: str, postal_code: str, city_norm: str, street_norm: str) -> tuple | None:
+        columns = "street_id, street, postal_code, city, latitude, longitude"
+        street = self.connection.execute(
+            f"SELECT {columns} FROM streets WHERE country = ? AND street_norm = ? "
+            "AND (postal_code = ? OR city_norm = ?) ORDER BY postal_code = ? DESC LIMIT 1",
+            (country_code, street_norm, postal_code, city_norm, postal_code),
+        ).fetchone()
+        if street is not None or not street_norm:
+            return street
+
+        # misspelled or abbreviated names, the most similar street of the same postal code or city
+        grams = trigrams(street_norm)
+        candidates = self.connection.execute(
+            f"SELECT {columns}, trigram_count, COUNT(*) AS shared FROM street_trigrams "
+            "JOIN streets USING (street_id) "
+            f"WHERE trigram IN ({', '.join('?' * len(grams))}) AND country = ? AND (postal_code = ? OR city_norm = ?) "
+            "GROUP BY street_id ORDER BY shared DESC LIMIT ?",
+            (*grams, country_code, postal_code, city_norm, self.candidate_limit),
+        ).fetchall()
+
+        best, best_similarity = None, self.similarity_threshold
+        for *candidate, trigram_count, shared in candidates:
+            similarity = shared / (len(grams) + trigram_count - shared)
+            if similarity >= best_similarity:
+                best, best_similarity = tuple(candidate), similarity
+        return best
+
+    @staticmethod
+    def location(
+        address: str, country: Country, latitude: float, longitude: float, precision: GazetteerPrecision
+    ) -> Location:
+        return Location(
+            f"{address}, {country.value.title()}",
+            (latitude, longitude),
+            {"source": "gazetteer", "precision": precision.value},
+        )
+
+    def close(self):
+        self.connection.close()
+
+
+_gazetteer: Gazetteer | None = None
+_gazetteer_loaded = False
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer | None:
+    # None without a built file, addresses then go to the remote geocoder only
+    global _gazetteer, _gazetteer_loaded
+
+    if not _gazetteer_loaded:
+        with _gazetteer_lock:
+            if not _gazetteer_loaded:
+                path = os.getenv("GAZETTEER_PATH", "data/gazetteer.sqlite")
+                if os.path.exists(path):
+                    _gazetteer = Gazetteer(
+                        path, postcode_fallback=os.getenv("GAZETTEER_POSTCODE_FALLBACK", "false").lower() == "true"
+                    )
+                else:
+                    logger.info(f"No gazetteer at {path}, geocoding uses the remote geocoder only")
+                _gazetteer_loaded = True
+    return _gazetteer
+
+
+def close_gazetteer():
+    global _gazetteer, _gazetteer_loaded
+
+    if _gazetteer is not None:
+        _gazetteer.close()
+    _gazetteer, _gazetteer_loaded = None, False
@@ -0,0 +1,54 @@
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+BASE32_INDEX = {char: index for index, char in enumerate(BASE32)}
+
+
+def encode(latitude: float, longitude: float, precision: int = 5) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+
+    while len(geohash) < precision:
+        value_range, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (value_range[0] + value_range[1]) / 2
+
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits <<= 1
+            value_range[1] = middle
+
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(geohash)
+
+
+def decode_bbox(geohash: str) -> tuple[float, float, float, float]:
+    # (min_latitude, max_latitude, min_longitude, max_longitude) of the cell
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        bits = BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            middle = (value_range[0] + value_range[1]) / 2
+
+            if bits >> shift & 1:
+                value_range[0] = middle
+            else:
+                value_range[1] = middle
+
+            even = not even
+
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def decode(geohash: str) -> tuple[float, float]:
+    min_lat, max_lat, min_lon, max_lon = decode_bbox(geohash)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
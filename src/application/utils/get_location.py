@@ -1,11 +1,184 @@
+import asyncio
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from dotenv import load_dotenv
 from geopy import Location
 from geopy.geocoders import Nominatim
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 
 from application.enums.services.country import Country
+from application.models import GeocodeCacheModel
+from application.models.engine import SessionFactory
+from application.utils.gazetteer import get_gazetteer
+from application.utils.redis_helper import get_async_redis
+
+load_dotenv()
+
+
+_geocoder: Nominatim | None = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> Nominatim:
+    global _geocoder
+
+    if _geocoder is None:
+        with _geocoder_lock:
+            if _geocoder is None:
+                _geocoder = Nominatim(
+                    user_agent=os.getenv("GEOCODER_USER_AGENT", "car-service"),
+                    domain=os.getenv("GEOCODER_DOMAIN", "nominatim.openstreetmap.org"),
+                    timeout=float(os.getenv("GEOCODER_TIMEOUT", 5)),
+                )
+    return _geocoder
+
+
+def address_key(country: Country, city: str, street: str, house_number: str, postal_code: str) -> str:
+    # case, unicode compatibility forms, spacing and postal code formatting do not change the address
+    parts = [country.value, postal_code.replace(" ", ""), city, street, house_number]
+    return "|".join(re.sub(r"\s+", " ", unicodedata.normalize("NFKC", part)).strip().casefold() for part in parts)
+
+
+class GeocodeRateLimiter:
+    # the public Nominatim allows one request per second for the whole application, Redis spaces all workers
+    key: str = "geocode:rate"
+    interval: float = float(os.getenv("GEOCODE_MIN_INTERVAL", 1))
+
+    lock: asyncio.Lock = asyncio.Lock()
+    last_call: float = 0.0
+
+    @classmethod
+    async def acquire(cls):
+        # one waiter per worker polls Redis, the others queue on the lock
+        async with cls.lock:
+            while True:
+                wait = await cls.try_acquire()
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    @classmethod
+    async def try_acquire(cls) -> float:
+        try:
+            redis = get_async_redis()
+            if await redis.set(cls.key, 1, nx=True, px=int(cls.interval * 1000)):
+                return 0
+            return max(await redis.pttl(cls.key), 10) / 1000
+        except RedisError:
+            logger.warning("Geocode rate limiter falls back to this worker only", exc_info=True)
+
+        wait = cls.last_call + cls.interval - time.monotonic()
+        if wait <= 0:
+            cls.last_call = time.monotonic()
+        return wait
+
+
+class GeocodeCache:
+    max_entries: int = int(os.getenv("GEOCODE_CACHE_SIZE", 10000))
+    # addresses the geocoder did not find are asked again after this many seconds
+    negative_ttl: int = int(os.getenv("GEOCODE_NEGATIVE_TTL", 86400))
+
+    # address key -> (expires_at, location), least recently used first
+    entries: OrderedDict[str, tuple[float, Location | None]] = OrderedDict()
+    # lookups in progress, concurrent requests for the same address wait for the same one
+    inflight: dict[str, asyncio.Task] = {}
+
+    @classmethod
+    async def get_location(cls, key: str, query: str) -> Location | None:
+        entry = cls.entries.get(key)
+        if entry is not None and entry[0] > time.time():
+            cls.entries.move_to_end(key)
+            return entry[1]
+
+        task = cls.inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(cls.load(key, query))
+            cls.inflight[key] = task
+            task.add_done_callback(lambda _: cls.inflight.pop(key, None))
+        # a cancelled request must not cancel the lookup others are waiting for
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def load(cls, key: str, query: str) -> Location | None:
+        row = await cls.get_stored(key)
+        if row is not None:
+            location = cls.row_location(row)
+            cls.remember(key, location)
+            return location
+
+        await GeocodeRateLimiter.acquire()
+        location = await asyncio.to_thread(get_geocoder().geocode, query)
+
+        cls.remember(key, location)
+        await cls.store(key, location)
+        return location
+
+    @classmethod
+    def remember(cls, key: str, location: Location | None):
+        expires_at = float("inf") if location is not None else time.time() + cls.negative_ttl
+        cls.entries[key] = (expires_at, location)
+        cls.entries.move_to_end(key)
+        while len(cls.entries) > cls.max_entries:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    async def get_stored(cls, key: str) -> GeocodeCacheModel | None:
+        try:
+            async with SessionFactory() as session:
+                row = await session.scalar(select(GeocodeCacheModel).filter(GeocodeCacheModel.address_key == key))
+        except SQLAlchemyError:
+            logger.warning("Geocode cache unavailable", exc_info=True)
+            return None
+
+        if row is not None and row.latitude is None and row.created_at + cls.negative_ttl <= time.time():
+            return None
+        return row
+
+    @staticmethod
+    def row_location(row: GeocodeCacheModel) -> Location | None:
+        if row.latitude is None:
+            return None
+        return Location(row.address, (row.latitude, row.longitude), {})
+
+    @staticmethod
+    async def store(key: str, location: Location | None):
+        values = {
+            "address_key": key,
+            "address": location.address if location else None,
+            "latitude": location.latitude if location else None,
+            "longitude": location.longitude if location else None,
+            "created_at": int(time.time()),
+        }
+        statement = insert(GeocodeCacheModel).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[GeocodeCacheModel.address_key],
+            set_={name: value for name, value in values.items() if name != "address_key"},
+        )
+
+        try:
+            async with SessionFactory() as session:
+                await session.execute(statement)
+                await session.commit()
+        except SQLAlchemyError:
+            logger.warning(f"Failed to store geocode of {key}", exc_info=True)
 
 
 async def get_location(country: Country, city: str, street: str, house_number: str, postal_code: str) -> Location:
-    geolocator = Nominatim(user_agent="car-service")
+    # the local gazetteer answers most addresses of our countries, the remote geocoder only sees its misses
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        location = await asyncio.to_thread(gazetteer.lookup, country, city, street, house_number, postal_code)
+        if location is not None:
+            return location
+
     address = f"{street} {house_number} {postal_code} {city} {country.value.title()}"
-    location: Location = geolocator.geocode(address)
-    return location
+    return await GeocodeCache.get_location(address_key(country, city, street, house_number, postal_code), address)
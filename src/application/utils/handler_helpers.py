@@ -1,30 +1,157 @@
+import base64
+import binascii
+import json
 from typing import Type, Any
 
-from sqlalchemy import select, func, Select
+from loguru import logger
+from sqlalchemy import select, func, Select, tuple_, literal, text
+from sqlalchemy.exc import CompileError, DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
-from application.models import ServiceModel
+from application.enums.count_strategy import CountStrategy
+from application.models import ServiceModel, ServiceSearchModel
 from application.models.services.organization import OrganizationModel
+from application.utils.count_cache import CountCache
+from application.utils.exceptions import BadRequestException
 
 
 async def get_entity_result(
     base_query: Select,
     filter_dict: dict,
-    model: Type[ServiceModel] | Type[OrganizationModel],
+    model: Type[ServiceModel] | Type[ServiceSearchModel] | Type[OrganizationModel],
     limit: int,
     offset: int,
     session: AsyncSession,
     has_extra_fields: bool = False,
-) -> tuple[int, Any]:
-    count_query = select(func.count()).select_from(model).filter_by(**filter_dict)
-    total_query_res = await session.execute(count_query)
-    total_count: int = total_query_res.scalar_one()
+    count_strategy: CountStrategy = CountStrategy.EXACT,
+    criteria: tuple[ColumnElement, ...] = (),
+) -> tuple[int | None, Any, bool]:
+    total_count = await count_entities(
+        model=model,
+        filter_dict=filter_dict,
+        session=session,
+        criteria=criteria,
+        strategy=count_strategy,
+    )
 
-    query = base_query.limit(limit).offset(offset)
+    query = base_query.limit(limit + 1).offset(offset)
     query_result = await session.execute(query)
     if not has_extra_fields:
         entities = query_result.scalars().all()
     else:
         entities = query_result.mappings().all()
 
-    return total_count, entities
+    return total_count, entities[:limit], len(entities) > limit
+
+
+async def count_entities(
+    model: Type[ServiceModel] | Type[ServiceSearchModel] | Type[OrganizationModel],
+    filter_dict: dict,
+    session: AsyncSession,
+    criteria: tuple[ColumnElement, ...] = (),
+    strategy: CountStrategy = CountStrategy.EXACT,
+) -> int | None:
+    if strategy == CountStrategy.NONE:
+        return None
+
+    count_query = select(func.count()).select_from(model).filter_by(**filter_dict).filter(*criteria)
+
+    if strategy == CountStrategy.ESTIMATED:
+        rows_query = select(literal(1)).select_from(model).filter_by(**filter_dict).filter(*criteria)
+        estimated_count = await estimate_rows(rows_query, session)
+        if estimated_count is not None:
+            return estimated_count
+
+    cache_key = None
+    if strategy == CountStrategy.CACHED:
+        cache_key, cached_count = await CountCache.get(model.__tablename__, statement_key(count_query, session))
+        if cached_count is not None:
+            return cached_count
+
+    total_query_res = await session.execute(count_query)
+    total_count: int = total_query_res.scalar_one()
+
+    if cache_key:
+        await CountCache.set(cache_key, total_count)
+
+    return total_count
+
+
+async def estimate_rows(query: Select, session: AsyncSession) -> int | None:
+    try:
+        statement = compile_literal(query, session)
+    except (CompileError, NotImplementedError):
+        # a bound value without a literal renderer, the planner can't be asked without it
+        logger.warning("Failed to render row estimate query, falling back to exact count", exc_info=True)
+        return None
+
+    try:
+        # a failing EXPLAIN only rolls back the savepoint, the exact count still runs in the caller's transaction
+        async with session.begin_nested():
+            explain_res = await session.execute(text(f"EXPLAIN (FORMAT JSON) {statement}"))
+            plan = explain_res.scalar_one()
+    except DBAPIError:
+        logger.warning("Failed to estimate row count, falling back to exact count", exc_info=True)
+        return None
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def compile_literal(query: Select, session: AsyncSession) -> str:
+    return str(query.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def statement_key(query: Select, session: AsyncSession) -> str:
+    compiled = query.compile(dialect=session.bind.dialect)
+    return f"{compiled}:{sorted(compiled.params.items())!r}"
+
+
+def apply_keyset(query: Select, sort_keys: list[ColumnElement], cursor_values: list | None, limit: int) -> Select:
+    if cursor_values is not None:
+        if len(cursor_values) != len(sort_keys):
+            raise BadRequestException("Invalid cursor")
+
+        query = query.filter(
+            tuple_(*sort_keys) > tuple_(*[literal(value, key.type) for key, value in zip(sort_keys, cursor_values)])
+        )
+
+    return query.order_by(*sort_keys).limit(limit + 1)
+
+
+async def get_entity_page_by_cursor(
+    base_query: Select,
+    sort_keys: list[ColumnElement],
+    cursor_values: list | None,
+    limit: int,
+    session: AsyncSession,
+    has_extra_fields: bool = False,
+) -> tuple[list, bool]:
+    query = apply_keyset(base_query, sort_keys, cursor_values, limit)
+
+    query_result = await session.execute(query)
+    if not has_extra_fields:
+        entities = list(query_result.scalars().all())
+    else:
+        entities = list(query_result.mappings().all())
+
+    return entities[:limit], len(entities) > limit
+
+
+def encode_cursor(mode: str, values: list) -> str:
+    payload = json.dumps({"m": mode, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, mode: str) -> list:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise BadRequestException("Invalid cursor")
+
+    if not isinstance(payload, dict) or payload.get("m") != mode or not isinstance(payload.get("v"), list):
+        raise BadRequestException("Invalid cursor")
+
+    return payload["v"]
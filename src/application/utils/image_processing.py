@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from dotenv import load_dotenv
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from application.dto.services.stored_image_dc import StoredImageDC
+from application.enums.image_variant import ImageVariant
+from application.utils.exceptions import BadRequestException
+
+load_dotenv()
+
+
+WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", 80))
+# longest side in pixels, smaller images are never upscaled
+VARIANT_SIZES: dict[ImageVariant, int] = {
+    ImageVariant.SMALL: int(os.getenv("IMAGE_SMALL_SIZE", 256)),
+    ImageVariant.LARGE: int(os.getenv("IMAGE_LARGE_SIZE", 1280)),
+}
+
+Image.MAX_IMAGE_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 40_000_000))
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        # spawned, not forked, pool processes build their own S3 client instead of sharing the parent's sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=int(os.getenv("IMAGE_PROCESS_WORKERS", 2)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def close_image_pool():
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def transcode_variants(source: bytes | str, sizes: dict[ImageVariant, int]) -> dict[ImageVariant, bytes]:
+    # runs in a pool process, decoding and encoding hold the GIL for their whole duration.
+    # source is the image itself or the path of a file holding it
+    with Image.open(BytesIO(source) if isinstance(source, bytes) else source) as image:
+        # jpeg decoding scales down in the DCT, only as far as the largest variant allows
+        image.draft("RGB", (max(sizes.values()), max(sizes.values())))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+        variants = {}
+        for variant, size in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+            output = BytesIO()
+            resized.save(output, "WEBP", quality=WEBP_QUALITY, method=4)
+            variants[variant] = output.getvalue()
+    return variants
+
+
+def transcode_image(data: bytes, sizes: dict[ImageVariant, int]) -> tuple[dict[ImageVariant, bytes], StoredImageDC]:
+    variants = transcode_variants(data, sizes)
+    return variants, describe_image(variants, sizes, hashlib.sha256(data).hexdigest())
+
+
+def transcode_image_file(path: str, sizes: dict[ImageVariant, int]) -> tuple[dict[ImageVariant, bytes], StoredImageDC]:
+    # the upload is read from disk in the pool process, it is never held in memory as a whole
+    with open(path, "rb") as file:
+        content_hash = hashlib.file_digest(file, "sha256").hexdigest()
+    variants = transcode_variants(path, sizes)
+    return variants, describe_image(variants, sizes, content_hash)
+
+
+def describe_image(
+    variants: dict[ImageVariant, bytes], sizes: dict[ImageVariant, int], content_hash: str
+) -> StoredImageDC:
+    # only the header of the largest variant is parsed here
+    with Image.open(BytesIO(variants[max(sizes, key=sizes.get)])) as image:
+        width, height = image.size
+    return StoredImageDC(width=width, height=height, content_hash=content_hash)
+
+
+def transcode_stored_image(
+    bucket_name: str, source_key: str, variant_keys: dict[ImageVariant, str]
+) -> StoredImageDC:
+    # runs in a pool process, direct uploads are read from S3 here and never pass through the API workers
+    from application.utils.s3_service import get_s3_client  # s3_service imports this module
+
+    client = get_s3_client()
+    data = client.get_object(Bucket=bucket_name, Key=source_key)["Body"].read()
+
+    variants, image = transcode_image(data, {variant: VARIANT_SIZES[variant] for variant in variant_keys})
+    for variant, body in variants.items():
+        client.put_object(Bucket=bucket_name, Key=variant_keys[variant], Body=body, ContentType="image/webp")
+    return image
+
+
+class ImageProcessor:
+    @classmethod
+    async def transcode(cls, data: bytes) -> tuple[dict[ImageVariant, bytes], StoredImageDC]:
+        return await cls.run(transcode_image, data, VARIANT_SIZES)
+
+    @classmethod
+    async def transcode_file(cls, path: str) -> tuple[dict[ImageVariant, bytes], StoredImageDC]:
+        return await cls.run(transcode_image_file, path, VARIANT_SIZES)
+
+    @classmethod
+    async def transcode_stored(
+        cls, bucket_name: str, source_key: str, variant_keys: dict[ImageVariant, str]
+    ) -> StoredImageDC:
+        return await cls.run(transcode_stored_image, bucket_name, source_key, variant_keys)
+
+    @staticmethod
+    async def run(func, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(get_image_pool(), func, *args)
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+            raise BadRequestException("File is not a valid image")
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import time
+
+import requests
+from dotenv import load_dotenv
+from jose import jwk
+from jose.backends.base import Key
+from loguru import logger
+
+load_dotenv()
+
+
+class JwksManager:
+    # Cognito signing keys indexed by kid, refreshed in the background and kept when Cognito is unreachable
+
+    def __init__(
+        self,
+        url: str | None = None,
+        ttl: int | None = None,
+        min_refresh_interval: int | None = None,
+        timeout: float | None = None,
+    ):
+        self.url = url or os.getenv("AWS_COGNITO_SIGNING_KEY_URL")
+        self.ttl = ttl if ttl is not None else int(os.getenv("JWKS_TTL", 3600))
+        # unknown kids come from the client, this keeps forged tokens from turning into a request flood
+        if min_refresh_interval is None:
+            min_refresh_interval = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", 60))
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout if timeout is not None else float(os.getenv("JWKS_TIMEOUT", 5))
+
+        self.keys: dict[str, Key] = {}
+        self.fetched_at: float | None = None
+        self.last_attempt: float | None = None
+        self.lock = asyncio.Lock()
+        self.refresh_task: asyncio.Task | None = None
+
+    async def start(self):
+        # startup does not fail when Cognito is down, tokens are rejected until a later refresh succeeds
+        await self.refresh()
+        if not self.keys:
+            logger.warning("No JWKS keys loaded, token verification fails until Cognito is reachable")
+
+    async def get_key(self, kid: str | None) -> Key | None:
+        if kid is None:
+            return None
+
+        key = self.keys.get(kid)
+        if key is None:
+            # a kid we do not know usually means the keys were rotated
+            await self.refresh()
+            return self.keys.get(kid)
+
+        if self.is_stale() and (self.refresh_task is None or self.refresh_task.done()):
+            self.refresh_task = asyncio.create_task(self.refresh())
+        return key
+
+    def is_stale(self) -> bool:
+        return self.fetched_at is None or time.monotonic() - self.fetched_at >= self.ttl
+
+    async def refresh(self):
+        async with self.lock:
+            now = time.monotonic()
+            if self.last_attempt is not None and now - self.last_attempt < self.min_refresh_interval:
+                return
+            self.last_attempt = now
+
+            try:
+                jwks = await asyncio.to_thread(self.fetch)
+                keys = self.parse_keys(jwks)
+            except Exception:
+                logger.warning(f"Failed to refresh JWKS, serving {len(self.keys)} cached keys", exc_info=True)
+                return
+
+            if not keys:
+                logger.warning("JWKS response has no usable keys, keeping the cached ones")
+                return
+
+            self.keys = keys
+            self.fetched_at = now
+            logger.info(f"Loaded {len(keys)} JWKS keys")
+
+    def fetch(self) -> dict:
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def parse_keys(jwks: dict) -> dict[str, Key]:
+        keys = {}
+        for key_data in jwks.get("keys", []):
+            if key_data.get("kty") != "RSA" or "kid" not in key_data:
+                continue
+            try:
+                keys[key_data["kid"]] = jwk.construct(key_data, algorithm="RS256")
+            except Exception:
+                logger.warning(f"Skipping invalid JWKS key {key_data.get('kid')}", exc_info=True)
+        return keys
+
+
+_jwks_manager: JwksManager | None = None
+
+
+def get_jwks_manager() -> JwksManager:
+    global _jwks_manager
+
+    if _jwks_manager is None:
+        _jwks_manager = JwksManager()
+    return _jwks_manager
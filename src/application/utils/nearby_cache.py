@@ -0,0 +1,136 @@
+import hashlib
+import json
+import math
+import os
+import time
+
+from dotenv import load_dotenv
+from geopy.distance import geodesic
+from loguru import logger
+from redis.exceptions import RedisError
+
+from application.dto.services.nearby_candidates_dc import NearbyCandidatesDC, NearbyCandidateDC
+from application.utils import geohash
+from application.utils.redis_helper import get_async_redis
+
+load_dotenv()
+
+
+class NearbySearchCache:
+    key_prefix: str = "nearby"
+    precision: int = int(os.getenv("NEARBY_CACHE_PRECISION", 5))
+    max_candidates: int = int(os.getenv("NEARBY_CACHE_CANDIDATES", 200))
+    ttl: int = int(os.getenv("NEARBY_CACHE_TTL", 300))
+    # radius of the sphere PostGIS uses for `<->` on geography
+    sphere_radius_meters: float = 6371008.7714
+    # sphere and WGS84 spheroid distances differ by less than this fraction
+    spheroid_tolerance: float = 0.006
+
+    @classmethod
+    def cell(cls, latitude: float, longitude: float) -> str:
+        return geohash.encode(latitude, longitude, cls.precision)
+
+    @staticmethod
+    def cell_radius_meters(cell: str) -> float:
+        min_lat, max_lat, min_lon, max_lon = geohash.decode_bbox(cell)
+        center = geohash.decode(cell)
+        return max(
+            geodesic(center, corner).meters
+            for corner in ((min_lat, min_lon), (min_lat, max_lon), (max_lat, min_lon), (max_lat, max_lon))
+        )
+
+    @staticmethod
+    def filter_key(filter_dict: dict) -> str:
+        normalized = json.dumps(filter_dict, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(normalized.encode()).hexdigest()
+
+    @classmethod
+    def generation_key(cls) -> str:
+        return f"{cls.key_prefix}:generation"
+
+    @classmethod
+    async def get(cls, cell: str, filter_key: str) -> tuple[str | None, NearbyCandidatesDC | None]:
+        try:
+            redis = get_async_redis()
+            generation = int(await redis.get(cls.generation_key()) or 0)
+            cache_key = f"{cls.key_prefix}:{generation}:{cell}"
+
+            cached = await redis.hget(cache_key, filter_key)
+        except RedisError:
+            logger.warning("Nearby search cache unavailable", exc_info=True)
+            return None, None
+
+        if cached is None:
+            return cache_key, None
+
+        candidates = NearbyCandidatesDC.from_json(cached)
+        if candidates.created_at + cls.ttl < time.time():
+            return cache_key, None
+        return cache_key, candidates
+
+    @classmethod
+    async def set(cls, cache_key: str, filter_key: str, candidates: NearbyCandidatesDC):
+        try:
+            redis = get_async_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(cache_key, filter_key, candidates.to_json())
+                pipe.expire(cache_key, cls.ttl)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to store nearby search candidates", exc_info=True)
+
+    @classmethod
+    async def invalidate(cls):
+        # a service can be a candidate of any cell within reach, bumping the generation orphans
+        # every cached candidate set and they expire by ttl
+        try:
+            await get_async_redis().incr(cls.generation_key())
+        except RedisError:
+            logger.warning("Failed to invalidate nearby search cache", exc_info=True)
+
+    @classmethod
+    def sphere_distance_meters(cls, latitude: float, longitude: float, item: NearbyCandidateDC) -> float:
+        # haversine on the PostGIS sphere, ranks the candidates in the `<->` order of the database path
+        lat1, lon1, lat2, lon2 = map(math.radians, (latitude, longitude, item.latitude, item.longitude))
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        return 2 * cls.sphere_radius_meters * math.asin(min(1.0, math.sqrt(a)))
+
+    @staticmethod
+    def distance_meters(latitude: float, longitude: float, item: NearbyCandidateDC) -> float:
+        # spheroid distance as returned by ST_Distance, only computed for the rows of the page
+        return geodesic((latitude, longitude), (item.latitude, item.longitude)).meters
+
+    @classmethod
+    def rank(
+        cls,
+        candidates: NearbyCandidatesDC,
+        cell: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float | None,
+    ) -> tuple[list[tuple[float, NearbyCandidateDC]], int]:
+        # sphere distance ranking and how many leading entries are guaranteed to match the database order
+        ranked = sorted(
+            ((cls.sphere_distance_meters(latitude, longitude, item), item) for item in candidates.items),
+            key=lambda ranked_item: (ranked_item[0], ranked_item[1].service_id),
+        )
+
+        if radius_km:
+            # ST_DWithin measures on the spheroid, only candidates close to the radius need the exact distance
+            radius_meters = radius_km * 1000
+            ranked = [
+                (distance, item)
+                for distance, item in ranked
+                if distance <= radius_meters * (1 - cls.spheroid_tolerance)
+                or (
+                    distance < radius_meters * (1 + cls.spheroid_tolerance)
+                    and cls.distance_meters(latitude, longitude, item) <= radius_meters
+                )
+            ]
+
+        if candidates.complete:
+            return ranked, len(ranked)
+
+        # a service outside the candidate set is at least reach - cell radius away from any point of the cell
+        safe_distance = candidates.reach_meters - cls.cell_radius_meters(cell) * (1 + cls.spheroid_tolerance)
+        return ranked, sum(1 for distance, _ in ranked if distance <= safe_distance)
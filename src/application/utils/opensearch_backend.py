@@ -0,0 +1,296 @@
+import os
+
+from dotenv import load_dotenv
+from loguru import logger
+from opensearchpy import AsyncOpenSearch
+from opensearchpy.helpers import async_bulk, async_scan
+
+from application.dto.services.service_document_dc import (
+    OfferDocumentDC,
+    ServiceDocumentDC,
+    ServiceSearchQueryDC,
+    ServiceSearchHitDC,
+    ServiceSearchResultDC,
+)
+from application.enums.services.car_brands import CarBrands
+from application.enums.services.car_types import CarType
+from application.enums.services.indexes import OpensearchIndexes
+from application.utils.search_backend import SearchBackend
+from application.utils.text_search import SEARCH_DISTANCE_DECAY_KM
+
+load_dotenv()
+
+
+SERVICE_INDEX_MAPPING = {
+    "settings": {"number_of_shards": 1, "number_of_replicas": 0},
+    "mappings": {
+        "dynamic": "strict",
+        "properties": {
+            "service_id": {"type": "keyword"},
+            "organization_id": {"type": "keyword"},
+            "name": {"type": "text", "fields": {"raw": {"type": "keyword"}}},
+            "country": {"type": "keyword"},
+            "city": {"type": "keyword"},
+            "street": {"type": "keyword"},
+            "postal_code": {"type": "keyword"},
+            "address": {"type": "text"},
+            "location": {"type": "geo_point"},
+            "logo_key": {"type": "keyword", "index": False},
+            "languages": {"type": "keyword"},
+            "descriptions": {"type": "text"},
+            "updated_at": {"type": "long"},
+            "offers": {
+                "type": "nested",
+                "properties": {
+                    "offer_id": {"type": "keyword"},
+                    "offer_type": {"type": "keyword"},
+                    "currency": {"type": "keyword"},
+                    "base_price": {"type": "double"},
+                    "sale": {"type": "integer"},
+                    "current_price": {"type": "double"},
+                    "car_brands": {"type": "keyword"},
+                    "car_types": {"type": "keyword"},
+                    "car_pairs": {"type": "keyword"},
+                },
+            },
+        },
+    },
+}
+
+
+class OpenSearchBackend(SearchBackend):
+    index: str = OpensearchIndexes.SERVICE_INDEX.value
+    # exact filters of the list endpoint map to keyword fields
+    filter_fields: dict[str, str] = {
+        "organization_id": "organization_id",
+        "name": "name.raw",
+        "country": "country",
+        "city": "city",
+        "street": "street",
+    }
+
+    def __init__(self):
+        host = os.getenv("OPENSEARCH_HOST", "localhost")
+        port = int(os.getenv("OPENSEARCH_PORT", 9200))
+
+        self.bulk_chunk_size = int(os.getenv("OPENSEARCH_BULK_CHUNK_SIZE", 500))
+        self.client = AsyncOpenSearch(
+            hosts=[{"host": host, "port": port}],
+            http_auth=(os.getenv("OPENSEARCH_USERNAME", "admin"), os.getenv("OPENSEARCH_PASSWORD", "")),
+            use_ssl=os.getenv("OPENSEARCH_USE_SSL", "true").lower() == "true",
+            verify_certs=os.getenv("OPENSEARCH_VERIFY_CERTS", "false").lower() == "true",
+            ssl_show_warn=False,
+            pool_maxsize=int(os.getenv("OPENSEARCH_POOL_SIZE", 20)),
+            timeout=float(os.getenv("OPENSEARCH_TIMEOUT", 5)),
+        )
+
+    async def ensure_index(self):
+        if not await self.client.indices.exists(index=self.index):
+            await self.client.indices.create(index=self.index, body=SERVICE_INDEX_MAPPING)
+            logger.info(f"Created OpenSearch index {self.index}")
+
+    async def index_documents(self, documents: list[ServiceDocumentDC]) -> int:
+        actions = (
+            {"_op_type": "index", "_index": self.index, "_id": document.service_id, "_source": self.source(document)}
+            for document in documents
+        )
+        return await self.bulk(actions)
+
+    async def delete_documents(self, service_ids: list[str]) -> int:
+        actions = ({"_op_type": "delete", "_index": self.index, "_id": service_id} for service_id in service_ids)
+        return await self.bulk(actions)
+
+    async def document_ids(self) -> list[str]:
+        query = {"query": {"match_all": {}}, "_source": False}
+        return [hit["_id"] async for hit in async_scan(self.client, query=query, index=self.index, size=1000)]
+
+    async def bulk(self, actions) -> int:
+        success, errors = await async_bulk(
+            self.client,
+            actions,
+            chunk_size=self.bulk_chunk_size,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+
+        # deleting a document that was never indexed is not an error
+        errors = [error for error in errors if next(iter(error.values())).get("status") != 404]
+        if errors:
+            logger.warning(f"OpenSearch bulk request had {len(errors)} failed actions: {errors[:5]}")
+        return success
+
+    async def search(self, query: ServiceSearchQueryDC) -> ServiceSearchResultDC:
+        body = {
+            "query": self.search_query(query),
+            "sort": self.sort(query),
+            "size": query.limit,
+            "track_total_hits": True,
+            "aggs": self.aggregations(),
+        }
+        if query.search_after is not None:
+            body["search_after"] = query.search_after
+        else:
+            body["from"] = query.offset
+
+        response = await self.client.search(index=self.index, body=body)
+
+        hits = []
+        for hit in response["hits"]["hits"]:
+            document = ServiceDocumentDC.from_dict(self.document_dict(hit["_source"]))
+            inner_hits = hit.get("inner_hits", {}).get("offers", {}).get("hits", {}).get("hits", [])
+
+            hits.append(
+                ServiceSearchHitDC(
+                    document=document,
+                    sort=hit["sort"],
+                    distance_meters=self.distance_meters(document, query),
+                    best_offer=OfferDocumentDC.from_dict(inner_hits[0]["_source"]) if inner_hits else None,
+                )
+            )
+
+        return ServiceSearchResultDC(
+            hits=hits,
+            total=response["hits"]["total"]["value"],
+            facets=self.facets(response.get("aggregations", {})),
+        )
+
+    def search_query(self, query: ServiceSearchQueryDC) -> dict:
+        filters = [
+            {"term": {self.filter_fields[key]: str(value)}}
+            for key, value in query.filters.items()
+            if key in self.filter_fields
+        ]
+
+        if query.has_location and query.radius_km:
+            filters.append(
+                {
+                    "geo_distance": {
+                        "distance": f"{query.radius_km}km",
+                        "location": {"lat": query.latitude, "lon": query.longitude},
+                    }
+                }
+            )
+
+        if query.has_offer_filter:
+            filters.append(self.offer_query(query))
+
+        must = []
+        if query.q:
+            must.append(
+                {
+                    "multi_match": {
+                        "query": query.q,
+                        "fields": [f"{field_name}^{boost:g}" for field_name, boost in self.field_boosts.items()],
+                        "fuzziness": "AUTO",
+                    }
+                }
+            )
+
+        bool_query = {"bool": {"filter": filters, "must": must}}
+
+        if query.q and query.has_location:
+            return {
+                "function_score": {
+                    "query": bool_query,
+                    "functions": [
+                        {
+                            "gauss": {
+                                "location": {
+                                    "origin": {"lat": query.latitude, "lon": query.longitude},
+                                    "scale": f"{SEARCH_DISTANCE_DECAY_KM}km",
+                                    "decay": 0.5,
+                                }
+                            }
+                        }
+                    ],
+                    "boost_mode": "multiply",
+                }
+            }
+        return bool_query
+
+    def offer_query(self, query: ServiceSearchQueryDC) -> dict:
+        offer_filters = []
+        if query.offer_type:
+            offer_filters.append({"term": {"offers.offer_type": query.offer_type}})
+        if query.currency:
+            offer_filters.append({"term": {"offers.currency": query.currency}})
+        if query.max_price is not None:
+            offer_filters.append({"range": {"offers.current_price": {"lte": query.max_price}}})
+
+        if query.car_brand and query.car_type:
+            offer_filters.append({"terms": {"offers.car_pairs": self.car_pairs(query)}})
+        elif query.car_brand:
+            offer_filters.append({"terms": {"offers.car_brands": [query.car_brand, CarBrands.ALL.value]}})
+        elif query.car_type:
+            offer_filters.append({"terms": {"offers.car_types": [query.car_type, CarType.ALL.value]}})
+
+        # the cheapest matching offer comes back as the single inner hit
+        return {
+            "nested": {
+                "path": "offers",
+                "query": {"bool": {"filter": offer_filters}},
+                "inner_hits": {"size": 1, "sort": [{"offers.current_price": "asc"}]},
+            }
+        }
+
+    @staticmethod
+    def sort(query: ServiceSearchQueryDC) -> list[dict]:
+        if query.q:
+            return [{"_score": "desc"}, {"service_id": "asc"}]
+        if query.has_location:
+            return [
+                {
+                    "_geo_distance": {
+                        "location": {"lat": query.latitude, "lon": query.longitude},
+                        "order": "asc",
+                        "unit": "m",
+                        "distance_type": "arc",
+                    }
+                },
+                {"service_id": "asc"},
+            ]
+        return [{"service_id": "asc"}]
+
+    def aggregations(self) -> dict:
+        return {
+            "city": {"terms": {"field": "city", "size": self.facet_size}},
+            "country": {"terms": {"field": "country", "size": self.facet_size}},
+            "offers": {
+                "nested": {"path": "offers"},
+                "aggs": {
+                    "offer_type": {
+                        "terms": {"field": "offers.offer_type", "size": self.facet_size},
+                        "aggs": {"services": {"reverse_nested": {}}},
+                    }
+                },
+            },
+        }
+
+    @staticmethod
+    def facets(aggregations: dict) -> dict[str, dict[str, int]]:
+        if not aggregations:
+            return {}
+
+        return {
+            "city": {bucket["key"]: bucket["doc_count"] for bucket in aggregations["city"]["buckets"]},
+            "country": {bucket["key"]: bucket["doc_count"] for bucket in aggregations["country"]["buckets"]},
+            # offers are counted per service, not per offer
+            "offer_type": {
+                bucket["key"]: bucket["services"]["doc_count"]
+                for bucket in aggregations["offers"]["offer_type"]["buckets"]
+            },
+        }
+
+    @staticmethod
+    def source(document: ServiceDocumentDC) -> dict:
+        source = document.to_dict()
+        source["location"] = {"lat": source.pop("latitude"), "lon": source.pop("longitude")}
+        return source
+
+    @staticmethod
+    def document_dict(source: dict) -> dict:
+        location = source.pop("location")
+        return {**source, "latitude": location["lat"], "longitude": location["lon"]}
+
+    async def close(self):
+        await self.client.close()
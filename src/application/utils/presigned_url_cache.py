@@ -0,0 +1,92 @@
+import os
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from loguru import logger
+from redis.exceptions import RedisError
+
+from application.utils.redis_helper import get_async_redis
+
+load_dotenv()
+
+
+class PresignedUrlCache:
+    key_prefix: str = "presigned"
+    max_entries: int = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", 10000))
+    # a cached url is handed out only while it stays valid for at least this long
+    min_validity: int = int(os.getenv("PRESIGNED_URL_MIN_VALIDITY", 600))
+    use_redis: bool = os.getenv("PRESIGNED_URL_CACHE_REDIS", "false").lower() == "true"
+
+    # "<bucket>/<key>:<expiration>" -> (expires_at, url), least recently used first
+    entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def cache_key(bucket_name: str, key: str, expiration: int) -> str:
+        return f"{bucket_name}/{key}:{expiration}"
+
+    @classmethod
+    async def get_many(cls, cache_keys: list[str]) -> dict[str, str]:
+        now = time.time()
+        urls, missing = {}, []
+
+        for cache_key in cache_keys:
+            entry = cls.entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                cls.entries.move_to_end(cache_key)
+                urls[cache_key] = entry[1]
+            else:
+                missing.append(cache_key)
+
+        if missing and cls.use_redis:
+            for cache_key, (expires_at, url) in (await cls.get_redis(missing)).items():
+                if expires_at > now:
+                    cls.remember(cache_key, expires_at, url)
+                    urls[cache_key] = url
+
+        return urls
+
+    @classmethod
+    async def set_many(cls, urls: dict[str, str], expires_at: float):
+        # expires_at is when the urls stop being handed out, not when S3 stops accepting them
+        ttl = int(expires_at - time.time())
+        if ttl <= 0 or not urls:
+            return
+
+        for cache_key, url in urls.items():
+            cls.remember(cache_key, expires_at, url)
+
+        if cls.use_redis:
+            await cls.set_redis(urls, expires_at, ttl)
+
+    @classmethod
+    def remember(cls, cache_key: str, expires_at: float, url: str):
+        cls.entries[cache_key] = (expires_at, url)
+        cls.entries.move_to_end(cache_key)
+        while len(cls.entries) > cls.max_entries:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    async def get_redis(cls, cache_keys: list[str]) -> dict[str, tuple[float, str]]:
+        try:
+            values = await get_async_redis().mget([f"{cls.key_prefix}:{cache_key}" for cache_key in cache_keys])
+        except RedisError:
+            logger.warning("Presigned url cache unavailable", exc_info=True)
+            return {}
+
+        cached = {}
+        for cache_key, value in zip(cache_keys, values):
+            if value is not None:
+                expires_at, url = value.decode().split("|", 1)
+                cached[cache_key] = (float(expires_at), url)
+        return cached
+
+    @classmethod
+    async def set_redis(cls, urls: dict[str, str], expires_at: float, ttl: int):
+        try:
+            async with get_async_redis().pipeline(transaction=False) as pipe:
+                for cache_key, url in urls.items():
+                    pipe.set(f"{cls.key_prefix}:{cache_key}", f"{expires_at}|{url}", ex=ttl)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to store presigned urls", exc_info=True)
@@ -1,27 +1,37 @@
+from __future__ import annotations
+
 import os
 
 from dotenv import load_dotenv
-from redis import Redis
+from redis.asyncio import Redis as AsyncRedis, BlockingConnectionPool
 
 load_dotenv()
 
 
-class RedisHelper:
-    def __init__(self):
+_async_redis: AsyncRedis | None = None
+
+
+def get_async_redis() -> AsyncRedis:
+    global _async_redis
 
-        host = os.getenv("REDIS_HOST", "localhost")
-        port = int(os.getenv("REDIS_PORT", 6379))
-        db = int(os.getenv("REDIS_DB", 0))
+    if _async_redis is None:
+        pool = BlockingConnectionPool(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            db=int(os.getenv("REDIS_DB", 0)),
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),
+            timeout=float(os.getenv("REDIS_POOL_TIMEOUT", 1)),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", 1)),
+        )
+        _async_redis = AsyncRedis(connection_pool=pool)
+    return _async_redis
 
-        self.token_expiration = int(os.getenv("REDIS_TOKEN_EXPIRATION", 3600))
 
-        self.redis = Redis(host=host, port=port, db=db)
+async def close_async_redis():
+    global _async_redis
 
-    def revoke_token(self, jti: str):
-        self.redis.set(jti, "", ex=self.token_expiration)
+    if _async_redis is not None:
+        await _async_redis.aclose()
+        await _async_redis.connection_pool.disconnect()
+        _async_redis = None
 
-    def check_revoke(self, jti: str) -> bool:
-        revoked_token = self.redis.get(jti)
-        if revoked_token:
-            return True
-        return False
@@ -1,91 +1,343 @@
+from __future__ import annotations
+
+import asyncio
 import os.path
-from io import BytesIO
+import shutil
+import tempfile
+import threading
+import time
+from typing import BinaryIO
 
 from dotenv import load_dotenv
 from loguru import logger
 from boto3 import Session
-from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient, Config
+from botocore.credentials import ReadOnlyCredentials
 from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import ClientError
 from fastapi import UploadFile
 
+from application.dto.services.stored_image_dc import StoredImageDC
+from application.enums.image_variant import ImageVariant
 from application.utils.exceptions import BadRequestException, ServerException
+from application.utils.image_processing import ImageProcessor
+from application.utils.presigned_url_cache import PresignedUrlCache
+from application.utils.url_signer import S3UrlSigner
 
 load_dotenv()
 
 
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 50))
+
+# signatures are aligned to windows of this many seconds so a key keeps one url per window, 0 signs every url anew
+PRESIGNED_URL_WINDOW = int(os.getenv("PRESIGNED_URL_WINDOW", 900))
+
+_s3_session: Session | None = None
+_s3_client: BaseClient | None = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client() -> BaseClient:
+    # one client per worker, boto3 clients are thread safe and share their connection pool and credentials
+    global _s3_session, _s3_client
+
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_session = Session(profile_name=os.getenv("AWS_PROFILE", "default"))
+                _s3_client = _s3_session.client(
+                    "s3",
+                    endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+                    config=Config(
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        connect_timeout=float(os.getenv("S3_CONNECT_TIMEOUT", 2)),
+                        read_timeout=float(os.getenv("S3_READ_TIMEOUT", 10)),
+                        retries={"max_attempts": int(os.getenv("S3_MAX_ATTEMPTS", 3)), "mode": "standard"},
+                        tcp_keepalive=True,
+                    ),
+                )
+    return _s3_client
+
+
+def get_s3_credentials() -> ReadOnlyCredentials:
+    # refreshable credentials renew themselves here, callers run it off the event loop
+    get_s3_client()
+    return _s3_session.get_credentials().get_frozen_credentials()
+
+
+def close_s3_client():
+    global _s3_client
+
+    if _s3_client is not None:
+        _s3_client.close()
+        _s3_client = None
+
+
+class SizeLimitedReader:
+    # file like view over the upload spool, the read fails past max_size.
+    # uploads never reach the multipart threshold, so each one is a single put_object streamed from the spool
+    def __init__(self, fileobj: BinaryIO, max_size: int):
+        self.fileobj = fileobj
+        self.max_size = max_size
+
+    def read(self, size: int = -1) -> bytes:
+        # never pull more than one byte past the limit, read() without a size included
+        remaining = max(self.max_size + 1 - self.fileobj.tell(), 0)
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        data = self.fileobj.read(size)
+        if self.fileobj.tell() > self.max_size:
+            raise BadRequestException(f"File size must be less than {self.max_size} bytes")
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.fileobj.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.fileobj.tell()
+
+    def close(self):
+        # the spool belongs to the UploadFile and is closed with the request
+        pass
+
+
 class S3Service:
-    chunk_size: int = 1024 * 1024 * 5
     file_max_size: int = 1024 * 1024 * 5
+    copy_chunk_size: int = 1024 * 256
     extension: str = ".webp"
+    vector_extensions: tuple = ("svg",)
+
+    upload_slots: asyncio.Semaphore = asyncio.Semaphore(int(os.getenv("S3_UPLOAD_CONCURRENCY", 8)))
 
     def __init__(self, allowed_extensions: tuple = None):
-        session = Session(profile_name="default")
         self.bucket_name = os.getenv("AWS_BUCKET_NAME")
-        self.client = session.client("s3")
+        self.client = get_s3_client()
         self.allowed_extensions = allowed_extensions
 
-    async def upload_file_to_s3(self, file: UploadFile, prefix: list[str], file_name: str) -> bool:
+    def validate_upload(self, file: UploadFile):
         if not file.filename.lower().endswith(self.allowed_extensions):
             raise BadRequestException(f"File type {file.content_type} is not allowed. Allowed types: {', '.join(self.allowed_extensions)}")
 
-        if file.size > self.file_max_size:
+        # the declared size rejects most oversized files before anything is sent, the reader enforces the rest
+        if file.size is not None and file.size > self.file_max_size:
             raise BadRequestException(f"File size must be less than {self.file_max_size} bytes")
 
-        transfer_config = TransferConfig(
-            multipart_threshold=self.chunk_size,
-            multipart_chunksize=self.file_max_size,
-            max_concurrency=20,
-        )
+    async def upload_file_to_s3(self, file: UploadFile, prefix: list[str], file_name: str) -> StoredImageDC | None:
+        self.validate_upload(file)
+
+        # every upload of the worker holds a slot, so bursts queue here instead of piling up threads and processes
+        async with self.upload_slots:
+            return await self.store_file(file, os.path.join(*prefix, f"{file_name}{self.extension}"))
 
+    async def store_file(self, file: UploadFile, key: str) -> StoredImageDC | None:
         try:
-            file_bytes = await file.read()
-            file_name = f"{file_name}{self.extension}"
+            await file.seek(0)
+            if file.filename.lower().endswith(self.vector_extensions):
+                # vector logos are not rasterized, every variant key serves the original
+                for variant in ImageVariant:
+                    await file.seek(0)
+                    await asyncio.to_thread(
+                        self.client.upload_fileobj,
+                        Fileobj=SizeLimitedReader(file.file, self.file_max_size),
+                        Bucket=self.bucket_name,
+                        Key=self.variant_key(key, variant),
+                        ExtraArgs={"ContentType": "image/svg+xml"},
+                    )
+                return None
 
-            res = self.client.upload_fileobj(
-                Fileobj=BytesIO(file_bytes),
-                Bucket=self.bucket_name,
-                Key=os.path.join(*prefix, file_name),
-                Config=transfer_config,
-            )
+            # the pool process reads the upload from a temporary file, the API worker only holds one chunk of it.
+            # the spool itself has no path once it rolls over to disk, so the capped payload is copied out
+            path = await asyncio.to_thread(self.spool_to_file, file.file)
+            try:
+                variants, image = await ImageProcessor.transcode_file(path)
+            finally:
+                os.unlink(path)
 
-            return True
-        except S3UploadFailedError:
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self.client.put_object,
+                        Bucket=self.bucket_name,
+                        Key=self.variant_key(key, variant),
+                        Body=body,
+                        ContentType="image/webp",
+                    )
+                    for variant, body in variants.items()
+                )
+            )
+            return image
+        except (S3UploadFailedError, ClientError):
             logger.exception("Error uploading file", exc_info=True)
             raise ServerException("Failed to upload file")
 
+    def spool_to_file(self, fileobj: BinaryIO) -> str:
+        with tempfile.NamedTemporaryFile(prefix="upload-", delete=False) as target:
+            try:
+                shutil.copyfileobj(SizeLimitedReader(fileobj, self.file_max_size), target, self.copy_chunk_size)
+            except BaseException:
+                os.unlink(target.name)
+                raise
+        return target.name
+
+    async def delete_images(self, keys: list[str]):
+        # removes every variant of the given canonical keys
+        if not keys:
+            return
+
+        objects = [{"Key": self.variant_key(key, variant)} for key in keys for variant in ImageVariant]
+        try:
+            await asyncio.to_thread(
+                self.client.delete_objects, Bucket=self.bucket_name, Delete={"Objects": objects, "Quiet": True}
+            )
+        except ClientError:
+            logger.exception(f"Failed to delete images {keys}", exc_info=True)
+
+    @staticmethod
+    def variant_key(key: str, variant: ImageVariant) -> str:
+        # the large variant keeps the canonical key, so photo listings under a service prefix only see large images
+        if variant == ImageVariant.LARGE:
+            return key
+        return os.path.join(variant.value, key)
+
+    async def create_upload_post(self, key: str, content_type: str, max_size: int, expiration: int) -> dict:
+        # the policy pins key, content type and size, S3 itself rejects anything else
+        try:
+            return await asyncio.to_thread(
+                self.client.generate_presigned_post,
+                Bucket=self.bucket_name,
+                Key=key,
+                Fields={"Content-Type": content_type},
+                Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_size]],
+                ExpiresIn=expiration,
+            )
+        except Exception:
+            logger.exception("Error generating presigned POST", exc_info=True)
+            raise ServerException("Failed to generate upload URL")
+
+    async def head_object(self, key: str) -> dict | None:
+        try:
+            return await asyncio.to_thread(self.client.head_object, Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    async def store_uploaded_image(self, source_key: str, key: str, content_type: str) -> StoredImageDC | None:
+        # moves a direct upload to its final key, the payload is only touched by S3 and the image pool
+        image = None
+        try:
+            if content_type == "image/svg+xml":
+                for variant in ImageVariant:
+                    await asyncio.to_thread(
+                        self.client.copy_object,
+                        Bucket=self.bucket_name,
+                        Key=self.variant_key(key, variant),
+                        CopySource={"Bucket": self.bucket_name, "Key": source_key},
+                    )
+            else:
+                image = await ImageProcessor.transcode_stored(
+                    self.bucket_name, source_key, {variant: self.variant_key(key, variant) for variant in ImageVariant}
+                )
+
+            await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket_name, Key=source_key)
+            return image
+        except ClientError:
+            logger.exception("Error storing uploaded file", exc_info=True)
+            raise ServerException("Failed to store uploaded file")
+
     async def generate_persist_url(self, prefix: list[str], file_name: str, expiration: int = 3600) -> str:
+        return await self.generate_key_url(os.path.join(*prefix, f"{file_name}{self.extension}"), expiration)
+
+    async def generate_key_url(
+        self, key: str, expiration: int = 3600, variant: ImageVariant = ImageVariant.LARGE
+    ) -> str:
+        urls = await self.generate_key_urls([key], expiration, variant)
+        return urls[0]
+
+    async def generate_key_urls(
+        self, keys: list[str], expiration: int = 3600, variant: ImageVariant = ImageVariant.LARGE
+    ) -> list[str]:
+        keys = [self.variant_key(key, variant) for key in keys]
+        # list pages resolve all their keys at once, only keys missing from the cache are signed
+        cache_keys = {key: PresignedUrlCache.cache_key(self.bucket_name, key, expiration) for key in keys}
+        urls = await PresignedUrlCache.get_many(list(dict.fromkeys(cache_keys.values())))
+
+        missing = [key for key in dict.fromkeys(keys) if cache_keys[key] not in urls]
+        if missing:
+            signed_at, expires_in, cache_until = self.signing_window(expiration)
+            # signing is local, but a credential refresh behind it is a blocking network call
+            signed_urls = await asyncio.to_thread(self.sign_urls, missing, signed_at, expires_in)
+            signed = {cache_keys[key]: url for key, url in zip(missing, signed_urls)}
+            await PresignedUrlCache.set_many(signed, cache_until)
+            urls.update(signed)
+
+        return [urls[cache_keys[key]] for key in keys]
+
+    @staticmethod
+    def signing_window(expiration: int) -> tuple[int, int, int]:
+        # (signed_at, expires_in, cached until)
+        now = int(time.time())
+        if not PRESIGNED_URL_WINDOW:
+            return now, expiration, now + expiration - PresignedUrlCache.min_validity
+
+        # every worker signs the same timestamp within a window, so browsers and CDNs see one url per object.
+        # the window is added to the validity, a url handed out at the end of its window still lasts `expiration`
+        signed_at = now - now % PRESIGNED_URL_WINDOW
+        return signed_at, expiration + PRESIGNED_URL_WINDOW, signed_at + PRESIGNED_URL_WINDOW
+
+    def sign_urls(self, keys: list[str], signed_at: int, expires_in: int) -> list[str]:
+        if not PRESIGNED_URL_WINDOW:
+            return [self.sign_url(key, expires_in) for key in keys]
+
         try:
-            file_name = f"{file_name}{self.extension}"
-            url = self.client.generate_presigned_url(
+            credentials = get_s3_credentials()
+            endpoint = self.bucket_endpoint()
+            return [
+                S3UrlSigner.presign_get(endpoint, key, self.signing_region(), credentials, signed_at, expires_in)
+                for key in keys
+            ]
+        except Exception:
+            logger.exception("Error generating presigned URL", exc_info=True)
+            raise ServerException("Failed to generate presigned URL")
+
+    def bucket_endpoint(self) -> str:
+        endpoint_url = os.getenv("S3_ENDPOINT_URL")
+        if endpoint_url:
+            return f"{endpoint_url.rstrip('/')}/{self.bucket_name}"
+        region_name = self.client.meta.region_name
+        if not region_name:
+            # without a region the global endpoint routes to the bucket's region
+            return f"https://{self.bucket_name}.s3.amazonaws.com"
+        return f"https://{self.bucket_name}.s3.{region_name}.amazonaws.com"
+
+    def signing_region(self) -> str:
+        # the global endpoint is signed for us-east-1
+        return self.client.meta.region_name or "us-east-1"
+
+    def sign_url(self, key: str, expiration: int) -> str:
+        try:
+            return self.client.generate_presigned_url(
                 ClientMethod="get_object",
                 ExpiresIn=expiration,
                 Params={
                     "Bucket": self.bucket_name,
-                    "Key": os.path.join(*prefix, file_name),
+                    "Key": key,
                 },
             )
-            return url
         except Exception:
             logger.exception("Error generating presigned URL", exc_info=True)
             raise ServerException("Failed to generate presigned URL")
 
-    async def generate_persist_list_urls(self, prefix: list[str], expiration: int = 3600) -> list[str]:
+    async def generate_persist_list_urls(
+        self, prefix: list[str], expiration: int = 3600, variant: ImageVariant = ImageVariant.LARGE
+    ) -> list[str]:
         try:
-            urls = []
-
-            response = self.client.list_objects_v2(Bucket=self.bucket_name, Prefix=os.path.join(*prefix))
-            for obj in response.get("Contents", []):
-                url = self.client.generate_presigned_url(
-                    ClientMethod="get_object",
-                    ExpiresIn=expiration,
-                    Params={
-                        "Bucket": self.bucket_name,
-                        "Key": obj["Key"],
-                    }
-                )
-                urls.append(url)
-
-            return urls
+            # listing is a network round trip, it runs in a thread so concurrent listings overlap
+            response = await asyncio.to_thread(
+                self.client.list_objects_v2, Bucket=self.bucket_name, Prefix=os.path.join(*prefix)
+            )
         except Exception:
-            logger.exception("Error generating presigned URLs", exc_info=True)
+            logger.exception("Error listing objects", exc_info=True)
             raise ServerException("Failed to generate presigned URLs")
+
+        return await self.generate_key_urls([obj["Key"] for obj in response.get("Contents", [])], expiration, variant)
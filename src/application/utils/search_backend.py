@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import abc
+import os
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+
+from dotenv import load_dotenv
+from geopy.distance import geodesic
+
+from application.dto.services.service_document_dc import (
+    OfferDocumentDC,
+    ServiceDocumentDC,
+    ServiceSearchQueryDC,
+    ServiceSearchHitDC,
+    ServiceSearchResultDC,
+)
+from application.enums.services.car_brands import CarBrands
+from application.enums.services.car_types import CarType
+from application.utils.text_search import SEARCH_DISTANCE_DECAY_KM
+
+load_dotenv()
+
+
+_backend: SearchBackend | None = None
+
+
+def get_search_backend() -> SearchBackend:
+    global _backend
+
+    if _backend is None:
+        if os.getenv("SEARCH_BACKEND", "opensearch") == "memory":
+            _backend = InMemorySearchBackend()
+        else:
+            # imported here so the async transport is only required when OpenSearch is actually used
+            from application.utils.opensearch_backend import OpenSearchBackend
+
+            _backend = OpenSearchBackend()
+    return _backend
+
+
+async def close_search_backend():
+    global _backend
+
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+class SearchBackend(abc.ABC):
+    facet_size: int = 20
+    # name and description matches outweigh the address, same weights as the Postgres document
+    field_boosts: dict[str, float] = {"name": 3.0, "descriptions": 2.0, "address": 1.0}
+
+    @abc.abstractmethod
+    async def ensure_index(self):
+        ...
+
+    @abc.abstractmethod
+    async def index_documents(self, documents: list[ServiceDocumentDC]) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def delete_documents(self, service_ids: list[str]) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def document_ids(self) -> list[str]:
+        ...
+
+    @abc.abstractmethod
+    async def search(self, query: ServiceSearchQueryDC) -> ServiceSearchResultDC:
+        ...
+
+    async def close(self):
+        pass
+
+    @staticmethod
+    def car_pairs(query: ServiceSearchQueryDC) -> list[str]:
+        return [
+            f"{brand}:{car_type}"
+            for brand in (query.car_brand, CarBrands.ALL.value)
+            for car_type in (query.car_type, CarType.ALL.value)
+        ]
+
+    @staticmethod
+    def distance_decay(distance_meters: float) -> float:
+        # same curve as an OpenSearch gauss decay with scale SEARCH_DISTANCE_DECAY_KM and decay 0.5
+        return 0.5 ** ((distance_meters / (SEARCH_DISTANCE_DECAY_KM * 1000)) ** 2)
+
+    @staticmethod
+    def distance_meters(document: ServiceDocumentDC, query: ServiceSearchQueryDC) -> float | None:
+        if not query.has_location:
+            return None
+        return geodesic((query.latitude, query.longitude), (document.latitude, document.longitude)).meters
+
+
+# process local stand-in with the filtering, ordering and facets of the OpenSearch backend
+class InMemorySearchBackend(SearchBackend):
+    fuzzy_ratio: float = 0.8
+
+    def __init__(self):
+        self.documents: dict[str, ServiceDocumentDC] = {}
+
+    async def ensure_index(self):
+        pass
+
+    async def index_documents(self, documents: list[ServiceDocumentDC]) -> int:
+        for document in documents:
+            self.documents[document.service_id] = document
+        return len(documents)
+
+    async def delete_documents(self, service_ids: list[str]) -> int:
+        return len([self.documents.pop(service_id) for service_id in service_ids if service_id in self.documents])
+
+    async def document_ids(self) -> list[str]:
+        return list(self.documents)
+
+    async def search(self, query: ServiceSearchQueryDC) -> ServiceSearchResultDC:
+        hits = []
+        for document in self.documents.values():
+            hit = self.match(document, query)
+            if hit is not None:
+                hits.append(hit)
+
+        hits.sort(key=lambda hit: self.sort_key(hit.sort, query))
+        facets = self.facets([hit.document for hit in hits])
+
+        if query.search_after is not None:
+            after = self.sort_key(query.search_after, query)
+            page = [hit for hit in hits if self.sort_key(hit.sort, query) > after][:query.limit]
+        else:
+            page = hits[query.offset:query.offset + query.limit]
+
+        return ServiceSearchResultDC(hits=page, total=len(hits), facets=facets)
+
+    def match(self, document: ServiceDocumentDC, query: ServiceSearchQueryDC) -> ServiceSearchHitDC | None:
+        if any(str(getattr(document, key)) != str(value) for key, value in query.filters.items()):
+            return None
+
+        distance = self.distance_meters(document, query)
+        if query.radius_km and distance > query.radius_km * 1000:
+            return None
+
+        best_offer = None
+        if query.has_offer_filter:
+            offers = [offer for offer in document.offers if self.offer_matches(offer, query)]
+            if not offers:
+                return None
+            best_offer = min(offers, key=lambda offer: offer.current_price)
+
+        if query.q:
+            score = self.text_score(document, query.q)
+            if not score:
+                return None
+            if distance is not None:
+                score *= self.distance_decay(distance)
+            sort = [score, document.service_id]
+        elif distance is not None:
+            sort = [distance, document.service_id]
+        else:
+            sort = [document.service_id]
+
+        return ServiceSearchHitDC(document=document, sort=sort, distance_meters=distance, best_offer=best_offer)
+
+    def offer_matches(self, offer: OfferDocumentDC, query: ServiceSearchQueryDC) -> bool:
+        if query.offer_type and offer.offer_type != query.offer_type:
+            return False
+        if query.currency and offer.currency != query.currency:
+            return False
+        if query.max_price is not None and offer.current_price > query.max_price:
+            return False
+        if query.car_brand and query.car_type:
+            return bool(set(offer.car_pairs) & set(self.car_pairs(query)))
+        if query.car_brand and not {query.car_brand, CarBrands.ALL.value} & set(offer.car_brands):
+            return False
+        if query.car_type and not {query.car_type, CarType.ALL.value} & set(offer.car_types):
+            return False
+        return True
+
+    def text_score(self, document: ServiceDocumentDC, q: str) -> float:
+        fields = {
+            "name": self.tokens(document.name),
+            "descriptions": self.tokens(" ".join(document.descriptions)),
+            "address": self.tokens(document.address),
+        }
+
+        score = 0.0
+        for term in self.tokens(q):
+            for field_name, tokens in fields.items():
+                similarity = max((self.similarity(term, token) for token in tokens), default=0.0)
+                if similarity >= self.fuzzy_ratio:
+                    score += self.field_boosts[field_name] * similarity
+        return score
+
+    @staticmethod
+    def tokens(text: str) -> list[str]:
+        return re.findall(r"\w+", text.lower())
+
+    @staticmethod
+    def similarity(term: str, token: str) -> float:
+        if term == token:
+            return 1.0
+        return SequenceMatcher(None, term, token).ratio()
+
+    @staticmethod
+    def sort_key(sort: list, query: ServiceSearchQueryDC) -> tuple:
+        # scores sort descending, distances and ids ascending
+        if query.q:
+            return -sort[0], sort[1]
+        return tuple(sort)
+
+    def facets(self, documents: list[ServiceDocumentDC]) -> dict[str, dict[str, int]]:
+        offer_types = Counter(
+            offer_type
+            for document in documents
+            for offer_type in {offer.offer_type for offer in document.offers if offer.offer_type}
+        )
+        return {
+            "city": dict(Counter(document.city for document in documents).most_common(self.facet_size)),
+            "country": dict(Counter(document.country for document in documents).most_common(self.facet_size)),
+            "offer_type": dict(offer_types.most_common(self.facet_size)),
+        }
@@ -0,0 +1,63 @@
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import func, literal, or_, Text, Float
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.sql.elements import ColumnElement
+
+from application.enums.services.language import LanguageCode
+
+load_dotenv()
+
+# Postgres ships no Slovak, Czech or Polish stemmer, those fall back to the unstemmed simple configuration
+LANGUAGE_CONFIGS: dict[LanguageCode, str] = {
+    LanguageCode.EN: "english",
+    LanguageCode.SK: "simple",
+    LanguageCode.CZ: "simple",
+    LanguageCode.DE: "german",
+    LanguageCode.HU: "hungarian",
+    LanguageCode.PL: "simple",
+}
+
+SEARCH_DISTANCE_DECAY_KM: float = float(os.getenv("SEARCH_DISTANCE_DECAY_KM", 10))
+TRIGRAM_RANK_WEIGHT: float = 0.5
+
+
+def language_config_sql(language_column: str) -> str:
+    # used inside generated columns, so the configuration has to be a constant per branch
+    branches = " ".join(
+        f"WHEN '{language.value}' THEN '{config}'::regconfig" for language, config in LANGUAGE_CONFIGS.items()
+    )
+    return f"CASE {language_column} {branches} ELSE 'simple'::regconfig END"
+
+
+def description_document_sql(language_column: str = "language_code", content_column: str = "content") -> str:
+    return f"to_tsvector({language_config_sql(language_column)}, coalesce({content_column}, ''))"
+
+
+def search_query(q: str) -> ColumnElement:
+    # the query is stemmed with every configuration in use, a document matches if any of them matches
+    configs = ["simple", *sorted(set(LANGUAGE_CONFIGS.values()) - {"simple"})]
+    query = func.websearch_to_tsquery(literal(configs[0], REGCONFIG), literal(q, Text))
+    for config in configs[1:]:
+        query = query.op("||")(func.websearch_to_tsquery(literal(config, REGCONFIG), literal(q, Text)))
+    return query
+
+
+def text_match(document: ColumnElement, trigram_text: ColumnElement, q: str) -> ColumnElement:
+    # the trigram branch keeps typos like "mechanik" or "autoservis" findable when no lexeme matches
+    return or_(document.op("@@")(search_query(q)), literal(q, Text).op("<%")(trigram_text))
+
+
+def document_rank(document: ColumnElement, q: str) -> ColumnElement:
+    return func.ts_rank_cd(document, search_query(q), type_=Float)
+
+
+def text_rank(document: ColumnElement, trigram_text: ColumnElement, q: str) -> ColumnElement:
+    return document_rank(document, q) + TRIGRAM_RANK_WEIGHT * func.word_similarity(
+        literal(q, Text), trigram_text, type_=Float
+    )
+
+
+def distance_weighted_rank(rank: ColumnElement, distance_meters: ColumnElement) -> ColumnElement:
+    return rank / (1.0 + distance_meters / (SEARCH_DISTANCE_DECAY_KM * 1000.0))
@@ -0,0 +1,57 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+from application.dto.jwt_dc import JwtDC
+
+load_dotenv()
+
+
+class TokenCache:
+    # verified tokens of this worker, a hit skips the RS256 signature check until the token expires
+    max_entries: int = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+
+    # sha256 of the token -> (exp, jwt), least recently used first
+    entries: OrderedDict[str, tuple[float, JwtDC]] = OrderedDict()
+
+    @staticmethod
+    def cache_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def get(cls, token: str) -> JwtDC | None:
+        cache_key = cls.cache_key(token)
+        entry = cls.entries.get(cache_key)
+        if entry is None:
+            return None
+
+        if entry[0] <= time.time():
+            del cls.entries[cache_key]
+            return None
+
+        cls.entries.move_to_end(cache_key)
+        return entry[1]
+
+    @classmethod
+    def set(cls, token: str, jwt_dc: JwtDC, expires_at: float):
+        if expires_at <= time.time():
+            return
+
+        cache_key = cls.cache_key(token)
+        cls.entries[cache_key] = (expires_at, jwt_dc)
+        cls.entries.move_to_end(cache_key)
+        while len(cls.entries) > cls.max_entries:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, token: str):
+        cls.entries.pop(cls.cache_key(token), None)
+
+    @classmethod
+    def invalidate_user(cls, user_id: str):
+        # a global sign out revokes every token of the user, not only the one it was called with
+        for cache_key in [key for key, (_, jwt_dc) in cls.entries.items() if jwt_dc.user_id == user_id]:
+            del cls.entries[cache_key]
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import suppress
+
+from dotenv import load_dotenv
+from loguru import logger
+from redis.exceptions import RedisError
+
+from application.dto.jwt_dc import JwtDC
+from application.utils.redis_helper import get_async_redis
+from application.utils.token_cache import TokenCache
+
+load_dotenv()
+
+
+class TokenRevocation:
+    key_prefix: str = "revoked"
+    channel: str = "token-revocations"
+    # a token found not revoked is trusted this long without a Redis hop, broadcasts end it early
+    negative_ttl: int = int(os.getenv("REVOCATION_CACHE_TTL", 30))
+    max_entries: int = int(os.getenv("REVOCATION_CACHE_SIZE", 10000))
+    # longest lifetime of an access or id token, a user revocation outlives every token issued before it
+    user_revocation_ttl: int = int(os.getenv("REDIS_TOKEN_EXPIRATION", 3600))
+
+    # jti -> (trusted until, user_id), least recently used first
+    not_revoked: OrderedDict[str, tuple[float, str]] = OrderedDict()
+    listener: asyncio.Task | None = None
+
+    @classmethod
+    def user_key(cls, user_id: str) -> str:
+        return f"{cls.key_prefix}:user:{user_id}"
+
+    @classmethod
+    async def is_revoked(cls, jwt_dc: JwtDC) -> bool:
+        entry = cls.not_revoked.get(jwt_dc.jti)
+        if entry is not None and entry[0] > time.time():
+            cls.not_revoked.move_to_end(jwt_dc.jti)
+            return False
+
+        try:
+            revoked_at = await get_async_redis().get(cls.user_key(jwt_dc.user_id))
+        except RedisError:
+            # an unreachable Redis must not log everybody out, revocations apply again once it is back
+            logger.warning("Token revocation check unavailable", exc_info=True)
+            return False
+
+        # iat has whole seconds, a token issued in the second of the revocation is kept
+        # so that a login right after a sign out is not revoked with it
+        if revoked_at is not None and jwt_dc.issued_at < int(revoked_at):
+            return True
+
+        cls.not_revoked[jwt_dc.jti] = (time.time() + cls.negative_ttl, jwt_dc.user_id)
+        cls.not_revoked.move_to_end(jwt_dc.jti)
+        while len(cls.not_revoked) > cls.max_entries:
+            cls.not_revoked.popitem(last=False)
+        return False
+
+    @classmethod
+    async def revoke_user(cls, user_id: str):
+        # every token of the user issued up to now is revoked, as with a Cognito global sign out
+        await cls.publish(f"user:{user_id}", cls.user_key(user_id), str(int(time.time())), cls.user_revocation_ttl)
+
+    @classmethod
+    async def publish(cls, message: str, key: str, value: str, ttl: int):
+        cls.apply(message)
+        try:
+            async with get_async_redis().pipeline(transaction=True) as pipe:
+                pipe.set(key, value, ex=ttl)
+                pipe.publish(cls.channel, message)
+                await pipe.execute()
+        except RedisError:
+            logger.warning(f"Failed to publish token revocation {message}", exc_info=True)
+
+    @classmethod
+    def apply(cls, message: str):
+        kind, value = message.split(":", 1)
+        if kind == "user":
+            for jti in [jti for jti, (_, user_id) in cls.not_revoked.items() if user_id == value]:
+                del cls.not_revoked[jti]
+            TokenCache.invalidate_user(value)
+
+    @classmethod
+    def start_listener(cls):
+        if cls.listener is None or cls.listener.done():
+            cls.listener = asyncio.create_task(cls.listen())
+
+    @classmethod
+    async def stop_listener(cls):
+        if cls.listener is not None:
+            cls.listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await cls.listener
+            cls.listener = None
+
+    @classmethod
+    async def listen(cls):
+        while True:
+            pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(cls.channel)
+                # broadcasts sent while this worker was not subscribed are lost, so nothing cached before is trusted
+                cls.not_revoked.clear()
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        cls.apply(message["data"].decode())
+            except RedisError:
+                logger.warning("Token revocation channel unavailable, resubscribing", exc_info=True)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import select, Select
+from sqlalchemy.orm import selectinload
+
+from application.handlers.service_handler.service_handler import ServiceHandler
+from application.models import ServiceModel, ServiceSearchModel
+from application.models.engine import engine, SessionFactory
+
+
+def page_subquery(per_page: int, page_num: int):
+    # both paths load the same page of listed services, only the way the rows are read differs
+    return (
+        select(ServiceSearchModel.service_id.label("page_service_id"), ServiceSearchModel.service_id.label("sort_key"))
+        .order_by(ServiceSearchModel.service_id)
+        .limit(per_page + 1)
+        .offset((page_num - 1) * per_page)
+        .subquery("page")
+    )
+
+
+def orm_query(per_page: int, page_num: int) -> Select:
+    # list query as it was before the projection path: full service entities plus their selectin relations
+    page = page_subquery(per_page, page_num)
+    return (
+        select(ServiceModel, page.c.sort_key)
+        .join(page, ServiceModel.service_id == page.c.page_service_id)
+        .order_by(page.c.sort_key, ServiceModel.service_id)
+        .options(
+            selectinload(ServiceModel.organization),
+            selectinload(ServiceModel.offers),
+        )
+    )
+
+
+def projection_query(per_page: int, page_num: int) -> Select:
+    # list item columns of the service_search read model
+    return ServiceHandler.list_item_query(page_subquery(per_page, page_num))
+
+
+async def fetch_orm(per_page: int, page_num: int) -> int:
+    async with SessionFactory() as session:
+        query_result = await session.execute(orm_query(per_page, page_num))
+        rows = query_result.mappings().all()
+        return len([(row["ServiceModel"].service_id, row["ServiceModel"].name) for row in rows])
+
+
+async def fetch_projection(per_page: int, page_num: int) -> int:
+    async with SessionFactory() as session:
+        query_result = await session.execute(projection_query(per_page, page_num))
+        rows = query_result.tuples().all()
+        return len([(row.service_id, row.name) for row in rows])
+
+
+async def measure(fetch, per_page: int, page_num: int, iterations: int) -> dict:
+    await fetch(per_page, page_num)
+
+    timings, peaks, rows = [], [], 0
+    for _ in range(iterations):
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+
+        rows = await fetch(per_page, page_num)
+
+        timings.append((time.perf_counter() - started) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "p50_ms": statistics.median(timings),
+        "p95_ms": sorted(timings)[max(int(len(timings) * 0.95) - 1, 0)],
+        "peak_kib": statistics.median(peaks),
+    }
+
+
+async def run(per_page: int, page_num: int, iterations: int):
+    engine.echo = False
+
+    results = {
+        "orm services": await measure(fetch_orm, per_page, page_num, iterations),
+        "projection service_search": await measure(fetch_projection, per_page, page_num, iterations),
+    }
+
+    print(f"per_page={per_page} page_num={page_num} iterations={iterations}")
+    print(f"{'path':<28}{'rows':>6}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>12}")
+    for path, result in results.items():
+        print(
+            f"{path:<28}{result['rows']:>6}{result['p50_ms']:>10.2f}"
+            f"{result['p95_ms']:>10.2f}{result['peak_kib']:>12.1f}"
+        )
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare ORM loading of services with the service_search column projection for one list page"
+    )
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--page-num", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.per_page, args.page_num, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
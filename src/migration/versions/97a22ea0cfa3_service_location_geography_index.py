@@ -0,0 +1,28 @@
+"""service location geography index
+
+Revision ID: 97a22ea0cfa3
+Revises: 07520a9fb83e
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '97a22ea0cfa3'
+down_revision: Union[str, Sequence[str], None] = '07520a9fb83e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""CREATE INDEX IF NOT EXISTS idx_services_location_geography ON services USING gist ((location::geography))""")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""DROP INDEX IF EXISTS idx_services_location_geography""")
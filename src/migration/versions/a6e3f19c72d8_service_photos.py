@@ -0,0 +1,45 @@
+"""service photos
+
+Revision ID: a6e3f19c72d8
+Revises: d4a9b27e5c13
+Create Date: 2026-10-18 17:24:41.603118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e3f19c72d8'
+down_revision: Union[str, Sequence[str], None] = 'd4a9b27e5c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "service_photos",
+        sa.Column("photo_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("service_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["service_id"], ["services.service_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("photo_id"),
+        sa.UniqueConstraint("key"),
+    )
+    op.create_index(
+        "idx_service_photos_service_id_position", "service_photos", ["service_id", "position"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_service_photos_service_id_position", table_name="service_photos")
+    op.drop_table("service_photos")
@@ -0,0 +1,214 @@
+"""offer type and car compatibility
+
+Revision ID: b3e1c7d94a52
+Revises: 97a22ea0cfa3
+Create Date: 2026-10-18 12:40:08.517204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1c7d94a52'
+down_revision: Union[str, Sequence[str], None] = '97a22ea0cfa3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "offers",
+        sa.Column(
+            "offer_type",
+            sa.Enum(
+                "MAINTENANCE",
+                "REPAIR",
+                "DIAGNOSTICS",
+                "ENGINE_REPAIR",
+                "TRANSMISSION_REPAIR",
+                "CLUTCH_REPAIR",
+                "TIMING_BELT_REPLACEMENT",
+                "BRAKE_SERVICE",
+                "SUSPENSION_REPAIR",
+                "STEERING_REPAIR",
+                "ELECTRICAL",
+                "BATTERY_SERVICE",
+                "ALTERNATOR_REPAIR",
+                "STARTER_REPAIR",
+                "LIGHTING_REPAIR",
+                "ECU_PROGRAMMING",
+                "OIL_CHANGE",
+                "FILTER_REPLACEMENT",
+                "COOLANT_SERVICE",
+                "BRAKE_FLUID_SERVICE",
+                "TRANSMISSION_FLUID_SERVICE",
+                "TIRE_CHANGE",
+                "TIRE_BALANCING",
+                "WHEEL_ALIGNMENT",
+                "PUNCTURE_REPAIR",
+                "EXHAUST_REPAIR",
+                "EMISSIONS_SERVICE",
+                "CATALYTIC_CONVERTER_REPAIR",
+                "AC_SERVICE",
+                "AC_REPAIR",
+                "HEATING_REPAIR",
+                "BODY_WORK",
+                "PAINTING",
+                "DENT_REMOVAL",
+                "WINDSHIELD_REPLACEMENT",
+                "RUST_REPAIR",
+                "INTERIOR_REPAIR",
+                "UPHOLSTERY_REPAIR",
+                "WINDOW_MECHANISM_REPAIR",
+                "PRE_PURCHASE_INSPECTION",
+                "SAFETY_INSPECTION",
+                "CAR_WASH",
+                "DETAILING",
+                "TOWING",
+                name="offertype",
+                native_enum=False,
+                length=50,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(op.f("ix_offers_offer_type"), "offers", ["offer_type"], unique=False)
+    op.create_index("idx_offers_service_type_currency", "offers", ["service_id", "offer_type", "currency"], unique=False)
+
+    op.create_table(
+        "offer_car_compatibility",
+        sa.Column("offer_car_compatibility_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("offer_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column(
+            "car_type",
+            sa.Enum(
+                "SEDAN",
+                "HATCHBACK",
+                "COUPE",
+                "CONVERTIBLE",
+                "WAGON",
+                "LIFTBACK",
+                "SPORTS",
+                "SUPER_CAR",
+                "LUXURY",
+                "CLASSIC",
+                "SUV",
+                "CROSSOVER",
+                "OFF_ROAD",
+                "PICKUP",
+                "TRUCK",
+                "VAN",
+                "MINIVAN",
+                "BUS",
+                "BOX_TRUCK",
+                "ELECTRIC",
+                "HYBRID",
+                "PLUG_IN_HYBRID",
+                "HYDROGEN",
+                "TAXI",
+                "POLICE",
+                "AMBULANCE",
+                "FIRE_TRUCK",
+                "MILITARY",
+                "MOTORCYCLE",
+                "SCOOTER",
+                "ALL",
+                name="cartype",
+                native_enum=False,
+                length=50,
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "car_brand",
+            sa.Enum(
+                "HONDA",
+                "TOYOTA",
+                "FORD",
+                "CHEVROLET",
+                "BMW",
+                "MERCEDES_BENZ",
+                "AUDI",
+                "VOLKSWAGEN",
+                "NISSAN",
+                "HYUNDAI",
+                "KIA",
+                "SUBARU",
+                "MAZDA",
+                "JEEP",
+                "LEXUS",
+                "DODGE",
+                "JAGUAR",
+                "LAND_ROVER",
+                "TESLA",
+                "VOLVO",
+                "FIAT",
+                "ALFA_ROMEO",
+                "MITSUBISHI",
+                "RENAULT",
+                "PEUGEOT",
+                "CITROEN",
+                "SUZUKI",
+                "INFINITI",
+                "ACURA",
+                "CADILLAC",
+                "BUICK",
+                "GMC",
+                "CHRYSLER",
+                "RAM",
+                "MINI",
+                "SMART",
+                "SAAB",
+                "SKODA",
+                "SEAT",
+                "LADA",
+                "TATA",
+                "MAHINDRA",
+                "GREAT_WALL",
+                "GEELY",
+                "LIFAN",
+                "BYD",
+                "CHERY",
+                "HAFEI",
+                "JAC",
+                "ALL",
+                name="carbrands",
+                native_enum=False,
+                length=50,
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["offer_id"], ["offers.offer_id"]),
+        sa.PrimaryKeyConstraint("offer_car_compatibility_id"),
+        sa.UniqueConstraint("offer_id", "car_brand", "car_type", name="uq_offer_car_brand_type"),
+    )
+    op.create_index(op.f("ix_offer_car_compatibility_offer_id"), "offer_car_compatibility", ["offer_id"], unique=False)
+    op.create_index(op.f("ix_offer_car_compatibility_car_type"), "offer_car_compatibility", ["car_type"], unique=False)
+    op.create_index(
+        op.f("ix_offer_car_compatibility_car_brand"), "offer_car_compatibility", ["car_brand"], unique=False
+    )
+    op.create_index(
+        op.f("ix_offer_car_compatibility_created_at"), "offer_car_compatibility", ["created_at"], unique=False
+    )
+    op.create_index(
+        op.f("ix_offer_car_compatibility_updated_at"), "offer_car_compatibility", ["updated_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_offer_car_compatibility_updated_at"), table_name="offer_car_compatibility")
+    op.drop_index(op.f("ix_offer_car_compatibility_created_at"), table_name="offer_car_compatibility")
+    op.drop_index(op.f("ix_offer_car_compatibility_car_brand"), table_name="offer_car_compatibility")
+    op.drop_index(op.f("ix_offer_car_compatibility_car_type"), table_name="offer_car_compatibility")
+    op.drop_index(op.f("ix_offer_car_compatibility_offer_id"), table_name="offer_car_compatibility")
+    op.drop_table("offer_car_compatibility")
+    op.drop_index("idx_offers_service_type_currency", table_name="offers")
+    op.drop_index(op.f("ix_offers_offer_type"), table_name="offers")
+    op.drop_column("offers", "offer_type")
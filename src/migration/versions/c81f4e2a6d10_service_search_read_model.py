@@ -0,0 +1,74 @@
+"""service search read model
+
+Revision ID: c81f4e2a6d10
+Revises: b3e1c7d94a52
+Create Date: 2026-10-18 14:05:51.284630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import geoalchemy2
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4e2a6d10'
+down_revision: Union[str, Sequence[str], None] = 'b3e1c7d94a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "service_search",
+        sa.Column("service_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("organization_id", sa.UUID(as_uuid=False), nullable=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column(
+            "country",
+            sa.Enum("SLOVAKIA", "CZECHIA", "AUSTRIA", "POLAND", "HUNGARY", name="country", native_enum=False, length=50),
+            nullable=False,
+        ),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("street", sa.String(), nullable=False),
+        sa.Column("postal_code", sa.String(), nullable=False),
+        sa.Column(
+            "location",
+            geoalchemy2.types.Geometry(
+                geometry_type="POINT", srid=4326, from_text="ST_GeomFromEWKT", name="geometry", spatial_index=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("logo_key", sa.String(), nullable=False),
+        sa.Column("min_prices", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("languages", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("updated_at", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["service_id"], ["services.service_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("service_id"),
+    )
+    op.create_index(op.f("ix_service_search_organization_id"), "service_search", ["organization_id"], unique=False)
+    op.create_index(op.f("ix_service_search_name"), "service_search", ["name"], unique=False)
+    op.create_index(op.f("ix_service_search_country"), "service_search", ["country"], unique=False)
+    op.create_index(op.f("ix_service_search_city"), "service_search", ["city"], unique=False)
+    op.create_index(
+        "idx_service_search_min_prices", "service_search", ["min_prices"], unique=False, postgresql_using="gin"
+    )
+    op.create_index(
+        "idx_service_search_languages", "service_search", ["languages"], unique=False, postgresql_using="gin"
+    )
+    op.execute("""CREATE INDEX IF NOT EXISTS idx_service_search_location_geography ON service_search USING gist ((location::geography))""")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""DROP INDEX IF EXISTS idx_service_search_location_geography""")
+    op.drop_index("idx_service_search_languages", table_name="service_search")
+    op.drop_index("idx_service_search_min_prices", table_name="service_search")
+    op.drop_index(op.f("ix_service_search_city"), table_name="service_search")
+    op.drop_index(op.f("ix_service_search_country"), table_name="service_search")
+    op.drop_index(op.f("ix_service_search_name"), table_name="service_search")
+    op.drop_index(op.f("ix_service_search_organization_id"), table_name="service_search")
+    op.drop_table("service_search")
@@ -0,0 +1,113 @@
+"""full text search
+
+Revision ID: d4a9b27e5c13
+Revises: c81f4e2a6d10
+Create Date: 2026-10-18 16:32:07.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9b27e5c13'
+down_revision: Union[str, Sequence[str], None] = 'c81f4e2a6d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DESCRIPTION_DOCUMENT = (
+    "to_tsvector(CASE language_code "
+    "WHEN 'EN' THEN 'english'::regconfig WHEN 'SK' THEN 'simple'::regconfig WHEN 'CZ' THEN 'simple'::regconfig "
+    "WHEN 'DE' THEN 'german'::regconfig WHEN 'HU' THEN 'hungarian'::regconfig WHEN 'PL' THEN 'simple'::regconfig "
+    "ELSE 'simple'::regconfig END, coalesce(content, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""CREATE EXTENSION IF NOT EXISTS pg_trgm""")
+    op.execute(
+        """CREATE OR REPLACE AGGREGATE tsvector_agg(tsvector) (SFUNC = tsvector_concat, STYPE = tsvector, INITCOND = '')"""
+    )
+
+    for table in ("service_description", "organization_description"):
+        op.add_column(
+            table,
+            sa.Column(
+                "search_document",
+                postgresql.TSVECTOR(),
+                sa.Computed(DESCRIPTION_DOCUMENT, persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"idx_{table}_search_document", table, ["search_document"], unique=False, postgresql_using="gin"
+        )
+
+    op.add_column(
+        "organization",
+        sa.Column(
+            "search_document",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('simple'::regconfig, coalesce(original_full_address, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_organization_search_document", "organization", ["search_document"], unique=False, postgresql_using="gin"
+    )
+    op.create_index(
+        "idx_organization_name_trgm",
+        "organization",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+    op.add_column(
+        "service_search",
+        sa.Column("search_document", postgresql.TSVECTOR(), server_default=sa.text("''::tsvector"), nullable=False),
+    )
+    op.add_column("service_search", sa.Column("search_text", sa.String(), server_default="", nullable=False))
+    op.create_index(
+        "idx_service_search_search_document",
+        "service_search",
+        ["search_document"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "idx_service_search_search_text_trgm",
+        "service_search",
+        ["search_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"search_text": "gin_trgm_ops"},
+    )
+    # existing rows get their documents on the next `rebuild-service-search` run
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_service_search_search_text_trgm", table_name="service_search")
+    op.drop_index("idx_service_search_search_document", table_name="service_search")
+    op.drop_column("service_search", "search_text")
+    op.drop_column("service_search", "search_document")
+
+    op.drop_index("idx_organization_name_trgm", table_name="organization")
+    op.drop_index("idx_organization_search_document", table_name="organization")
+    op.drop_column("organization", "search_document")
+
+    for table in ("organization_description", "service_description"):
+        op.drop_index(f"idx_{table}_search_document", table_name=table)
+        op.drop_column(table, "search_document")
+
+    op.execute("""DROP AGGREGATE IF EXISTS tsvector_agg(tsvector)""")
@@ -0,0 +1,70 @@
+"""cognito group changes
+
+Revision ID: e58b1c4a9f27
+Revises: a6e3f19c72d8
+Create Date: 2026-10-18 18:02:13.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e58b1c4a9f27'
+down_revision: Union[str, Sequence[str], None] = 'a6e3f19c72d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "cognito_group_changes",
+        sa.Column("change_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column(
+            "group_name",
+            sa.Enum(
+                "ADMIN",
+                "MODERATOR",
+                "USER",
+                "EXTENDED_USER",
+                "PENDING_SERVICE_ADMIN",
+                "SERVICE_ADMIN",
+                "SERVICE_MASTER",
+                "SERVICE_MODERATOR",
+                "ORGANIZATION_ADMIN",
+                "ORGANIZATION_MASTER",
+                "ORGANIZATION_MODERATOR",
+                name="groups",
+                native_enum=False,
+                length=50,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.Integer(), nullable=False),
+        sa.Column("processed_at", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("change_id"),
+    )
+    op.create_index(
+        "idx_cognito_group_changes_pending",
+        "cognito_group_changes",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_cognito_group_changes_pending",
+        table_name="cognito_group_changes",
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+    op.drop_table("cognito_group_changes")
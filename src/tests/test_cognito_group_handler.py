@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from application.enums.groups import Groups
+from application.handlers import cognito_group_handler
+from application.handlers.cognito_group_handler import CognitoGroupHandler
+from application.models import CognitoGroupChangeModel
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.commits = 0
+        self.claimed = []
+
+    async def execute(self, _):
+        return FakeResult(self.rows)
+
+    async def commit(self):
+        self.commits += 1
+        if self.commits == 1:
+            self.claimed = [(row.next_attempt_at, row.processed_at) for row in self.rows]
+
+
+class FakeCognito:
+    calls = []
+
+    async def add_user_to_group(self, username: str, group_name: Groups):
+        self.calls.append(username)
+        if username == "broken":
+            raise RuntimeError("cognito is down")
+
+
+def change(user_id: str) -> CognitoGroupChangeModel:
+    return CognitoGroupChangeModel(
+        user_id=user_id, group_name=Groups.PENDING_SERVICE_ADMIN, attempts=0, next_attempt_at=0
+    )
+
+
+def test_retry_delay_backs_off_up_to_the_cap():
+    assert [CognitoGroupHandler.retry_delay(attempts) for attempts in (1, 2, 3)] == [5, 10, 20]
+    assert CognitoGroupHandler.retry_delay(30) == CognitoGroupHandler.retry_max_delay
+
+
+def test_batch_marks_applied_changes_and_reschedules_failed_ones(monkeypatch):
+    FakeCognito.calls = []
+    monkeypatch.setattr(cognito_group_handler, "CognitoService", FakeCognito)
+    changes = [change("user-a"), change("user-a"), change("broken")]
+    session = FakeSession(changes)
+
+    assert asyncio.run(CognitoGroupHandler.process_batch(session)) == 3
+
+    # the claim is committed with a lease before Cognito is called
+    assert all(
+        processed_at is None and next_attempt_at > time.time() for next_attempt_at, processed_at in session.claimed
+    )
+    assert sorted(FakeCognito.calls) == ["broken", "user-a"]
+    assert changes[0].processed_at is not None and changes[1].processed_at is not None
+    assert changes[2].processed_at is None
+    assert changes[2].attempts == 1 and changes[2].next_attempt_at > time.time()
+    assert session.commits == 2
@@ -0,0 +1,59 @@
+from application.enums.services.country import Country
+from application.utils.gazetteer import Gazetteer, GazetteerBuilder, normalize, trigrams
+
+POSTCODES = [
+    ("SK", "81101", "Bratislava - Staré Mesto", 48.1440, 17.1080),
+    ("SK", "04001", "Košice", 48.7160, 21.2610),
+]
+ADDRESSES = [
+    ("SK", "81101", "Bratislava", "Hlavná", "1234/5", 48.1450, 17.1070),
+    ("SK", "81101", "Bratislava", "Hlavná", "7", 48.1460, 17.1090),
+    ("SK", "04001", "Košice", "Hlavná", "1", 48.7200, 21.2580),
+    ("SK", "81101", "Bratislava", "Štúrova", "2", 48.1420, 17.1120),
+]
+
+
+def build_gazetteer(tmp_path, postcode_fallback: bool = False) -> Gazetteer:
+    path = str(tmp_path / "gazetteer.sqlite")
+    builder = GazetteerBuilder(path)
+    builder.add_postcodes(POSTCODES)
+    builder.add_addresses(ADDRESSES)
+    builder.finish()
+    return Gazetteer(path, postcode_fallback=postcode_fallback)
+
+
+def test_normalize_and_trigrams_ignore_accents_and_punctuation():
+    assert normalize(" Štúrova  ulica 12/A ") == "sturova ulica 12 a"
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+
+
+def test_house_number_street_and_postal_code_of_the_right_city(tmp_path):
+    gazetteer = build_gazetteer(tmp_path)
+
+    house = gazetteer.lookup(Country.SLOVAKIA, "Bratislava", "hlavna", "5", "811 01")
+    assert (house.latitude, house.longitude) == (48.1450, 17.1070)
+    assert house.raw["precision"] == "house"
+
+    other_city = gazetteer.lookup(Country.SLOVAKIA, "Košice", "Hlavná", "1", "04001")
+    assert (other_city.latitude, other_city.longitude) == (48.7200, 21.2580)
+
+    street = gazetteer.lookup(Country.SLOVAKIA, "Bratislava", "Hlavná", "99", "81101")
+    assert street.raw["precision"] == "street"
+    assert round(street.latitude, 4) == 48.1455
+
+
+def test_misspelled_street_is_found_by_trigrams(tmp_path):
+    gazetteer = build_gazetteer(tmp_path)
+
+    location = gazetteer.lookup(Country.SLOVAKIA, "Bratislava", "Sturovva", "2", "81101")
+    assert location.address.startswith("Štúrova 2")
+    assert gazetteer.lookup(Country.SLOVAKIA, "Bratislava", "Dunajská", "2", "81101") is None
+
+
+def test_postal_code_centroid_only_when_enabled(tmp_path):
+    assert build_gazetteer(tmp_path).lookup(Country.SLOVAKIA, "Košice", "Nová", "3", "04001") is None
+
+    gazetteer = build_gazetteer(tmp_path, postcode_fallback=True)
+    location = gazetteer.lookup(Country.SLOVAKIA, "Košice", "Nová", "3", "04001")
+    assert (location.latitude, location.longitude) == (48.7160, 21.2610)
+    assert location.raw["precision"] == "postcode"
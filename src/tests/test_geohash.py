@@ -0,0 +1,12 @@
+from application.utils import geohash
+
+
+def test_encode_known_cell():
+    assert geohash.encode(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+
+def test_decode_returns_cell_center():
+    latitude, longitude = geohash.decode("u4pruydqqvj")
+
+    assert abs(latitude - 57.64911) < 1e-5
+    assert abs(longitude - 10.40744) < 1e-5
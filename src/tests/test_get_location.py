@@ -0,0 +1,79 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from geopy import Location
+
+from application.enums.services.country import Country
+from application.utils import get_location as get_location_module
+from application.utils.get_location import GeocodeCache, GeocodeRateLimiter, address_key, get_location
+
+
+class FakeGeocoder:
+    def __init__(self):
+        self.queries = []
+
+    def geocode(self, query: str) -> Location | None:
+        self.queries.append(query)
+        time.sleep(0.05)
+        return Location(query, (48.14, 17.1), {}) if "Nowhere" not in query else None
+
+
+def setup(monkeypatch) -> FakeGeocoder:
+    geocoder = FakeGeocoder()
+    monkeypatch.setattr(get_location_module, "get_geocoder", lambda: geocoder)
+    monkeypatch.setattr(get_location_module, "get_gazetteer", lambda: None)
+    monkeypatch.setattr(GeocodeCache, "entries", OrderedDict())
+    monkeypatch.setattr(GeocodeCache, "inflight", {})
+
+    async def no_row(key: str):
+        return None
+
+    async def store(key: str, location: Location | None):
+        pass
+
+    async def acquire():
+        pass
+
+    monkeypatch.setattr(GeocodeCache, "get_stored", no_row)
+    monkeypatch.setattr(GeocodeCache, "store", store)
+    monkeypatch.setattr(GeocodeRateLimiter, "acquire", acquire)
+    return geocoder
+
+
+def test_address_key_ignores_case_spacing_and_postal_code_format():
+    assert address_key(Country.SLOVAKIA, " Bratislava", "Hlavná  ulica", "1", "811 01") == address_key(
+        Country.SLOVAKIA, "BRATISLAVA", "hlavná ulica", "1", "81101"
+    )
+    assert address_key(Country.SLOVAKIA, "Bratislava", "Hlavná", "1", "81101") != address_key(
+        Country.SLOVAKIA, "Bratislava", "Hlavná", "2", "81101"
+    )
+
+
+def test_concurrent_lookups_of_one_address_share_a_single_request(monkeypatch):
+    geocoder = setup(monkeypatch)
+
+    async def run():
+        return await asyncio.gather(
+            *(get_location(Country.SLOVAKIA, "Bratislava", "Hlavná", "1", "811 01") for _ in range(10))
+        )
+
+    locations = asyncio.run(run())
+    assert len(geocoder.queries) == 1
+    assert all(location is locations[0] for location in locations)
+
+    asyncio.run(get_location(Country.SLOVAKIA, "bratislava", "hlavná", "1", "81101"))
+    assert len(geocoder.queries) == 1
+
+
+def test_addresses_not_found_are_cached_until_negative_ttl(monkeypatch):
+    geocoder = setup(monkeypatch)
+
+    assert asyncio.run(get_location(Country.CZECHIA, "Nowhere", "Street", "1", "10000")) is None
+    assert asyncio.run(get_location(Country.CZECHIA, "Nowhere", "Street", "1", "10000")) is None
+    assert len(geocoder.queries) == 1
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + GeocodeCache.negative_ttl + 1)
+    asyncio.run(get_location(Country.CZECHIA, "Nowhere", "Street", "1", "10000"))
+    assert len(geocoder.queries) == 2
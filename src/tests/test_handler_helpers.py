@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, literal
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+
+from application.models import ServiceSearchModel
+from application.utils.handler_helpers import encode_cursor, decode_cursor, estimate_rows
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+
+class FakeSession:
+    def __init__(self, plan=None):
+        self.plan = plan
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.savepoints = []
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        try:
+            yield
+            self.savepoints.append("released")
+        except Exception:
+            self.savepoints.append("rolled back")
+            raise
+
+    async def execute(self, _):
+        if self.plan is None:
+            raise DBAPIError("EXPLAIN", {}, Exception("permission denied"))
+        return FakeResult(self.plan)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("distance", [1532.25, "5f0c6a4e-3a1b-4c7e-9a55-1f1f2b7d0c11"])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "distance") == [1532.25, "5f0c6a4e-3a1b-4c7e-9a55-1f1f2b7d0c11"]
+
+
+def test_cursor_mode_mismatch():
+    cursor = encode_cursor("id", ["5f0c6a4e-3a1b-4c7e-9a55-1f1f2b7d0c11"])
+
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, "distance")
+
+
+def test_cursor_garbage():
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", "id")
+
+
+def estimate_query():
+    return select(literal(1)).select_from(ServiceSearchModel).filter_by(city="Nitra")
+
+
+def test_estimate_reads_planner_rows_in_a_savepoint():
+    session = FakeSession(plan=[{"Plan": {"Plan Rows": 42}}])
+
+    assert asyncio.run(estimate_rows(estimate_query(), session)) == 42
+    assert session.savepoints == ["released"]
+
+
+def test_failed_estimate_only_rolls_back_its_savepoint():
+    session = FakeSession()
+
+    assert asyncio.run(estimate_rows(estimate_query(), session)) is None
+    assert session.savepoints == ["rolled back"]
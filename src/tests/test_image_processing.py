@@ -0,0 +1,47 @@
+import hashlib
+from io import BytesIO
+
+from PIL import Image
+
+from application.enums.image_variant import ImageVariant
+from application.utils.image_processing import transcode_image, transcode_image_file, transcode_variants
+
+
+def png(width: int, height: int, mode: str = "RGB") -> bytes:
+    output = BytesIO()
+    Image.new(mode, (width, height)).save(output, "PNG")
+    return output.getvalue()
+
+
+def test_variants_are_webp_within_their_size():
+    variants = transcode_variants(png(2000, 1000), {ImageVariant.SMALL: 256, ImageVariant.LARGE: 1280})
+
+    small, large = Image.open(BytesIO(variants[ImageVariant.SMALL])), Image.open(BytesIO(variants[ImageVariant.LARGE]))
+    assert small.format == large.format == "WEBP"
+    assert small.size == (256, 128)
+    assert large.size == (1280, 640)
+
+
+def test_small_images_are_not_upscaled_and_keep_transparency():
+    variants = transcode_variants(png(100, 50, "RGBA"), {ImageVariant.LARGE: 1280})
+
+    image = Image.open(BytesIO(variants[ImageVariant.LARGE]))
+    assert image.size == (100, 50)
+    assert image.mode == "RGBA"
+
+
+def test_transcode_describes_the_large_variant():
+    data = png(2000, 1000)
+    _, image = transcode_image(data, {ImageVariant.SMALL: 256, ImageVariant.LARGE: 1280})
+
+    assert (image.width, image.height) == (1280, 640)
+    assert image.content_hash == hashlib.sha256(data).hexdigest()
+
+
+def test_file_transcode_matches_bytes_transcode(tmp_path):
+    data = png(2000, 1000)
+    path = tmp_path / "upload.png"
+    path.write_bytes(data)
+    sizes = {ImageVariant.SMALL: 256, ImageVariant.LARGE: 1280}
+
+    assert transcode_image_file(str(path), sizes) == transcode_image(data, sizes)
@@ -0,0 +1,54 @@
+import asyncio
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from application.utils.jwks_manager import JwksManager
+
+
+def rsa_jwk(kid: str) -> tuple[dict, bytes]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_jwk = jwk.construct(pem, algorithm="RS256").public_key().to_dict()
+    return {**public_jwk, "kid": kid, "use": "sig"}, pem
+
+
+def test_keys_are_indexed_by_kid_and_verify_tokens():
+    key_data, pem = rsa_jwk("kid-1")
+    keys = JwksManager.parse_keys({"keys": [key_data, {"kty": "EC", "kid": "ec"}, {"kty": "RSA"}]})
+
+    assert list(keys) == ["kid-1"]
+    token = jwt.encode({"sub": "user"}, pem, algorithm="RS256", headers={"kid": "kid-1"})
+    assert jwt.decode(token, keys["kid-1"], algorithms=["RS256"])["sub"] == "user"
+
+
+def test_unknown_kid_refresh_is_rate_limited_and_failures_keep_cached_keys():
+    key_data, _ = rsa_jwk("kid-1")
+    responses = [{"keys": [key_data]}, RuntimeError("cognito is down")]
+    manager = JwksManager(url="https://jwks.test", ttl=3600, min_refresh_interval=0)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    manager.fetch = fetch
+
+    async def run():
+        await manager.start()
+        assert await manager.get_key("kid-1") is not None
+        # the refresh for the unknown kid fails, the cached key stays
+        assert await manager.get_key("kid-2") is None
+        assert await manager.get_key("kid-1") is not None
+
+        manager.min_refresh_interval = 3600
+        assert await manager.get_key("kid-3") is None
+
+    asyncio.run(run())
+    assert len(calls) == 2
@@ -0,0 +1,38 @@
+from application.dto.services.nearby_candidates_dc import NearbyCandidatesDC, NearbyCandidateDC
+from application.utils.nearby_cache import NearbySearchCache
+
+
+def candidate(service_id: str, latitude: float, longitude: float) -> NearbyCandidateDC:
+    return NearbyCandidateDC(service_id=service_id, name=service_id, latitude=latitude, longitude=longitude)
+
+
+def test_sphere_distance_of_one_degree_of_latitude():
+    distance = NearbySearchCache.sphere_distance_meters(48.0, 17.1, candidate("a", 49.0, 17.1))
+
+    assert abs(distance - 111195.08) < 0.01
+
+
+def test_rank_breaks_ties_by_service_id():
+    candidates = NearbyCandidatesDC(
+        created_at=0,
+        reach_meters=0.0,
+        complete=True,
+        items=[candidate("b", 48.2, 17.1), candidate("c", 48.3, 17.1), candidate("a", 48.2, 17.1)],
+    )
+
+    ranked, safe_count = NearbySearchCache.rank(candidates, "u2s0", 48.1, 17.1, radius_km=None)
+
+    assert [item.service_id for _, item in ranked] == ["a", "b", "c"]
+    assert safe_count == 3
+
+
+def test_rank_radius_uses_spheroid_distance_near_the_edge():
+    item = candidate("a", 48.2, 17.1)
+    candidates = NearbyCandidatesDC(created_at=0, reach_meters=0.0, complete=True, items=[item])
+    spheroid = NearbySearchCache.distance_meters(48.1, 17.1, item)
+
+    inside, _ = NearbySearchCache.rank(candidates, "u2s0", 48.1, 17.1, radius_km=spheroid / 1000 + 0.001)
+    outside, _ = NearbySearchCache.rank(candidates, "u2s0", 48.1, 17.1, radius_km=spheroid / 1000 - 0.001)
+
+    assert len(inside) == 1
+    assert outside == []
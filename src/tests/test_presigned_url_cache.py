@@ -0,0 +1,42 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from application.utils.presigned_url_cache import PresignedUrlCache
+
+
+def reset_cache(monkeypatch, max_entries: int = 10):
+    monkeypatch.setattr(PresignedUrlCache, "entries", OrderedDict())
+    monkeypatch.setattr(PresignedUrlCache, "max_entries", max_entries)
+    monkeypatch.setattr(PresignedUrlCache, "use_redis", False)
+
+
+def test_cached_urls_are_served_until_they_expire(monkeypatch):
+    reset_cache(monkeypatch)
+    key = PresignedUrlCache.cache_key("bucket", "services/logo/a.webp", 3600)
+    expires_at = time.time() + 600
+
+    asyncio.run(PresignedUrlCache.set_many({key: "https://signed/a"}, expires_at))
+    assert asyncio.run(PresignedUrlCache.get_many([key])) == {key: "https://signed/a"}
+
+    monkeypatch.setattr(time, "time", lambda: expires_at + 1)
+    assert asyncio.run(PresignedUrlCache.get_many([key])) == {}
+
+
+def test_expired_urls_are_not_cached(monkeypatch):
+    reset_cache(monkeypatch)
+    key = PresignedUrlCache.cache_key("bucket", "a", 60)
+
+    asyncio.run(PresignedUrlCache.set_many({key: "https://signed/a"}, time.time() - 1))
+    assert asyncio.run(PresignedUrlCache.get_many([key])) == {}
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    reset_cache(monkeypatch, max_entries=2)
+    expires_at = time.time() + 600
+
+    asyncio.run(PresignedUrlCache.set_many({"a": "url-a", "b": "url-b"}, expires_at))
+    asyncio.run(PresignedUrlCache.get_many(["a"]))
+    asyncio.run(PresignedUrlCache.set_many({"c": "url-c"}, expires_at))
+
+    assert list(PresignedUrlCache.entries) == ["a", "c"]
@@ -0,0 +1,90 @@
+import asyncio
+
+from application.dto.services.service_document_dc import OfferDocumentDC, ServiceDocumentDC, ServiceSearchQueryDC
+from application.utils.search_backend import InMemorySearchBackend
+
+
+def service(service_id: str, name: str, city: str, latitude: float, longitude: float, offers=None) -> ServiceDocumentDC:
+    return ServiceDocumentDC(
+        service_id=service_id,
+        organization_id=None,
+        name=name,
+        country="SLOVAKIA",
+        city=city,
+        street="Main",
+        postal_code="81101",
+        address=f"Main 1, {city}",
+        latitude=latitude,
+        longitude=longitude,
+        logo_key=f"services/logo/{service_id}.webp",
+        descriptions=["Brake and tyre repairs"],
+        offers=offers or [],
+    )
+
+
+def offer(offer_id: str, current_price: float, car_pairs: list[str]) -> OfferDocumentDC:
+    return OfferDocumentDC(
+        offer_id=offer_id,
+        offer_type="REPAIR",
+        currency="EUR",
+        base_price=current_price,
+        sale=None,
+        current_price=current_price,
+        car_brands=sorted({pair.split(":")[0] for pair in car_pairs}),
+        car_types=sorted({pair.split(":")[1] for pair in car_pairs}),
+        car_pairs=car_pairs,
+    )
+
+
+def backend() -> InMemorySearchBackend:
+    search_backend = InMemorySearchBackend()
+    asyncio.run(
+        search_backend.index_documents(
+            [
+                service("a", "Autoservis Petrzalka", "Bratislava", 48.11, 17.11, [offer("a1", 80, ["BMW:SEDAN"])]),
+                service("b", "Pneuservis Ruzinov", "Bratislava", 48.16, 17.16, [offer("b1", 40, ["ALL:ALL"])]),
+                service("c", "Autoservis Kosice", "Kosice", 48.72, 21.26),
+            ]
+        )
+    )
+    return search_backend
+
+
+def test_geo_distance_order_and_radius():
+    query = ServiceSearchQueryDC(limit=10, latitude=48.15, longitude=17.15, radius_km=50)
+    result = asyncio.run(backend().search(query))
+
+    assert [hit.document.service_id for hit in result.hits] == ["b", "a"]
+    assert result.total == 2
+    assert result.facets["city"] == {"Bratislava": 2}
+
+
+def test_fuzzy_text_match():
+    result = asyncio.run(backend().search(ServiceSearchQueryDC(limit=10, q="autoservs")))
+
+    assert {hit.document.service_id for hit in result.hits} == {"a", "c"}
+
+
+def test_offer_filter_and_best_offer():
+    query = ServiceSearchQueryDC(limit=10, car_brand="BMW", car_type="COUPE", max_price=100)
+    result = asyncio.run(backend().search(query))
+
+    # only the ALL:ALL offer covers a BMW coupe
+    assert [(hit.document.service_id, hit.best_offer.offer_id) for hit in result.hits] == [("b", "b1")]
+    assert result.facets["offer_type"] == {"REPAIR": 1}
+
+
+def test_search_after_pages():
+    search_backend = backend()
+    first = asyncio.run(search_backend.search(ServiceSearchQueryDC(limit=2)))
+    second = asyncio.run(search_backend.search(ServiceSearchQueryDC(limit=2, search_after=first.hits[-1].sort)))
+
+    assert [hit.document.service_id for hit in first.hits + second.hits] == ["a", "b", "c"]
+
+
+def test_delete_documents():
+    search_backend = backend()
+
+    assert asyncio.run(search_backend.delete_documents(["a", "missing"])) == 1
+    assert asyncio.run(search_backend.search(ServiceSearchQueryDC(limit=10))).total == 2
+    assert sorted(asyncio.run(search_backend.document_ids())) == ["b", "c"]
@@ -0,0 +1,44 @@
+import asyncio
+
+from application.handlers.service_handler import service_index_handler
+from application.handlers.service_handler.service_index_handler import ServiceIndexHandler
+
+
+class FakeSessionFactory:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *_):
+        return False
+
+
+def test_retry_delay_backs_off_up_to_the_cap():
+    assert [ServiceIndexHandler.retry_delay(failures) for failures in (1, 2, 3)] == [1, 2, 4]
+    assert ServiceIndexHandler.retry_delay(30) == ServiceIndexHandler.retry_max_delay
+
+
+def test_failed_batch_is_queued_again(monkeypatch):
+    calls = []
+
+    async def index_services(service_ids, _):
+        calls.append(sorted(service_ids))
+        if len(calls) == 1:
+            raise ConnectionError("opensearch is down")
+
+    monkeypatch.setattr(service_index_handler, "SessionFactory", FakeSessionFactory)
+    monkeypatch.setattr(ServiceIndexHandler, "index_services", index_services)
+    monkeypatch.setattr(ServiceIndexHandler, "retry_base_delay", 0)
+    monkeypatch.setattr(ServiceIndexHandler, "pending", set())
+    monkeypatch.setattr(ServiceIndexHandler, "wakeup", asyncio.Event())
+
+    async def run():
+        ServiceIndexHandler.start_worker()
+        ServiceIndexHandler.enqueue(["a", "b"])
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await ServiceIndexHandler.stop_worker()
+
+    asyncio.run(run())
+
+    assert calls == [["a", "b"], ["a", "b"]]
+    assert ServiceIndexHandler.pending == set()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+from io import BytesIO
+
+import pytest
+
+from application.utils.exceptions import BadRequestException
+from application.utils.s3_service import S3Service, SizeLimitedReader
+
+
+class CountingFile(BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.requested = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.requested.append(size)
+        return super().read(size)
+
+
+def test_read_all_returns_payload_within_limit():
+    spool = CountingFile(b"x" * 10)
+
+    assert SizeLimitedReader(spool, 10).read() == b"x" * 10
+    assert spool.requested == [11]
+
+
+def test_read_all_stops_one_byte_past_limit():
+    spool = CountingFile(b"x" * 1000)
+
+    with pytest.raises(BadRequestException):
+        SizeLimitedReader(spool, 10).read()
+    assert spool.tell() == 11
+
+
+def test_spool_copy_is_removed_when_over_limit(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    service = S3Service.__new__(S3Service)
+
+    path = service.spool_to_file(BytesIO(b"x" * 10))
+    with open(path, "rb") as copy:
+        assert copy.read() == b"x" * 10
+
+    monkeypatch.setattr(S3Service, "file_max_size", 5)
+    with pytest.raises(BadRequestException):
+        service.spool_to_file(BytesIO(b"x" * 10))
+    assert [entry.name for entry in tmp_path.iterdir()] == [os.path.basename(path)]
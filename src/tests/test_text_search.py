@@ -0,0 +1,14 @@
+from application.enums.services.language import LanguageCode
+from application.utils.text_search import LANGUAGE_CONFIGS, language_config_sql
+
+
+def test_every_language_has_config():
+    assert set(LANGUAGE_CONFIGS) == set(LanguageCode)
+
+
+def test_language_config_sql():
+    sql = language_config_sql("language_code")
+
+    assert sql.startswith("CASE language_code ")
+    assert "WHEN 'DE' THEN 'german'::regconfig" in sql
+    assert sql.endswith("ELSE 'simple'::regconfig END")
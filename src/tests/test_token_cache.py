@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+
+from application.dto.jwt_dc import JwtDC
+from application.utils.token_cache import TokenCache
+
+
+def reset_cache(monkeypatch, max_entries: int = 10):
+    monkeypatch.setattr(TokenCache, "entries", OrderedDict())
+    monkeypatch.setattr(TokenCache, "max_entries", max_entries)
+
+
+def jwt_dc(user_id: str, token: str) -> JwtDC:
+    return JwtDC(user_id=user_id, token_type="access", token=token)
+
+
+def test_verified_token_is_served_until_exp(monkeypatch):
+    reset_cache(monkeypatch)
+    expires_at = time.time() + 600
+    TokenCache.set("token-a", jwt_dc("user-a", "token-a"), expires_at)
+
+    assert TokenCache.get("token-a").user_id == "user-a"
+    assert TokenCache.get("token-b") is None
+
+    monkeypatch.setattr(time, "time", lambda: expires_at + 1)
+    assert TokenCache.get("token-a") is None
+    assert not TokenCache.entries
+
+
+def test_least_recently_used_token_is_evicted(monkeypatch):
+    reset_cache(monkeypatch, max_entries=2)
+    expires_at = time.time() + 600
+
+    TokenCache.set("a", jwt_dc("user-a", "a"), expires_at)
+    TokenCache.set("b", jwt_dc("user-b", "b"), expires_at)
+    TokenCache.get("a")
+    TokenCache.set("c", jwt_dc("user-c", "c"), expires_at)
+
+    assert TokenCache.get("b") is None
+    assert TokenCache.get("a") is not None and TokenCache.get("c") is not None
+
+
+def test_invalidation_drops_token_and_every_token_of_user(monkeypatch):
+    reset_cache(monkeypatch)
+    expires_at = time.time() + 600
+    for token, user_id in (("a1", "user-a"), ("a2", "user-a"), ("b1", "user-b")):
+        TokenCache.set(token, jwt_dc(user_id, token), expires_at)
+
+    TokenCache.invalidate("b1")
+    TokenCache.invalidate_user("user-a")
+
+    assert not TokenCache.entries
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from application.dto.jwt_dc import JwtDC
+from application.utils import token_revocation
+from application.utils.token_cache import TokenCache
+from application.utils.token_revocation import TokenRevocation
+
+
+class FakeRedis:
+    def __init__(self, values: dict):
+        self.values = values
+        self.calls = 0
+
+    async def get(self, key: str):
+        self.calls += 1
+        return self.values.get(key)
+
+
+def setup(monkeypatch, values: dict) -> FakeRedis:
+    redis = FakeRedis(values)
+    monkeypatch.setattr(token_revocation, "get_async_redis", lambda: redis)
+    monkeypatch.setattr(TokenRevocation, "not_revoked", OrderedDict())
+    monkeypatch.setattr(TokenCache, "entries", OrderedDict())
+    return redis
+
+
+def jwt_dc(jti: str, user_id: str = "user-a", issued_at: int = 1000) -> JwtDC:
+    return JwtDC(user_id=user_id, token_type="access", token=jti, jti=jti, issued_at=issued_at, expires_at=5000)
+
+
+def test_not_revoked_tokens_skip_redis_until_broadcast(monkeypatch):
+    redis = setup(monkeypatch, {})
+    token = jwt_dc("jti-a")
+
+    assert not asyncio.run(TokenRevocation.is_revoked(token))
+    assert not asyncio.run(TokenRevocation.is_revoked(token))
+    assert redis.calls == 1
+
+    redis.values[TokenRevocation.user_key("user-a")] = b"2000"
+    TokenRevocation.apply("user:user-a")
+    assert asyncio.run(TokenRevocation.is_revoked(token))
+
+
+def test_user_revocation_covers_tokens_issued_before_it(monkeypatch):
+    setup(monkeypatch, {TokenRevocation.user_key("user-a"): b"2000"})
+
+    assert asyncio.run(TokenRevocation.is_revoked(jwt_dc("old", issued_at=1999)))
+    assert not asyncio.run(TokenRevocation.is_revoked(jwt_dc("same-second", issued_at=2000)))
+    assert not asyncio.run(TokenRevocation.is_revoked(jwt_dc("new", issued_at=2060)))
+    assert not asyncio.run(TokenRevocation.is_revoked(jwt_dc("other", user_id="user-b")))
+
+
+def test_user_broadcast_drops_cached_tokens_of_user(monkeypatch):
+    setup(monkeypatch, {})
+    for jti, user_id in (("a", "user-a"), ("b", "user-b")):
+        token = jwt_dc(jti, user_id=user_id)
+        TokenCache.set(jti, token, time.time() + 600)
+        asyncio.run(TokenRevocation.is_revoked(token))
+
+    TokenRevocation.apply("user:user-a")
+
+    assert list(TokenRevocation.not_revoked) == ["b"]
+    assert TokenCache.get("a") is None and TokenCache.get("b") is not None